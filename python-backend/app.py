@@ -5,16 +5,30 @@ Provides REST API endpoints for:
 - Text summarization using T5 Large
 - Document Generation (BRD/PO) using T5 Large
 """
+import json
 import os
+import time
 import traceback
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, Response, abort, g, request, jsonify, send_from_directory
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
+import cache
 import config
 import document_generator
+import jobs
+import latency_budget
+import metrics
+import profiling
+import repetition_guard
+import uploads
 
 app = Flask(__name__)
+# Stream audio uploads to unique temp files while they arrive (see uploads.py)
+app.request_class = uploads.StreamingRequest
+# Reject oversized bodies up front; 1 MB headroom for the other multipart fields
+app.config['MAX_CONTENT_LENGTH'] = config.MAX_FILE_SIZE + 1024 * 1024
 # CORS(app, resources={r"/api/*": {"origins": "*"}})  # Allow all origins for testing
 CORS(app) # Enable CORS for all routes for simplicity
 
@@ -24,15 +38,186 @@ def allowed_file(filename):
     """Check if file has an allowed extension"""
     return Path(filename).suffix.lower() in config.ALLOWED_EXTENSIONS
 
+def upload_error_response(e):
+    """JSON error for uploads refused while streaming (size, content type)"""
+    if isinstance(e, RequestEntityTooLarge):
+        return jsonify({'error': f'File too large. Maximum size is {config.MAX_FILE_SIZE // (1024 * 1024)} MB'}), 413
+    return jsonify({'error': str(e)}), e.status_code
+
+@app.teardown_request
+def discard_unclaimed_uploads(exc):
+    """Delete temp files of uploads that were not handed to a background job"""
+    if isinstance(request, uploads.StreamingRequest):
+        request.discard_uploads()
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    metrics.HTTP_IN_FLIGHT.inc()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request by route template (not raw path, so job ids don't explode the label set)"""
+    endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    metrics.HTTP_REQUESTS.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+    if 'request_started' in g:
+        metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_started, endpoint=endpoint)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    if g.pop('request_started', None) is not None:
+        metrics.HTTP_IN_FLIGHT.dec()
+
+@app.before_request
+def start_request_profile():
+    """Profile this request if it sends X-Profile: 1 (or its route is in PROFILE_ENDPOINTS) and the rate limit allows"""
+    endpoint = request.url_rule.rule if request.url_rule is not None else None
+    if profiling.requested(request.headers.get('X-Profile'), request.headers.get('X-Profile-Token'), endpoint):
+        g.profile_requested = True
+        g.profile = profiling.try_start(f"{request.method} {request.path}")
+
+@app.after_request
+def attach_request_profile(response):
+    """Finish the profile once the body is sent (streamed bodies included)"""
+    profile = g.pop('profile', None)
+    if profile is not None:
+        response.headers['X-Profile-Id'] = profile.id
+        response.call_on_close(lambda: profiling.finish(profile))
+    elif g.get('profile_requested'):
+        response.headers['X-Profile-Id'] = 'skipped'  # another profile running or rate-limited
+    return response
+
+@app.teardown_request
+def abandon_request_profile(exc):
+    # after_request did not run (unhandled error): write what was recorded
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiling.finish(profile)
+
+def profile_admin_allowed():
+    if not config.PROFILING_ENABLED:
+        abort(404)
+    if config.PROFILING_TOKEN and request.headers.get('X-Profile-Token') != config.PROFILING_TOKEN:
+        abort(403)
+
+def requested_generator(values):
+    """Generator for the optional whisper_size / t5_size request fields (ValueError if unknown)"""
+    return document_generator.get_generator(
+        whisper_size=values.get('whisper_size') or None,
+        t5_size=values.get('t5_size') or None
+    )
+
+def plan_transcription(latency_request, values, upload, generator):
+    """
+    Apply the optional latency_budget / profile fields to an upload: returns the
+    generator for the chosen Whisper tier and the plan (None if neither field is set)
+    """
+    profile, budget = latency_request
+    if profile is None and budget is None:
+        return generator, None
+    plan = latency_budget.plan(
+        profile, budget,
+        audio_seconds=latency_budget.probe_duration(upload.path, upload.waveform),
+        ceiling=generator.whisper_model_name,
+        fixed_model=bool(values.get('whisper_size')),
+        device=generator.device,
+        pool_stats=document_generator.get_model_stats()
+    )
+    print(f"⏱️ Latency plan: Whisper {plan.whisper_model}, beam {plan.beam_size}, fallback {plan.fallback}, "
+          f"estimated {plan.estimated_seconds if plan.estimated_seconds is not None else '?'}s")
+    if plan.whisper_model != generator.whisper_model_name:
+        generator = document_generator.get_generator(plan.whisper_model, values.get('t5_size') or None)
+    return generator, plan
+
+def sse_event(event, data):
+    """One Server-Sent Events message with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(events):
+    # X-Accel-Buffering: stop nginx from holding events back until the response ends
+    return Response(events, mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def process_audio_response(results, filename, plan=None):
+    """Map process_audio_smart results to the response shape the frontend expects"""
+    response = {
+        'success': True,
+        'transcript': results['transcription'],
+        'summary': results['summary'],
+        'language': 'unknown', # Whisper language code might be hidden in language name, but this is fine
+        'language_name': results['language'],
+        'word_count': results['input_words'],
+        'summary_word_count': results['summary_words'],
+        'vad': results.get('vad'),
+        'suppressed_segments': results.get('suppressed_segments', 0),
+        'filename': filename
+    }
+    if plan is not None:
+        response['latency'] = plan.describe(results.get('transcribe_seconds'))
+    return response
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (overview; see /api/health/live and /api/health/ready for probes)"""
+    readiness = document_generator.get_readiness()
     return jsonify({
-        'status': 'healthy',
+        'status': 'healthy' if readiness['ready'] else readiness['status'],
+        'ready': readiness['ready'],
         'message': 'Smart T5 Audio Backend is running',
-        'backend': 'SmartT5LargeDocumentGenerator'
+        'backend': 'SmartT5LargeDocumentGenerator',
+        'models': document_generator.get_model_stats(),
+        't5_precision': {'configured': config.T5_PRECISION, 'effective': readiness['models']['t5']['precision']},
+        'model_budget': document_generator.get_model_budget(),
+        'batching': document_generator.get_batching_stats(),
+        'assisted_decoding': document_generator.get_assisted_decoding_stats(),
+        'repetition_guard': repetition_guard.get_stats(),
+        'latency_budget': latency_budget.get_stats(),
+        'jobs': jobs.get_job_store().get_stats(),
+        'profiling': profiling.get_stats(),
+        'transcription_cache': cache.get_transcription_cache().get_stats() if config.TRANSCRIPTION_CACHE_ENABLED else None,
+        'summary_cache': cache.get_summary_cache().get_stats() if config.SUMMARY_CACHE_ENABLED else None
     }), 200
 
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe: the process is up and serving HTTP (never touches the models)"""
+    return jsonify({'status': 'alive'}), 200
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness probe: 200 once the required models (READY_MODELS) are warm, 503 otherwise.
+    Reports each model's state, device, dtype and size plus the current queue depth.
+    """
+    readiness = document_generator.get_readiness()
+    readiness['queue_depth'] = {
+        'summaries': readiness.pop('summary_queue_depth'),
+        'jobs': jobs.get_job_store().get_stats()
+    }
+    readiness['model_budget'] = document_generator.get_model_budget()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape target: stage latencies, request counts, cache / job / model pool gauges"""
+    if not config.METRICS_ENABLED:
+        abort(404)
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    """Saved request profiles, newest first"""
+    profile_admin_allowed()
+    return jsonify({'profiles': profiling.list_profiles(), 'profiling': profiling.get_stats()}), 200
+
+@app.route('/api/admin/profiles/<filename>', methods=['GET'])
+def get_profile_file(filename):
+    """Download one profile file (.pstats, .txt or .trace.json)"""
+    profile_admin_allowed()
+    if not profiling.PROFILE_FILE_PATTERN.match(filename):
+        abort(404)
+    return send_from_directory(config.PROFILE_DIR, filename, as_attachment=not filename.endswith('.txt'))
+
 @app.route('/api/transcribe', methods=['POST'])
 def transcribe_audio():
     """
@@ -52,18 +237,30 @@ def transcribe_audio():
         if not allowed_file(file.filename):
             return jsonify({'error': f'Invalid file type. Allowed: {", ".join(config.ALLOWED_EXTENSIONS)}'}), 400
         
+        try:
+            generator = requested_generator(request.form)
+            latency_request = latency_budget.parse_request(request.form)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         filename = secure_filename(file.filename)
-        file_path = config.UPLOAD_FOLDER / filename
-        file.save(file_path)
+        upload = uploads.receive_upload(file)
         
         try:
+            generator, plan = plan_transcription(latency_request, request.form, upload, generator)
+            
             # Clear memory before processing
             gc.collect()
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
             
-            generator = document_generator.get_generator()
-            result = generator.transcribe_audio(str(file_path))
+            result = generator.transcribe_audio(
+                str(upload.path),
+                audio=upload.waveform,
+                audio_sha256=upload.sha256,
+                use_cache=request.form.get('cache', 'true').lower() != 'false',
+                decode_options=plan.decode_options if plan else None
+            )
             
             # Clean up after transcription
             gc.collect()
@@ -76,13 +273,79 @@ def transcribe_audio():
                 'language': result['language'],
                 'language_name': result.get('language_name', 'Unknown'),
                 'word_count': result['word_count'],
+                'vad': result.get('vad'),
+                'suppressed_segments': result.get('suppressed_segments', 0),
+                'latency': plan.describe(result.get('transcribe_seconds')) if plan else None,
                 'filename': filename
             }), 200
             
         finally:
-            if file_path.exists():
-                file_path.unlink()
+            upload.discard()
+    
+    except (uploads.UploadRejected, RequestEntityTooLarge) as e:
+        return upload_error_response(e)
+    except Exception as e:
+        print(f"Error during transcription: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': 'Transcription failed', 'details': str(e)}), 500
+
+@app.route('/api/transcribe/stream', methods=['POST'])
+def transcribe_audio_stream():
+    """
+    Transcribe an audio file, streaming each Whisper segment as a Server-Sent Event while it is decoded
+    """
+    try:
+        if 'audio' not in request.files:
+            return jsonify({'error': 'No audio file provided'}), 400
+        
+        file = request.files['audio']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': f'Invalid file type. Allowed: {", ".join(config.ALLOWED_EXTENSIONS)}'}), 400
+        
+        try:
+            generator = requested_generator(request.form)
+            latency_request = latency_budget.parse_request(request.form)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # The response body is produced after this view returns, so the response owns the temp file
+        filename = secure_filename(file.filename)
+        upload = uploads.receive_upload(file).detach()
+        try:
+            generator, plan = plan_transcription(latency_request, request.form, upload, generator)
+        except Exception:
+            upload.discard()
+            raise
+        use_cache = request.form.get('cache', 'true').lower() != 'false'
+        
+        def events():
+            try:
+                for event, data in generator.transcribe_audio_stream(
+                    str(upload.path),
+                    audio=upload.waveform,
+                    audio_sha256=upload.sha256,
+                    use_cache=use_cache,
+                    decode_options=plan.decode_options if plan else None
+                ):
+                    if event == 'done':
+                        data['latency'] = plan.describe(data['transcribe_seconds']) if plan else None
+                        data['filename'] = filename
+                    yield sse_event(event, data)
+            except Exception as e:
+                print(f"Error during streaming transcription: {str(e)}")
+                traceback.print_exc()
+                yield sse_event('error', {'error': 'Transcription failed', 'details': str(e)})
+        
+        response = sse_response(events())
+        # Runs when the server closes the response, even if the client left before the stream started
+        response.call_on_close(upload.discard)
+        return response
     
+    except (uploads.UploadRejected, RequestEntityTooLarge) as e:
+        return upload_error_response(e)
     except Exception as e:
         print(f"Error during transcription: {str(e)}")
         traceback.print_exc()
@@ -110,11 +373,19 @@ def summarize_text():
         print(f"[/api/summarize] Processing {len(text)} characters...")
         
         try:
-            generator = document_generator.get_generator()
+            generator = requested_generator(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             print(f"[ERROR] Model loading failed: {str(e)}")
             return jsonify({'error': 'Model loading failed', 'details': str(e)}), 500
         
+        # 'greedy' uses assisted decoding with the draft model when enabled; unknown values keep the default
+        quality = data.get('quality', 'medium')
+        if quality not in document_generator.BEAMS_PER_QUALITY:
+            print(f"[/api/summarize] Unknown quality '{quality}', using 'medium'")
+            quality = 'medium'
+        
         # Use generator's logic (mimicking process_audio_smart steps for text only)
         word_count = len(text.split())
         print(f"[/api/summarize] Word count: {word_count}")
@@ -122,16 +393,53 @@ def summarize_text():
         # Adaptive settings
         summary_config = generator.calculate_adaptive_summary_length(word_count, 'balanced')
         
+        if data.get('stream'):
+            # Tokens as they are generated (greedy, or sampled with "sample": true); long texts per chunk
+            sample = bool(data.get('sample'))
+            if word_count < 25:
+                summary_events = iter([('summary', text)])
+            elif word_count > 400:
+                summary_events = generator.summarize_stream(text, quality=quality, sample=sample, summary_config=summary_config)
+            else:
+                summary_events = generator.summarize_stream(
+                    text,
+                    max_length=summary_config['max_length'],
+                    min_length=summary_config['min_length'],
+                    sample=sample
+                )
+            
+            def events():
+                try:
+                    for event, value in summary_events:
+                        if event == 'token':
+                            yield sse_event('token', {'text': value})
+                        elif event == 'chunk':
+                            yield sse_event('chunk', value)
+                        else:
+                            yield sse_event('done', {
+                                'success': True,
+                                'summary': value,
+                                'word_count': word_count,
+                                'summary_word_count': len(value.split())
+                            })
+                except Exception as e:
+                    print(f"[ERROR] Streaming summarization failed: {str(e)}")
+                    traceback.print_exc()
+                    yield sse_event('error', {'error': 'Summarization failed', 'details': str(e)})
+            
+            return sse_response(events())
+        
         try:
             if word_count < 25:
                 summary = text
             elif word_count > 400:
-                 summary = generator._summarize_long_text(text, summary_config, 'medium', None)
+                 summary = generator._summarize_long_text(text, summary_config, quality, None)
             else:
                 summary = generator.generate_t5_summary(
                     text, 
                     max_length=summary_config['max_length'],
-                    min_length=summary_config['min_length']
+                    min_length=summary_config['min_length'],
+                    quality=quality
                 )
         except Exception as e:
             print(f"[ERROR] Summarization generation failed: {str(e)}")
@@ -172,12 +480,17 @@ def process_audio():
         if not allowed_file(file.filename):
             return jsonify({'error': f'Invalid file type. Allowed: {", ".join(config.ALLOWED_EXTENSIONS)}'}), 400
         
+        try:
+            generator = requested_generator(request.form)
+            latency_request = latency_budget.parse_request(request.form)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         filename = secure_filename(file.filename)
-        file_path = config.UPLOAD_FOLDER / filename
-        file.save(file_path)
+        upload = uploads.receive_upload(file)
         
         try:
-            generator = document_generator.get_generator()
+            generator, plan = plan_transcription(latency_request, request.form, upload, generator)
             
             # Check for diarization flag
             diarize_param = request.form.get('diarization', 'false').lower()
@@ -185,44 +498,141 @@ def process_audio():
             
             # Use process_audio_smart from the notebook logic
             results = generator.process_audio_smart(
-                audio_path=str(file_path),
+                audio_path=str(upload.path),
                 strategy='balanced', # Default strategy
                 quality='medium',     # Default quality for speed
-                diarize=diarize
+                diarize=diarize,
+                audio=upload.waveform,
+                audio_sha256=upload.sha256,
+                use_cache=request.form.get('cache', 'true').lower() != 'false',
+                decode_options=plan.decode_options if plan else None
             )
             
             # Map keys to expected frontend response
-            return jsonify({
-                'success': True,
-                'transcript': results['transcription'],
-                'summary': results['summary'],
-                'language': 'unknown', # Whisper language code might be hidden in language name, but this is fine
-                'language_name': results['language'],
-                'word_count': results['input_words'],
-                'summary_word_count': results['summary_words'],
-                'filename': filename
-            }), 200
+            return jsonify(process_audio_response(results, filename, plan)), 200
             
         finally:
-            if file_path.exists():
-                file_path.unlink()
+            upload.discard()
     
+    except (uploads.UploadRejected, RequestEntityTooLarge) as e:
+        return upload_error_response(e)
     except Exception as e:
         print(f"Error during audio processing: {str(e)}")
         traceback.print_exc()
         return jsonify({'error': 'Audio processing failed', 'details': str(e)}), 500
 
+@app.route('/api/jobs/process-audio', methods=['POST'])
+def submit_process_audio_job():
+    """
+    Queue an audio file for transcription + summarization and return a job id immediately.
+    Poll /api/jobs/<job_id> for progress and the final result.
+    """
+    try:
+        if 'audio' not in request.files:
+            return jsonify({'error': 'No audio file provided'}), 400
+        
+        file = request.files['audio']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': f'Invalid file type. Allowed: {", ".join(config.ALLOWED_EXTENSIONS)}'}), 400
+        
+        try:
+            generator = requested_generator(request.form)
+            latency_request = latency_budget.parse_request(request.form)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # The upload outlives this request, so the job takes ownership of the temp file
+        filename = secure_filename(file.filename)
+        upload = uploads.receive_upload(file).detach()
+        try:
+            generator, plan = plan_transcription(latency_request, request.form, upload, generator)
+        except Exception:
+            upload.discard()
+            raise
+        
+        diarize = request.form.get('diarization', 'false').lower() == 'true'
+        use_cache = request.form.get('cache', 'true').lower() != 'false'
+        
+        def run_job(progress_callback):
+            results = generator.process_audio_smart(
+                audio_path=str(upload.path),
+                strategy='balanced',
+                quality='medium',
+                diarize=diarize,
+                progress_callback=progress_callback,
+                audio=upload.waveform,
+                audio_sha256=upload.sha256,
+                use_cache=use_cache,
+                decode_options=plan.decode_options if plan else None
+            )
+            return process_audio_response(results, filename, plan)
+        
+        try:
+            job_id = jobs.get_job_store().submit(run_job, on_finish=upload.discard)
+        except jobs.JobQueueFull as e:
+            upload.discard()
+            return jsonify({'error': 'Too many audio jobs in progress, try again later', 'details': str(e)}), 503
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': f"/api/jobs/{job_id}"
+        }), 202
+    
+    except (uploads.UploadRejected, RequestEntityTooLarge) as e:
+        return upload_error_response(e)
+    except Exception as e:
+        print(f"Error submitting audio job: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': 'Failed to submit audio job', 'details': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """
+    Report stage, percent done and (when finished) the result or error of a job
+    """
+    job = jobs.get_job_store().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job), 200
+
 @app.route('/api/models/preload', methods=['POST'])
 def preload_models():
     """
-    Preload models into memory
+    Start loading + warming up models in the background and return immediately (202).
+    Optional JSON body {"models": ["t5", "whisper", "diarization"], "whisper_size": "small", "t5_size": "base"};
+    defaults to all models at the configured sizes. Poll /api/models/preload/status.
     """
     try:
-        document_generator.get_generator()
-        return jsonify({'success': True, 'message': 'Models preloaded successfully'}), 200
+        data = request.get_json(silent=True) or {}
+        try:
+            started = document_generator.preload_in_background(
+                data.get('models'),
+                whisper_size=data.get('whisper_size') or None,
+                t5_size=data.get('t5_size') or None
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify({
+            'success': True,
+            'message': 'Preload started' if started else 'A preload is already running',
+            'status_url': '/api/models/preload/status',
+            'preload': document_generator.get_preload_status()
+        }), 202
     except Exception as e:
         return jsonify({'error': 'Failed to preload models', 'details': str(e)}), 500
 
+@app.route('/api/models/preload/status', methods=['GET'])
+def preload_status():
+    """Progress of the last preload plus per-model state and timings"""
+    return jsonify({
+        'preload': document_generator.get_preload_status(),
+        'models': document_generator.get_model_stats()
+    }), 200
+
 @app.route('/api/generate-document', methods=['POST'])
 def generate_document_api():
     """
@@ -253,17 +663,57 @@ def generate_document_api():
         
         print(f"Generating {document_type.upper()} document...")
         
+        try:
+            document_generator.resolve_t5_model(data.get('t5_size') or None)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        from datetime import datetime
+        project_name = metadata.get('project_name', 'document').replace(' ', '_')
+        filename = f"{document_type}_{project_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        
+        if data.get('stream'):
+            # Summary tokens (or chunk summaries) as they are generated, then the rendered document
+            document_events = document_generator.generate_document_stream(
+                text,
+                document_type,
+                metadata=metadata,
+                t5_size=data.get('t5_size') or None,
+                sample=bool(data.get('sample'))
+            )
+            
+            def events():
+                try:
+                    for event, value in document_events:
+                        if event == 'token':
+                            yield sse_event('token', {'text': value})
+                        elif event == 'chunk':
+                            yield sse_event('chunk', value)
+                        elif event == 'summary':
+                            yield sse_event('summary', {'summary': value})
+                        else:
+                            yield sse_event('done', {
+                                'success': True,
+                                'document': value,
+                                'document_type': document_type,
+                                'filename': filename,
+                                'word_count': len(value.split())
+                            })
+                except Exception as e:
+                    print(f"Error during streaming document generation: {str(e)}")
+                    traceback.print_exc()
+                    yield sse_event('error', {'error': 'Document generation failed', 'details': str(e)})
+            
+            return sse_response(events())
+        
         # Generate the document
         generated_doc = document_generator.generate_document(
             text=text,
             document_type=document_type,
-            metadata=metadata
+            metadata=metadata,
+            t5_size=data.get('t5_size') or None
         )
         
-        from datetime import datetime
-        project_name = metadata.get('project_name', 'document').replace(' ', '_')
-        filename = f"{document_type}_{project_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        
         # Clean up after document generation
         gc.collect()
         if torch.cuda.is_available():
@@ -288,14 +738,13 @@ if __name__ == '__main__':
     print("=" * 60)
     print(f"Server starting on http://{config.FLASK_HOST}:{config.FLASK_PORT}")
     
-    # Preload models on startup
-    try:
-        print("🔄 Preloading T5 model (first time: ~2-3 minutes)...")
-        document_generator.get_generator()
-        print("✅ Models preloaded successfully! Server ready for requests.")
-    except Exception as e:
-        print(f"⚠️  Warning: Model preload failed: {e}")
-        print("Models will load on first request (slow).")
+    # Load + warm up the configured models in the background; the port binds right away
+    if config.PRELOAD_MODELS:
+        print(f"🔄 Preloading {', '.join(config.PRELOAD_MODELS)} in the background...")
+        try:
+            document_generator.preload_in_background(config.PRELOAD_MODELS)
+        except ValueError as e:
+            print(f"⚠️  Warning: Model preload failed: {e}")
         
     app.run(
         host=config.FLASK_HOST,
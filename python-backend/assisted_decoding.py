@@ -0,0 +1,92 @@
+"""
+Assisted (speculative) decoding for T5 summaries.
+
+A small draft model (config.T5_DRAFT_MODEL, sharing the summarizer's
+vocabulary) proposes a few tokens at a time and the main model checks them
+in one decoder pass, keeping the prefix it agrees with. The output is the
+main model's greedy output; the gain is fewer full-size decoder passes.
+transformers only supports this for one sequence with num_beams=1, so it
+serves the single-beam qualities in config.T5_ASSISTED_QUALITIES ('greedy')
+and bypasses the batch scheduler. It is off unless T5_ASSISTED_DECODING is set.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import config
+
+
+@contextmanager
+def count_forward_passes(*models):
+    """Count the forward calls the current thread makes on each model; yields the list of counts"""
+    counts = [0] * len(models)
+    thread = threading.get_ident()
+    handles = []
+
+    def make_hook(index):
+        def hook(module, args, output):
+            # Other requests may run the same model concurrently
+            if threading.get_ident() == thread:
+                counts[index] += 1
+        return hook
+
+    try:
+        for index, model in enumerate(models):
+            handles.append(model.register_forward_hook(make_hook(index)))
+        yield counts
+    finally:
+        for handle in handles:
+            handle.remove()
+
+
+class AssistedDecodingStats:
+    """
+    Acceptance figures of recent assisted requests plus running totals.
+    Each main-model pass yields one token of its own plus the draft tokens it
+    accepted, so accepted = generated tokens - main passes.
+    """
+
+    def __init__(self, history=None):
+        self._recent = deque(maxlen=history or config.T5_ASSISTED_STATS_HISTORY)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._tokens = 0
+        self._proposed = 0
+        self._accepted = 0
+        self._target_passes = 0
+        self._seconds = 0.0
+
+    def record(self, tokens, target_passes, draft_passes, seconds):
+        """Record one request and return its entry"""
+        accepted = max(0, min(draft_passes, tokens - target_passes))
+        entry = {
+            'at': time.time(),
+            'tokens': tokens,
+            'target_passes': target_passes,
+            'proposed': draft_passes,
+            'accepted': accepted,
+            'acceptance_rate': round(accepted / draft_passes, 3) if draft_passes else 0.0,
+            'tokens_per_pass': round(tokens / target_passes, 2) if target_passes else 0.0,
+            'seconds': round(seconds, 3)
+        }
+        with self._lock:
+            self._recent.append(entry)
+            self._requests += 1
+            self._tokens += tokens
+            self._proposed += draft_passes
+            self._accepted += accepted
+            self._target_passes += target_passes
+            self._seconds += seconds
+        return entry
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'enabled': True,
+                'requests': self._requests,
+                'acceptance_rate': round(self._accepted / self._proposed, 3) if self._proposed else 0.0,
+                'tokens_per_pass': round(self._tokens / self._target_passes, 2) if self._target_passes else 0.0,
+                'avg_seconds': round(self._seconds / self._requests, 3) if self._requests else 0.0,
+                'recent': list(reversed(self._recent))
+            }
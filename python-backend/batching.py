@@ -0,0 +1,141 @@
+"""
+Cross-request dynamic batching for T5 summarization.
+
+Concurrent Flask requests submit their summaries to a shared queue. A single
+worker thread collects requests for up to BATCH_MAX_WAIT_MS (or until
+BATCH_MAX_SIZE are waiting), runs them through one padded generate call via
+SmartT5LargeDocumentGenerator.generate_t5_summaries_batch and hands each
+result back to its caller's Future.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import config
+
+
+class _SummaryRequest:
+    __slots__ = ('text', 'max_length', 'min_length', 'quality', 'custom_instruction', 'future', 'enqueued_at')
+
+    def __init__(self, text, max_length, min_length, quality, custom_instruction):
+        self.text = text
+        self.max_length = max_length
+        self.min_length = min_length
+        self.quality = quality
+        self.custom_instruction = custom_instruction
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class T5BatchScheduler:
+    """
+    Queue + worker thread that coalesces summary requests into batched generate calls
+    """
+
+    def __init__(self, generator, max_batch_size=None, max_wait_ms=None):
+        self.generator = generator
+        self.max_batch_size = max_batch_size or config.BATCH_MAX_SIZE
+        self.max_wait_ms = config.BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._wait_ms_total = 0.0
+        self._generate_calls = 0
+        self._sequences = 0
+        self._max_observed_batch = 0
+
+        self._worker = threading.Thread(target=self._run, name="t5-batch-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, text, max_length=512, min_length=100, quality='medium', custom_instruction=None):
+        """Queue one summary and return a Future resolving to the summary text"""
+        req = _SummaryRequest(text, max_length, min_length, quality, custom_instruction)
+        self._queue.put(req)
+        return req.future
+
+    def summarize(self, text, max_length=512, min_length=100, quality='medium', custom_instruction=None):
+        """Blocking variant of submit()"""
+        return self.submit(text, max_length, min_length, quality, custom_instruction).result()
+
+    def is_worker_thread(self):
+        return threading.current_thread() is self._worker
+
+    def get_stats(self):
+        """Batch sizes count sequences per T5 generate() call, not requests collected per round"""
+        with self._stats_lock:
+            requests = self._requests
+            calls = self._generate_calls
+            return {
+                'enabled': True,
+                'queue_depth': self._queue.qsize(),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_ms,
+                'batches': self._batches,
+                'requests': requests,
+                'generate_calls': calls,
+                'avg_batch_size': round(self._sequences / calls, 2) if calls else 0.0,
+                'max_observed_batch': self._max_observed_batch,
+                'batch_fill_ratio': round(self._sequences / (calls * self.max_batch_size), 3) if calls else 0.0,
+                'avg_queue_wait_ms': round(self._wait_ms_total / requests, 2) if requests else 0.0
+            }
+
+    def _record_generate(self, size):
+        with self._stats_lock:
+            self._generate_calls += 1
+            self._sequences += size
+            self._max_observed_batch = max(self._max_observed_batch, size)
+
+    def _collect(self):
+        """Block for the first request, then gather more until the wait window or batch size is hit"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Window closed: still take whatever is already waiting
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            with self._stats_lock:
+                self._batches += 1
+                self._requests += len(batch)
+                self._wait_ms_total += sum((started - r.enqueued_at) * 1000 for r in batch)
+
+            # Quality (beam count) and instruction must match within one generate call
+            groups = {}
+            for req in batch:
+                groups.setdefault((req.quality, req.custom_instruction), []).append(req)
+
+            for (quality, custom_instruction), reqs in groups.items():
+                try:
+                    summaries = self.generator.generate_t5_summaries_batch(
+                        [r.text for r in reqs],
+                        [(r.max_length, r.min_length) for r in reqs],
+                        quality=quality,
+                        custom_instruction=custom_instruction,
+                        generate_callback=self._record_generate
+                    )
+                except Exception as e:
+                    print(f"✗ Batch scheduler error: {e}")
+                    for r in reqs:
+                        r.future.set_exception(e)
+                    continue
+
+                for r, summary in zip(reqs, summaries):
+                    if summary is None:
+                        r.future.set_exception(RuntimeError("T5 summarization failed for this input"))
+                    else:
+                        r.future.set_result(summary)
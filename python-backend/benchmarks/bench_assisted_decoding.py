@@ -0,0 +1,77 @@
+"""
+Benchmark: assisted (draft-model) decoding vs plain greedy and beam search.
+
+Summarizes synthetic meeting passages three ways with the same summarizer:
+beam search ('medium', 4 beams), plain greedy decoding, and greedy decoding
+assisted by the draft model. Reports seconds per summary, the draft token
+acceptance rate and whether assisted output matches plain greedy exactly.
+
+Usage:
+    python benchmarks/bench_assisted_decoding.py --t5-model google/flan-t5-large --draft-model google/flan-t5-small
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import config
+from bench_t5_precision import passages
+from document_generator import SmartT5LargeDocumentGenerator
+
+
+def time_summaries(texts, summarize):
+    start = time.perf_counter()
+    summaries = [summarize(text) for text in texts]
+    return summaries, (time.perf_counter() - start) / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--t5-model', default="google/flan-t5-large")
+    parser.add_argument('--draft-model', default="google/flan-t5-small")
+    parser.add_argument('--precision', default=None, choices=config.T5_PRECISIONS, help="Default: config.T5_PRECISION")
+    parser.add_argument('--passages', type=int, default=4)
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--max-length', type=int, default=120)
+    args = parser.parse_args()
+
+    # Measure generation, not cache lookups or batching
+    config.SUMMARY_CACHE_ENABLED = False
+    config.BATCHING_ENABLED = False
+    config.T5_ASSISTED_DECODING = True
+    config.T5_ASSISTED_QUALITIES = ['greedy']
+    config.T5_DRAFT_MODEL = args.draft_model
+
+    generator = SmartT5LargeDocumentGenerator(t5_model=args.t5_model, t5_precision=args.precision)
+    if generator.assisted_stats is None:
+        sys.exit("❌ The draft model must differ from the summarizer")
+    generator.preload(['t5', 't5_draft'])
+    texts = passages(args.passages, args.words)
+    print(f"📄 {len(texts)} passage(s) of ~{args.words} words, model={args.t5_model}, "
+          f"draft={generator.draft_model_name}, precision={generator.t5_precision}")
+
+    def plain(quality):
+        def summarize(text):
+            with generator.using('t5'):
+                return generator._generate_t5_summary_direct(text, args.max_length, 20, quality, None)
+        return summarize
+
+    _, beam_seconds = time_summaries(texts, plain('medium'))
+    greedy, greedy_seconds = time_summaries(texts, plain('greedy'))
+    assisted, assisted_seconds = time_summaries(
+        texts, lambda text: generator.generate_t5_summary(text, args.max_length, 20, quality='greedy'))
+
+    stats = generator.assisted_stats.get_stats()
+    print(f"  beam (4)       {beam_seconds:8.2f}s/summary")
+    print(f"  greedy         {greedy_seconds:8.2f}s/summary")
+    print(f"  assisted       {assisted_seconds:8.2f}s/summary  acceptance={stats['acceptance_rate']:.2f}  "
+          f"tokens/pass={stats['tokens_per_pass']:.2f}")
+    print(f"⚡ Assisted vs greedy: {greedy_seconds / assisted_seconds:.2f}x, vs beam: {beam_seconds / assisted_seconds:.2f}x")
+    matches = sum(a == g for a, g in zip(assisted, greedy))
+    print(f"{'✅' if matches == len(texts) else '⚠️'} Assisted output identical to greedy for {matches}/{len(texts)} passages")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: per-chunk T5 loop vs batched chunk summarization.
+
+Compares chunks/second of the old one-generate-per-chunk loop against
+SmartT5LargeDocumentGenerator.generate_t5_summaries_batch on a synthetic
+meeting transcript.
+
+Usage:
+    python benchmarks/bench_batched_summary.py --t5-model google/flan-t5-base --words 4000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import config
+from document_generator import SmartT5LargeDocumentGenerator
+
+SENTENCES = [
+    "The client needs the reporting dashboard delivered before the end of the month",
+    "We agreed that the payment gateway integration is the highest priority",
+    "Ravi will own the database migration and report progress every week",
+    "The main risk is that the vendor API is not stable yet",
+    "Budget for the second phase is still waiting on finance approval",
+    "The team decided to move the mobile release to the next sprint",
+    "Customers have asked for export to PDF and Excel from every report",
+    "Infrastructure costs must stay below the agreed monthly limit",
+]
+
+
+def synthetic_transcript(words, seed=0):
+    rng = random.Random(seed)
+    out = []
+    while sum(len(s.split()) for s in out) < words:
+        out.append(rng.choice(SENTENCES) + ".")
+    return " ".join(out)
+
+
+def load_t5_generator(t5_model, t5_precision=None):
+    """Build a generator with only the T5 half loaded (Whisper/pyannote stay lazy, no ffmpeg needed)"""
+    generator = SmartT5LargeDocumentGenerator(t5_model=t5_model, t5_precision=t5_precision)
+    generator.preload(['t5'], warm=False)
+    return generator
+
+
+def prepare_chunks(generator, text, strategy='balanced'):
+    words = text.split()
+    size = config.CHUNK_SIZE_WORDS
+    chunks = [' '.join(words[i:i + size]) for i in range(0, len(words), size)]
+    lengths = []
+    for chunk in chunks:
+        chunk_config = generator.calculate_adaptive_summary_length(len(chunk.split()), strategy)
+        lengths.append((chunk_config['max_length'], chunk_config['min_length']))
+    return chunks, lengths
+
+
+def run_loop(generator, chunks, lengths, quality):
+    return [
+        generator.generate_t5_summary(chunk, max_length=mx, min_length=mn, quality=quality)
+        for chunk, (mx, mn) in zip(chunks, lengths)
+    ]
+
+
+def run_batched(generator, chunks, lengths, quality, token_budget):
+    return generator.generate_t5_summaries_batch(chunks, lengths, quality=quality, token_budget=token_budget)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--t5-model', default="google/flan-t5-base")
+    parser.add_argument('--words', type=int, default=4000)
+    parser.add_argument('--quality', default='medium', choices=['fast', 'medium', 'high', 'best'])
+    parser.add_argument('--token-budget', type=int, default=config.T5_BATCH_TOKEN_BUDGET)
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--precision', default=None, choices=config.T5_PRECISIONS, help="Default: config.T5_PRECISION")
+    args = parser.parse_args()
+
+    # Measure generation, not cache lookups
+    config.SUMMARY_CACHE_ENABLED = False
+
+    generator = load_t5_generator(args.t5_model, args.precision)
+    chunks, lengths = prepare_chunks(generator, synthetic_transcript(args.words))
+    print(f"📄 {len(chunks)} chunk(s) of ~{config.CHUNK_SIZE_WORDS} words, quality={args.quality}, "
+          f"token budget={args.token_budget}, device={generator.device}, precision={generator.t5_precision}")
+
+    # Warm-up so neither path pays first-call allocation costs
+    run_loop(generator, chunks[:1], lengths[:1], args.quality)
+
+    timings = {}
+    for name, fn in [
+        ('loop', lambda: run_loop(generator, chunks, lengths, args.quality)),
+        ('batched', lambda: run_batched(generator, chunks, lengths, args.quality, args.token_budget)),
+    ]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        elapsed = (time.perf_counter() - start) / args.repeat
+        timings[name] = elapsed
+        print(f"  {name:<8} {elapsed:8.2f}s  {len(chunks) / elapsed:8.2f} chunks/s")
+
+    print(f"⚡ Speedup: {timings['loop'] / timings['batched']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
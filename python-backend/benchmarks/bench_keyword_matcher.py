@@ -0,0 +1,102 @@
+"""
+Benchmark: naive substring keyword scans vs the compiled KeywordClassifier.
+
+Runs the old nine `any(w in lower for w in [...])` scans and the single-pass
+word-boundary classifier over a synthetic transcript, then reports
+sentences/second and the category hits on which the two disagree
+(substring false positives such as 'rs' in "users" or 'will' in "willing").
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py --sentences 50000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import config
+from keyword_classifier import KeywordClassifier
+
+# The substring tables extract_structured_info used before the compiled classifier
+NAIVE_KEYWORDS = {
+    'requirements': ['require', 'need', 'must', 'should', 'shall', 'expect'],
+    'decisions': ['decide', 'agreed', 'approved', 'confirmed', 'finalized'],
+    'action_items': ['will', 'task', 'action', 'assign', 'responsible', 'owner'],
+    'timeline': ['deadline', 'timeline', 'date', 'week', 'month', 'schedule', 'due'],
+    'budget': ['cost', 'budget', 'price', 'payment', 'fund', 'expense', '$', 'rs', 'rupee', 'inr'],
+    'risks': ['risk', 'concern', 'issue', 'challenge', 'problem', 'blocker'],
+    'technical': ['technical', 'technology', 'system', 'platform', 'api', 'database', 'infrastructure'],
+    'deliverables': ['deliver', 'output', 'product', 'feature', 'component', 'milestone'],
+    'stakeholders': ['stakeholder', 'team', 'department', 'client', 'customer', 'vendor']
+}
+
+SENTENCES = [
+    "The users said the new screen saves them hours every day",
+    "Priya is willing to review the onboarding flow",
+    "The system must export reports to PDF",
+    "We agreed to move the launch by one week",
+    "Ravi will own the database migration",
+    "The total budget is Rs 4 lakh for phase one",
+    "Our partners in the northern region were happy with the pilot",
+    "A major concern is the rapid growth in support tickets",
+    "The customer expects a demo at the end of the month",
+    "Everyone thanked the designers for the rapid turnaround",
+    "Let us update the capital expenditure sheet tomorrow",
+    "The vendor confirmed the API contract yesterday",
+]
+
+
+def naive_classify(sentence):
+    lower = sentence.lower()
+    return {category for category, words in NAIVE_KEYWORDS.items() if any(w in lower for w in words)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sentences', type=int, default=50000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    text = '. '.join(rng.choice(SENTENCES) for _ in range(args.sentences)) + '.'
+    sentences = [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
+
+    classifier = KeywordClassifier(config.EXTRACTION_KEYWORDS)
+
+    start = time.perf_counter()
+    naive = [naive_classify(s) for s in sentences]
+    naive_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [classifier.classify(s) for s in sentences]
+    compiled_s = time.perf_counter() - start
+
+    print(f"📄 {len(sentences)} sentences")
+    print(f"  naive     {naive_s:8.3f}s  {len(sentences) / naive_s:12.0f} sentences/s")
+    print(f"  compiled  {compiled_s:8.3f}s  {len(sentences) / compiled_s:12.0f} sentences/s")
+    print(f"⚡ Speedup: {naive_s / compiled_s:.2f}x")
+
+    dropped = Counter()
+    added = Counter()
+    for sentence, old, new in zip(sentences, naive, compiled):
+        for category in old - new:
+            dropped[(category, sentence)] += 1
+        for category in new - old:
+            added[(category, sentence)] += 1
+
+    print(f"\n🧹 Substring-only hits removed: {sum(dropped.values())}")
+    for (category, sentence), count in dropped.most_common(8):
+        print(f"  - {category:<13} x{count:<6} {sentence}")
+    if added:
+        print(f"\n➕ Hits only the compiled classifier finds: {sum(added.values())}")
+        for (category, sentence), count in added.most_common(5):
+            print(f"  + {category:<13} x{count:<6} {sentence}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,320 @@
+"""
+Benchmark suite: the whole backend on tiny random models, fully offline.
+
+Builds small randomly initialized T5 (summarizer + draft) and Whisper models
+(see tiny_models.py), then drives SmartT5LargeDocumentGenerator methods and
+the Flask endpoints (through the test client, uploads included) with
+synthetic transcripts and speech-like audio of increasing size. Caches are
+off so every run computes. For each case and size it records latency
+percentiles over --repeats runs (after one warm-up), throughput (words or
+audio seconds per second at the median) and the peak RSS while it ran.
+
+Results are compared with a JSON baseline: a case regresses when its median
+latency grows by more than --threshold and by at least --min-delta-ms, or its
+peak RSS by more than --rss-threshold, and the suite then exits non-zero.
+Peak RSS is only compared when both runs sampled it with psutil; without
+psutil it is the process high-water mark, which earlier cases set. Without a
+baseline file (or with --update-baseline) the results become the baseline.
+Baselines are per machine (the default file is git-ignored); the file
+records the CPU count and library versions, and a mismatch is reported.
+
+Usage:
+    python benchmarks/bench_offline_suite.py                        # compare with (or create) the baseline
+    python benchmarks/bench_offline_suite.py --cases t5_summary,http_transcribe --repeats 5
+    python benchmarks/bench_offline_suite.py --update-baseline
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import config
+import tiny_models
+from bench_batched_summary import synthetic_transcript
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'offline_baseline.json')
+PERCENTILES = (50, 90, 99)
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - optional dependency
+    psutil = None
+
+
+class PeakMemory:
+    """Peak RSS (MB) while the block runs: sampled with psutil, else the process high-water mark"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak_mb = None
+        self.source = 'psutil' if psutil is not None else 'ru_maxrss'
+        self._done = threading.Event()
+
+    def _sample(self):
+        process = psutil.Process()
+        while not self._done.is_set():
+            self.peak_mb = max(self.peak_mb or 0, process.memory_info().rss / (1024 * 1024))
+            self._done.wait(self.interval)
+
+    def __enter__(self):
+        if psutil is not None:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if psutil is not None:
+            self._done.set()
+            self._thread.join()
+        else:
+            try:
+                import resource
+                scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KB on Linux
+                self.peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+            except ImportError:
+                self.peak_mb = None
+
+
+def percentile(values, p):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    return ordered[max(0, -(-p * len(ordered) // 100) - 1)]
+
+
+def text_cases(generator, document_generator, client):
+    def t5_summary(text):
+        lengths = generator.calculate_adaptive_summary_length(len(text.split()), 'balanced')
+        return lambda: generator.generate_t5_summary(text, lengths['max_length'], lengths['min_length'])
+
+    def long_text_summary(text):
+        lengths = generator.calculate_adaptive_summary_length(len(text.split()), 'balanced')
+        return lambda: generator._summarize_long_text(text, lengths, 'medium', None)
+
+    def structured_extraction(text):
+        return lambda: generator.extract_structured_info(text)
+
+    def brd_document(text):
+        return lambda: document_generator.generate_document(text, 'brd')
+
+    def http_summarize(text):
+        return lambda: post(client, '/api/summarize', json={'text': text})
+
+    def http_generate_document(text):
+        return lambda: post(client, '/api/generate-document', json={'text': text, 'document_type': 'brd'})
+
+    return {f.__name__: f for f in (t5_summary, long_text_summary, structured_extraction, brd_document,
+                                   http_summarize, http_generate_document)}
+
+
+def audio_cases(generator, client, work_dir):
+    def audio_file(audio):
+        path = os.path.join(work_dir, f"speech_{len(audio)}.wav")
+        return tiny_models.write_wav(path, audio)
+
+    def transcribe(audio):
+        path = audio_file(audio)
+        return lambda: generator.transcribe_audio(path, audio=audio, use_cache=False)
+
+    def process_audio(audio):
+        path = audio_file(audio)
+        return lambda: generator.process_audio_smart(path, audio=audio, use_cache=False)
+
+    def upload(endpoint, audio):
+        with open(audio_file(audio), 'rb') as f:
+            data = f.read()
+        return lambda: post(client, endpoint, data={'audio': (io.BytesIO(data), 'bench.wav'), 'cache': 'false'},
+                            content_type='multipart/form-data')
+
+    def http_transcribe(audio):
+        return upload('/api/transcribe', audio)
+
+    def http_process_audio(audio):
+        return upload('/api/process-audio', audio)
+
+    return {f.__name__: f for f in (transcribe, process_audio, http_transcribe, http_process_audio)}
+
+
+def post(client, endpoint, **kwargs):
+    response = client.post(endpoint, **kwargs)
+    try:
+        if response.status_code != 200:
+            raise RuntimeError(f"{endpoint} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return response.get_data()
+    finally:
+        response.close()
+
+
+def measure(run, repeats, seed):
+    import torch
+
+    torch.manual_seed(seed)
+    run()  # warm-up: model loads, first-call allocations
+    seconds = []
+    with PeakMemory() as memory:
+        for _ in range(repeats):
+            torch.manual_seed(seed)  # Whisper's temperature fallback samples; keep runs identical
+            start = time.perf_counter()
+            run()
+            seconds.append(time.perf_counter() - start)
+    return seconds, memory
+
+
+def machine_info():
+    import torch
+    import transformers
+    import whisper
+
+    return {
+        'cpus': os.cpu_count(),
+        'torch_threads': torch.get_num_threads(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'torch': torch.__version__,
+        'transformers': transformers.__version__,
+        'whisper': getattr(whisper, '__version__', None),
+        't5_precision': config.T5_PRECISION
+    }
+
+
+def compare(results, baseline, threshold, rss_threshold, min_delta_s=0.005):
+    """
+    Regressions against the baseline as printable lines. Latency regresses only
+    when it grows by more than threshold and by at least min_delta_s, so
+    timer noise on millisecond cases is not flagged.
+    """
+    regressions = []
+    for key, result in results.items():
+        before = baseline['results'].get(key)
+        if before is None:
+            print(f"  {key:32s} new case (no baseline)")
+            continue
+        delta = result['p50_s'] - before['p50_s']
+        change = delta / before['p50_s'] if before['p50_s'] else 0.0
+        line = f"  {key:32s} p50 {before['p50_s']:8.3f}s → {result['p50_s']:8.3f}s ({change:+6.1%})"
+        if change > threshold and delta >= min_delta_s:
+            regressions.append(f"{key}: median latency {change:+.1%}, {delta * 1000:+.1f} ms "
+                               f"(limit +{threshold:.0%} and +{min_delta_s * 1000:g} ms)")
+            line += "  ❌"
+        # ru_maxrss is the process high-water mark, not this case's peak: only sampled values compare
+        sampled = result.get('rss_source') == before.get('rss_source') == 'psutil'
+        if sampled and result['peak_rss_mb'] and before.get('peak_rss_mb'):
+            rss_change = result['peak_rss_mb'] / before['peak_rss_mb'] - 1
+            line += f"  rss {rss_change:+6.1%}"
+            if rss_change > rss_threshold:
+                regressions.append(f"{key}: peak RSS {rss_change:+.1%} (limit +{rss_threshold:.0%})")
+                line += "  ❌"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', default=None, help="Comma-separated case names (default: all)")
+    parser.add_argument('--text-words', default="200,1000,2400", help="Transcript sizes in words")
+    parser.add_argument('--audio-seconds', default="10,30,60", help="Audio lengths in seconds")
+    parser.add_argument('--repeats', type=int, default=3, help="Timed runs per case and size (after one warm-up)")
+    parser.add_argument('--precision', default=None, choices=config.T5_PRECISIONS, help="Default: config.T5_PRECISION")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--update-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed median latency growth (0.25 = +25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help="Latency growth below this many ms is never a regression")
+    parser.add_argument('--rss-threshold', type=float, default=0.25, help="Allowed peak RSS growth")
+    parser.add_argument('--output', default=None, help="Also write this run's results to a JSON file")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Measure computation: no cached transcripts or summaries between runs
+    config.SUMMARY_CACHE_ENABLED = False
+    config.TRANSCRIPTION_CACHE_ENABLED = False
+    config.PRELOAD_MODELS = []
+    if args.precision:
+        config.T5_PRECISION = args.precision
+
+    with tempfile.TemporaryDirectory(prefix='bench-offline-') as work_dir:
+        models = tiny_models.install(work_dir, seed=args.seed)
+        import app
+        import document_generator
+
+        generator = document_generator.get_generator()
+        client = app.app.test_client()
+        cases = {name: ('words', case) for name, case in text_cases(generator, document_generator, client).items()}
+        cases.update({name: ('audio_s', case) for name, case in audio_cases(generator, client, work_dir).items()})
+        selected = args.cases.split(',') if args.cases else list(cases)
+        unknown = [name for name in selected if name not in cases]
+        if unknown:
+            sys.exit(f"❌ Unknown cases: {', '.join(unknown)}. Use: {', '.join(cases)}")
+
+        sizes = {
+            'words': [int(n) for n in args.text_words.split(',') if n.strip()],
+            'audio_s': [float(n) for n in args.audio_seconds.split(',') if n.strip()]
+        }
+        print(f"🧪 Tiny models: Whisper '{models['whisper']}', T5 {os.path.basename(models['t5'])} "
+              f"({generator.t5_precision}), {os.cpu_count()} CPU(s), {args.repeats} run(s) per size")
+
+        results = {}
+        for name in selected:
+            unit, case = cases[name]
+            for size in sizes[unit]:
+                if name == 'long_text_summary' and size <= 400:
+                    continue  # short texts never take the chunked path
+                if unit == 'words':
+                    subject = synthetic_transcript(size, seed=args.seed)
+                else:
+                    subject = tiny_models.synthetic_speech(size, seed=args.seed)
+                seconds, memory = measure(case(subject), args.repeats, args.seed)
+                p50 = percentile(seconds, 50)
+                key = f"{name}@{size:g}{'w' if unit == 'words' else 's'}"
+                # Unrounded, so comparisons see the measured values
+                results[key] = {
+                    'case': name, 'size': size, 'unit': unit,
+                    **{f"p{p}_s": percentile(seconds, p) for p in PERCENTILES},
+                    'mean_s': sum(seconds) / len(seconds),
+                    'throughput': size / p50 if p50 else None,
+                    'peak_rss_mb': memory.peak_mb,
+                    'rss_source': memory.source
+                }
+                r = results[key]
+                print(f"  {key:32s} p50 {r['p50_s']:8.3f}s  p90 {r['p90_s']:8.3f}s  p99 {r['p99_s']:8.3f}s  "
+                      f"{r['throughput']:9.1f} {unit}/s  peak {r['peak_rss_mb'] or 0:7.1f} MB")
+
+    run = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'machine': machine_info(),
+        'settings': {'repeats': args.repeats, 'seed': args.seed},
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(run, f, indent=2)
+        print(f"💾 Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"📏 Comparing with {args.baseline} ({baseline['created_at']})")
+    differing = {k: (v, run['machine'].get(k)) for k, v in baseline['machine'].items() if run['machine'].get(k) != v}
+    if differing:
+        print("⚠️ Baseline was recorded on a different setup: " +
+              ", ".join(f"{k} {old} → {new}" for k, (old, new) in differing.items()))
+    regressions = compare(results, baseline, args.threshold, args.rss_threshold, args.min_delta_ms / 1000)
+    if regressions:
+        print("❌ Regressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("✅ No regressions")
+
+
+if __name__ == '__main__':
+    main()
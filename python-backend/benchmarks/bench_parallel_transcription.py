@@ -0,0 +1,84 @@
+"""
+Benchmark: single-call Whisper transcription vs the long-audio worker pool.
+
+Transcribes the same recording (optionally repeated to --minutes) once with
+one in-process transcribe() call using every core, then with
+parallel_transcription for each --workers count. Worker start-up (model
+load) is timed separately from transcription. Reports wall time, speedup and
+how many words the two transcripts share.
+
+Usage:
+    python benchmarks/bench_parallel_transcription.py --audio meeting.mp3 --minutes 60 --whisper-model base --workers 2,4,8
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import numpy as np
+
+import config
+import parallel_transcription
+
+DECODE_OPTIONS = {'task': 'translate', 'beam_size': 5, 'best_of': 5, 'temperature': 0.0}
+
+
+def word_overlap(a, b):
+    """Share of words (multiset) the two transcripts have in common"""
+    ca, cb = Counter(a.lower().split()), Counter(b.lower().split())
+    total = max(sum(ca.values()), sum(cb.values()))
+    return sum((ca & cb).values()) / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--audio', required=True, help="Any file ffmpeg can decode")
+    parser.add_argument('--minutes', type=float, default=None, help="Repeat the audio up to this length")
+    parser.add_argument('--whisper-model', default=config.WHISPER_MODEL)
+    parser.add_argument('--workers', default="2,4")
+    parser.add_argument('--span-seconds', type=int, default=config.PARALLEL_TRANSCRIPTION_SPAN_S)
+    args = parser.parse_args()
+
+    import torch
+    import whisper
+    import snapshots
+
+    audio = whisper.load_audio(args.audio)
+    if args.minutes:
+        samples = int(args.minutes * 60 * config.SAMPLING_RATE)
+        audio = np.tile(audio, -(-samples // len(audio)))[:samples]
+    minutes = len(audio) / config.SAMPLING_RATE / 60
+    print(f"🎵 {minutes:.1f} min of audio, Whisper '{args.whisper_model}', {os.cpu_count()} cores")
+
+    torch.set_num_threads(os.cpu_count() or 1)
+    model = snapshots.load_whisper(whisper, args.whisper_model, "cpu") or whisper.load_model(args.whisper_model, device="cpu")
+    start = time.perf_counter()
+    baseline = model.transcribe(audio, language=None, fp16=False, verbose=None, **DECODE_OPTIONS)
+    baseline_seconds = time.perf_counter() - start
+    del model
+    print(f"  single call   {baseline_seconds:8.1f}s  ({minutes * 60 / baseline_seconds:5.1f}x real time)")
+
+    config.PARALLEL_TRANSCRIPTION_SPAN_S = args.span_seconds
+    for count in [int(w) for w in args.workers.split(',') if w.strip()]:
+        config.PARALLEL_TRANSCRIPTION_WORKERS = count
+        # Load a model in every worker before timing
+        start = time.perf_counter()
+        warmup = np.zeros(config.SAMPLING_RATE, dtype=np.float32)
+        with parallel_transcription.leased_pool(args.whisper_model) as pool:
+            list(pool.map(parallel_transcription._transcribe_span, [warmup] * count, [DECODE_OPTIONS] * count))
+        startup_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = parallel_transcription.transcribe(audio, args.whisper_model, DECODE_OPTIONS)
+        seconds = time.perf_counter() - start
+        print(f"  {count} workers     {seconds:8.1f}s  ({minutes * 60 / seconds:5.1f}x real time)  "
+              f"speedup {baseline_seconds / seconds:4.2f}x  spans={result['spans']}  "
+              f"start-up {startup_seconds:.1f}s  word overlap {word_overlap(result['text'], baseline['text']):.1%}")
+        parallel_transcription.shutdown()
+
+
+if __name__ == '__main__':
+    main()
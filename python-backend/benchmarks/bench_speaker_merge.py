@@ -0,0 +1,98 @@
+"""
+Benchmark: nested-loop vs sweep-line speaker assignment.
+
+Builds synthetic calls where Whisper segments and pyannote turns both grow
+with call length, times the original O(N x M) loop against
+merge_transcription_with_diarization, and checks both give identical output.
+
+Usage:
+    python benchmarks/bench_speaker_merge.py --sizes 500 2000 8000   # the 8000 nested loop takes over a minute
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from unittest.mock import MagicMock
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Only the merge logic is measured; keep model libraries out of the import
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+from document_generator import SmartT5LargeDocumentGenerator
+
+
+def nested_loop_merge(transcription_segments, speaker_segments):
+    """merge_transcription_with_diarization before the sweep-line rewrite"""
+    merged_segments = []
+    for w_seg in transcription_segments:
+        seg_start = w_seg.get('start', 0)
+        seg_end = w_seg.get('end', 0)
+        text = w_seg.get('text', '').strip()
+        if not text:
+            continue
+        assigned_speaker = "UNKNOWN"
+        max_overlap = 0
+        for p_seg in speaker_segments:
+            overlap = max(0, min(seg_end, p_seg['end']) - max(seg_start, p_seg['start']))
+            if overlap > max_overlap:
+                max_overlap = overlap
+                assigned_speaker = p_seg['speaker']
+        merged_segments.append({'start': seg_start, 'end': seg_end, 'text': text, 'speaker': assigned_speaker})
+
+    speaker_counts = {}
+    for seg in merged_segments:
+        speaker_counts[seg['speaker']] = speaker_counts.get(seg['speaker'], 0) + 1
+    sorted_speakers = sorted(speaker_counts.items(), key=lambda x: x[1], reverse=True)
+    speaker_map = {spk: f"Speaker {i}" for i, (spk, _) in enumerate(sorted_speakers, 1)}
+    for seg in merged_segments:
+        seg['speaker'] = speaker_map.get(seg['speaker'], "Speaker ?")
+    return merged_segments
+
+
+def synthetic_call(rng, n_segments, speakers=4):
+    """~4 s Whisper segments and pyannote turns of similar density over the same timeline"""
+    segments, turns = [], []
+    t = 0.0
+    for i in range(n_segments):
+        length = rng.uniform(1.0, 7.0)
+        segments.append({'id': i, 'start': round(t, 2), 'end': round(t + length, 2), 'text': f"segment {i}"})
+        t += length + rng.uniform(0.0, 0.5)
+    duration = t
+    t = 0.0
+    while t < duration:
+        length = rng.uniform(0.5, 6.0)
+        turns.append({'start': round(t, 3), 'end': round(t + length, 3),
+                      'speaker': f"SPEAKER_{rng.randrange(speakers):02d}"})
+        t += length - rng.uniform(0.0, 0.4)  # small overlaps between turns
+    return segments, turns
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 1000, 2000, 4000])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+    rng = random.Random(args.seed)
+
+    print(f"{'segments':>9} {'turns':>7} {'nested (s)':>11} {'sweep (s)':>10} {'speedup':>8}  same")
+    for size in args.sizes:
+        segments, turns = synthetic_call(rng, size)
+        expected, nested_s = timed(nested_loop_merge, segments, turns)
+        merged, sweep_s = timed(generator.merge_transcription_with_diarization, segments, turns)
+        print(f"{len(segments):>9} {len(turns):>7} {nested_s:>11.3f} {sweep_s:>10.4f} "
+              f"{nested_s / sweep_s:>7.0f}x  {'✅' if merged == expected else '❌'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: T5 summary latency and quality per inference precision.
+
+Summarizes the same synthetic meeting passages with fp32 and each other
+precision (bf16, int8 dynamic quantization, ...) and reports seconds per
+summary, the speedup over fp32 and the token overlap (ROUGE-L F1) of each
+summary with the fp32 one. Exits non-zero when a mode's mean overlap drops
+below --min-overlap, so it can gate a T5_PRECISION change.
+
+Usage:
+    python benchmarks/bench_t5_precision.py --t5-model google/flan-t5-large --modes fp32,bf16,int8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import config
+from bench_batched_summary import SENTENCES
+from document_generator import SmartT5LargeDocumentGenerator
+
+
+def passages(count, words, seed=0):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        sentences = []
+        while sum(len(s.split()) for s in sentences) < words:
+            sentences.append(rng.choice(SENTENCES) + ".")
+        out.append(" ".join(sentences))
+    return out
+
+
+def rouge_l_f1(candidate, reference):
+    """Longest-common-subsequence F1 over lower-cased word tokens"""
+    a, b = candidate.lower().split(), reference.lower().split()
+    if not a or not b:
+        return float(a == b)
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(a), lcs / len(b)
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_mode(t5_model, precision, texts, quality, max_length):
+    generator = SmartT5LargeDocumentGenerator(t5_model=t5_model, t5_precision=precision)
+    generator.preload(['t5'])  # load + warm-up outside the timed loop
+    summaries = []
+    start = time.perf_counter()
+    for text in texts:
+        summaries.append(generator.generate_t5_summary(text, max_length=max_length, min_length=20, quality=quality))
+    elapsed = (time.perf_counter() - start) / len(texts)
+    size_mb = generator.models.get_stats()[generator.model_keys['t5']]['size_mb']
+    return generator.t5_precision, summaries, elapsed, size_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--t5-model', default="google/flan-t5-base")
+    parser.add_argument('--modes', default="fp32,bf16,int8", help="Comma-separated precisions; fp32 is always the baseline")
+    parser.add_argument('--passages', type=int, default=4)
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--quality', default='medium', choices=['fast', 'medium', 'high', 'best'])
+    parser.add_argument('--max-length', type=int, default=120)
+    parser.add_argument('--min-overlap', type=float, default=0.6, help="Fail when a mode's mean ROUGE-L F1 vs fp32 is lower")
+    args = parser.parse_args()
+
+    # Measure generation, not cache lookups or batching
+    config.SUMMARY_CACHE_ENABLED = False
+    config.BATCHING_ENABLED = False
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip() and m.strip() != 'fp32']
+    texts = passages(args.passages, args.words)
+    print(f"📄 {len(texts)} passage(s) of ~{args.words} words, model={args.t5_model}, quality={args.quality}")
+
+    _, baseline, baseline_seconds, baseline_mb = run_mode(args.t5_model, 'fp32', texts, args.quality, args.max_length)
+    print(f"\n  {'mode':<6} {'s/summary':>10} {'speedup':>8} {'weights MB':>11} {'overlap':>8}")
+    print(f"  {'fp32':<6} {baseline_seconds:10.2f} {1.0:7.2f}x {baseline_mb or 0:11.1f} {1.0:8.3f}")
+
+    failed = []
+    for mode in modes:
+        effective, summaries, seconds, size_mb = run_mode(args.t5_model, mode, texts, args.quality, args.max_length)
+        overlap = sum(rouge_l_f1(s, b) for s, b in zip(summaries, baseline)) / len(texts)
+        label = mode if effective == mode else f"{mode}->{effective}"
+        print(f"  {label:<6} {seconds:10.2f} {baseline_seconds / seconds:7.2f}x {size_mb or 0:11.1f} {overlap:8.3f}")
+        if overlap < args.min_overlap:
+            failed.append(label)
+
+    if failed:
+        print(f"\n❌ Overlap with fp32 below {args.min_overlap}: {', '.join(failed)}")
+        sys.exit(1)
+    print(f"\n✅ All modes within overlap threshold {args.min_overlap}")
+
+
+if __name__ == '__main__':
+    main()
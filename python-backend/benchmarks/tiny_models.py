@@ -0,0 +1,152 @@
+"""
+Tiny, randomly initialized T5 and Whisper models built offline for benchmarks.
+
+The weights are random, so the text they produce is nonsense, but the code
+paths and tensor shapes are the real ones: T5ForConditionalGeneration with a
+sentencepiece tokenizer trained on the synthetic meeting sentences, and a
+whisper.model.Whisper with the real mel front end, audio context and
+multilingual vocabulary, saved as a model snapshot (see snapshots.py) so the
+generator loads it like a downloaded model. Nothing is fetched from the network.
+
+A randomly initialized Whisper decoder repeats one token forever, which the
+repetition guard cuts at once, so nothing would be decoded. The benchmark
+Whisper decoder is therefore shaped (see _scripted_decoder) to emit a
+confident, non-repeating token stream with an end of text every
+WHISPER_TOKENS_PER_WINDOW positions: about as many tokens as real speech.
+Every layer still runs, so the compute per token is real.
+
+Usage (from another benchmark):
+    import tiny_models
+    tiny_models.install(work_dir)   # points config at the built models
+"""
+import os
+import random
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import numpy as np
+
+import config
+from bench_batched_summary import SENTENCES
+
+WHISPER_NAME = "bench-tiny"
+# Per-size T5 shapes; the draft model keeps the vocabulary and is shallower
+T5_SHAPES = {
+    't5': dict(d_model=128, d_ff=256, num_layers=2, num_heads=4, d_kv=32),
+    'draft': dict(d_model=64, d_ff=128, num_layers=1, num_heads=2, d_kv=32),
+}
+WHISPER_SHAPE = dict(n_mels=80, n_audio_ctx=1500, n_audio_state=128, n_audio_head=2, n_audio_layer=2,
+                     n_vocab=51865, n_text_ctx=448, n_text_state=128, n_text_head=2, n_text_layer=2)
+WHISPER_TOKENS_PER_WINDOW = 96
+
+
+def _corpus(path, lines=3000, seed=0):
+    rng = random.Random(seed)
+    words = ' '.join(SENTENCES).lower().split()
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(lines):
+            f.write(' '.join(rng.choice(words) for _ in range(rng.randint(8, 24))) + '\n')
+
+
+def build_t5(directory, vocab_size=512, seed=0):
+    """Write a random summarizer and draft model (sharing one tokenizer); returns their paths"""
+    import sentencepiece as spm
+    import torch
+    from transformers import T5Config, T5ForConditionalGeneration, T5Tokenizer
+
+    os.makedirs(directory, exist_ok=True)
+    corpus = os.path.join(directory, 'corpus.txt')
+    _corpus(corpus, seed=seed)
+    prefix = os.path.join(directory, 'spiece')
+    spm.SentencePieceTrainer.train(input=corpus, model_prefix=prefix, vocab_size=vocab_size, model_type='unigram',
+                                   pad_id=0, eos_id=1, unk_id=2, bos_id=-1, hard_vocab_limit=False,
+                                   minloglevel=2)
+    tokenizer = T5Tokenizer(prefix + '.model', legacy=False, extra_ids=0)
+
+    paths = {}
+    for index, (name, shape) in enumerate(T5_SHAPES.items()):
+        torch.manual_seed(seed + index)
+        model_config = T5Config(vocab_size=len(tokenizer), decoder_start_token_id=0, pad_token_id=0, eos_token_id=1,
+                                **shape)
+        paths[name] = os.path.join(directory, f"flan-t5-bench-{name}")
+        T5ForConditionalGeneration(model_config).save_pretrained(paths[name])
+        tokenizer.save_pretrained(paths[name])
+    return paths
+
+
+def _scripted_decoder(model, eot):
+    import torch
+
+    with torch.no_grad():
+        # Zero the residual branches: the next token then depends only on the position
+        for block in model.decoder.blocks:
+            for layer in (block.attn.out, block.cross_attn.out, block.mlp[2]):
+                layer.weight.zero_()
+                if layer.bias is not None:
+                    layer.bias.zero_()
+        embedding = model.decoder.token_embedding.weight
+        embedding.mul_(4)  # confident choices: avg_logprob near 0, no temperature fallback
+        positions = model.decoder.positional_embedding
+        positions.copy_(torch.randn_like(positions) * 100)
+        positions[WHISPER_TOKENS_PER_WINDOW - 1::WHISPER_TOKENS_PER_WINDOW] = embedding[eot] * 100
+
+
+def build_whisper(seed=0):
+    """Save a random Whisper as the snapshot of WHISPER_NAME under config.MODEL_SNAPSHOT_DIR"""
+    import torch
+    import whisper
+    import snapshots
+
+    torch.manual_seed(seed)
+    model = whisper.model.Whisper(whisper.model.ModelDimensions(**WHISPER_SHAPE))
+    eot = whisper.tokenizer.get_tokenizer(model.is_multilingual, num_languages=model.num_languages).eot
+    _scripted_decoder(model, eot)
+    snapshots.save_whisper(WHISPER_NAME, model)
+    return WHISPER_NAME
+
+
+def install(work_dir, seed=0):
+    """Build both models in work_dir and make them config's defaults; returns {'whisper', 't5', 'draft'}"""
+    config.MODEL_SNAPSHOTS_ENABLED = True
+    config.MODEL_SNAPSHOT_DIR = os.path.join(work_dir, 'snapshots')
+    paths = build_t5(os.path.join(work_dir, 't5'), seed=seed)
+    config.SUMMARIZATION_MODEL = paths['t5']
+    config.T5_DRAFT_MODEL = paths['draft']
+    config.WHISPER_MODEL = build_whisper(seed)
+    return {'whisper': config.WHISPER_MODEL, **paths}
+
+
+def synthetic_speech(seconds, seed=0, sample_rate=None):
+    """
+    Speech-like 16 kHz waveform: voiced 'syllables' (harmonics of a wandering
+    pitch, ~4 per second) in utterances of 2-6 s separated by pauses over a
+    quiet noise floor, so VAD keeps realistic speech regions.
+    """
+    sample_rate = sample_rate or config.SAMPLING_RATE
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    audio = rng.normal(0, 0.002, total).astype(np.float32)
+    position = int(rng.uniform(0.2, 0.8) * sample_rate)
+    while position < total:
+        length = min(int(rng.uniform(2, 6) * sample_rate), total - position)
+        t = np.arange(length) / sample_rate
+        pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.2, 0.6) * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+        voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+        envelope = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t), 0, None) ** 0.5
+        audio[position:position + length] += (0.1 * voiced * envelope).astype(np.float32)
+        position += length + int(rng.uniform(0.4, 1.5) * sample_rate)
+    return audio
+
+
+def write_wav(path, audio, sample_rate=None):
+    """16-bit PCM WAV (what the upload endpoints accept and ffmpeg decodes)"""
+    import wave
+
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate or config.SAMPLING_RATE)
+        f.writeframes((np.clip(audio, -1, 1) * 32767).astype('<i2').tobytes())
+    return path
@@ -0,0 +1,239 @@
+"""
+Result caches for expensive model calls.
+
+DiskLRUCache stores JSON entries as one file per key and evicts the least
+recently used entries once the directory grows past its byte budget.
+MemoryLRUCache is the in-process equivalent bounded by entry count;
+SummaryCache layers the two for T5 summaries.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import config
+
+
+def make_cache_key(**parts):
+    """Stable SHA-256 over keyword parts (order-independent)"""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def sha256_file(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DiskLRUCache:
+    """
+    Size-bounded on-disk JSON cache with LRU eviction and hit/miss counters
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # key -> size in bytes, oldest first
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Rebuild LRU order from modification times (bumped on every hit)
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._evict()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    value = json.load(f)
+                os.utime(path)
+            except (OSError, ValueError):
+                # Entry vanished or is corrupt; forget it
+                self._bytes -= self._index.pop(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        data = json.dumps(value, ensure_ascii=False, default=float).encode('utf-8')
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            path = self._path(key)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+            self._bytes -= self._index.pop(key, 0)
+            self._index[key] = len(data)
+            self._bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._index),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+
+class MemoryLRUCache:
+    """
+    Thread-safe in-memory LRU bounded by number of entries
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+
+class SummaryCache:
+    """
+    Two-tier (memory, then optional disk) cache of T5 summaries
+    """
+
+    def __init__(self, max_entries, disk_directory=None, disk_max_bytes=None):
+        self.memory = MemoryLRUCache(max_entries)
+        self.disk = DiskLRUCache(disk_directory, disk_max_bytes) if disk_directory else None
+
+    @staticmethod
+    def make_key(text, max_length, min_length, quality, custom_instruction, model_name):
+        """Whitespace-normalized key over everything generate_t5_summary depends on"""
+        return make_cache_key(
+            text=' '.join(text.split()),
+            max_length=max_length,
+            min_length=min_length,
+            quality=quality,
+            custom_instruction=custom_instruction,
+            model=model_name
+        )
+
+    def get(self, key):
+        summary = self.memory.get(key)
+        if summary is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                summary = entry['summary']
+                self.memory.put(key, summary)
+        return summary
+
+    def put(self, key, summary):
+        self.memory.put(key, summary)
+        if self.disk is not None:
+            self.disk.put(key, {'summary': summary})
+
+    def get_stats(self):
+        return {
+            'memory': self.memory.get_stats(),
+            'disk': self.disk.get_stats() if self.disk is not None else None
+        }
+
+
+# Global instances
+_transcription_cache = None
+_summary_cache = None
+
+
+def get_transcription_cache():
+    """Shared Whisper result cache, or None when disabled in config"""
+    global _transcription_cache
+    if not config.TRANSCRIPTION_CACHE_ENABLED:
+        return None
+    if _transcription_cache is None:
+        _transcription_cache = DiskLRUCache(
+            config.TRANSCRIPTION_CACHE_DIR,
+            config.TRANSCRIPTION_CACHE_MAX_MB * 1024 * 1024
+        )
+    return _transcription_cache
+
+
+def get_summary_cache():
+    """Shared T5 summary cache, or None when disabled in config"""
+    global _summary_cache
+    if not config.SUMMARY_CACHE_ENABLED:
+        return None
+    if _summary_cache is None:
+        _summary_cache = SummaryCache(
+            config.SUMMARY_CACHE_MAX_ENTRIES,
+            disk_directory=config.SUMMARY_CACHE_DIR if config.SUMMARY_CACHE_DISK else None,
+            disk_max_bytes=config.SUMMARY_CACHE_DISK_MAX_MB * 1024 * 1024
+        )
+    return _summary_cache
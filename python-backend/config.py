@@ -2,6 +2,7 @@
 Configuration settings for the Audio Transcription Backend
 """
 import os
+import json
 from pathlib import Path
 
 # Base directory
@@ -13,23 +14,98 @@ UPLOAD_FOLDER.mkdir(exist_ok=True)
 
 # Maximum file size (100MB)
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB in bytes
+STREAM_DECODE_UPLOADS = True  # Decode audio with ffmpeg while the upload is still arriving
 
 # Allowed audio file extensions
 ALLOWED_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.ogg', '.flac', '.aac', '.wma', '.webm'}
 
 # Model settings
-WHISPER_MODEL = "openai/whisper-large-v3"  # Options: tiny, base, small, medium, large
-SUMMARIZATION_MODEL = "google/flan-t5-large"
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")  # Size (tiny, base, small, large) or Whisper model name / "openai/whisper-*" id
+SUMMARIZATION_MODEL = os.getenv("SUMMARIZATION_MODEL", "google/flan-t5-large")  # Size (small, base, large) or HF model id/path
+
+# Model sizes a request may pick (whisper_size / t5_size) -> model names
+WHISPER_SIZES = {'tiny': 'tiny', 'base': 'base', 'small': 'small', 'large': 'large-v3'}
+T5_SIZES = {'small': 'google/flan-t5-small', 'base': 'google/flan-t5-base', 'large': 'google/flan-t5-large'}
+
+# Resident model memory budget; least recently used idle models are unloaded to stay under it
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))  # 0 = no limit
+# safetensors snapshots of downloaded weights, reused on later starts (memory-mapped, no checksum pass)
+MODEL_SNAPSHOTS_ENABLED = os.getenv("MODEL_SNAPSHOTS", "True").lower() == "true"
+MODEL_SNAPSHOT_DIR = Path(os.getenv("MODEL_SNAPSHOT_DIR", str(BASE_DIR / 'model_snapshots')))
+# Approximate fp32 footprints used for budgeting before a model has been loaded once
+MODEL_MEMORY_ESTIMATES_MB = {
+    'tiny': 150, 'base': 290, 'small': 970, 'medium': 3000, 'large-v3': 6200,
+    'google/flan-t5-small': 300, 'google/flan-t5-base': 990, 'google/flan-t5-large': 3100,
+    'diarization': 100
+}
+# T5 inference precision: auto (fp16 on GPU, int8 on CPU), fp32, fp16, bf16 or int8 (dynamic
+# quantization of the Linear layers, CPU only). Unsupported choices fall back to fp32 / fp16 with a warning
+T5_PRECISION = os.getenv("T5_PRECISION", "auto").lower()
+T5_PRECISIONS = ('auto', 'fp32', 'fp16', 'bf16', 'int8')
+# Share of the fp32 estimate a T5 model takes in each precision (int8 keeps embeddings in fp32)
+T5_PRECISION_MEMORY_FACTOR = {'fp32': 1.0, 'fp16': 0.5, 'bf16': 0.5, 'int8': 0.4}
 HUGGINGFACE_TOKEN = os.getenv("HUGGINGFACE_TOKEN")
+# Models loaded and warmed up in the background at startup (comma-separated: t5, whisper, diarization);
+# the rest load on first use
+PRELOAD_MODELS = [name.strip() for name in os.getenv("PRELOAD_MODELS", "t5").split(",") if name.strip()]
+# Models that must be warm before /api/health/ready reports ready (default: the preloaded ones)
+READY_MODELS = [name.strip() for name in os.getenv("READY_MODELS", ",".join(PRELOAD_MODELS)).split(",") if name.strip()]
 
 # Speaker Diarization Settings
 MIN_SPEAKERS = None
 MAX_SPEAKERS = None
+PARALLEL_DIARIZATION = os.getenv("PARALLEL_DIARIZATION", "True").lower() == "true"  # Diarize while Whisper transcribes
+# Long-audio mode: recordings of at least PARALLEL_TRANSCRIPTION_MIN_S are cut at pauses into spans that
+# a pool of worker processes transcribes in parallel (CPU only; every worker holds its own Whisper model)
+PARALLEL_TRANSCRIPTION_WORKERS = int(os.getenv("PARALLEL_TRANSCRIPTION_WORKERS", "0"))  # 0 or 1 = off
+PARALLEL_TRANSCRIPTION_THREADS = int(os.getenv("PARALLEL_TRANSCRIPTION_THREADS", "0"))  # torch threads per worker; 0 = cores / workers
+PARALLEL_TRANSCRIPTION_MIN_S = int(os.getenv("PARALLEL_TRANSCRIPTION_MIN_S", "600"))
+PARALLEL_TRANSCRIPTION_SPAN_S = 300  # Target span length
+PARALLEL_TRANSCRIPTION_SEARCH_S = 20  # Each cut goes to the quietest frame within this distance of the span boundary
+
+# Streaming transcription (/api/transcribe/stream): speech is decoded span by span, each cut at the quietest
+# frame within STREAM_SEARCH_S of the boundary, so spans stay within one 30 s Whisper window
+STREAM_SPAN_S = 25
+STREAM_SEARCH_S = 5
 
 # Whisper settings
 CHUNK_LENGTH_S = 30  # Chunk length for long-form transcription
 SAMPLING_RATE = 16000  # Required sampling rate for Whisper
 
+# Repetition guard: a Whisper window that falls into a loop is cut off as soon as the loop shows and
+# skipped like silence, instead of decoded to the token limit and retried at higher temperatures
+REPETITION_GUARD_ENABLED = os.getenv("REPETITION_GUARD", "True").lower() == "true"
+REPETITION_GUARD_MIN_REPEATS = 4  # Back-to-back repeats of one n-gram that count as a loop
+REPETITION_GUARD_MIN_LOOP_TOKENS = 16  # ...and at least this many tokens in total (a 1-token loop needs 16 repeats)
+REPETITION_GUARD_MAX_NGRAM = 32  # Longer loops are caught by the compression ratio
+REPETITION_GUARD_COMPRESSION_RATIO = 2.4  # Whisper's own compression_ratio_threshold
+REPETITION_GUARD_CHECK_EVERY = 8  # Decoding steps between compression-ratio checks
+
+# Latency budgets (latency_budget / profile request fields). Estimated Whisper compute seconds per second
+# of audio on CPU with 5-beam search; refined at runtime from measured transcriptions
+WHISPER_COST_PRIORS = {'tiny': 0.05, 'base': 0.1, 'small': 0.3, 'medium': 0.8, 'large-v3': 1.6}
+WHISPER_GREEDY_COST_FACTOR = 0.5  # Greedy decoding relative to 5 beams
+WHISPER_FALLBACK_COST_FACTOR = 1.25  # Temperature fallback re-decodes the windows that fail its checks
+WHISPER_GPU_SPEEDUP = 10
+WHISPER_FALLBACK_TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)  # 'accurate' profile
+MODEL_LOAD_MB_PER_SECOND = 200  # Load-time estimate for a model that has never loaded
+
+# Voice activity detection: only speech regions are sent to Whisper (silence, pauses and quiet gaps are skipped)
+VAD_ENABLED = os.getenv("VAD", "True").lower() == "true"
+VAD_FRAME_MS = 30  # Energy frame length
+VAD_MIN_DB = float(os.getenv("VAD_MIN_DB", "-50"))  # Frames quieter than this (dBFS) are never speech
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "10"))  # Speech must be this much louder than the noise floor
+VAD_NOISE_PERCENTILE = 10  # Frame-energy percentile taken as the noise floor
+VAD_MIN_SPEECH_MS = 250  # Shorter bursts (clicks, bumps) are dropped
+VAD_MIN_SILENCE_MS = 600  # Shorter pauses stay inside the surrounding speech region
+VAD_PAD_MS = 200  # Context kept on both sides of each speech region
+VAD_MIN_SKIP_FRACTION = 0.05  # Decode the untouched audio when trimming would save less than this
+
+# Transcription cache (keyed by audio SHA-256 + Whisper model + decode options)
+TRANSCRIPTION_CACHE_ENABLED = os.getenv("TRANSCRIPTION_CACHE", "True").lower() == "true"
+TRANSCRIPTION_CACHE_DIR = BASE_DIR / 'cache' / 'transcriptions'
+TRANSCRIPTION_CACHE_MAX_MB = int(os.getenv("TRANSCRIPTION_CACHE_MAX_MB", "500"))  # LRU eviction beyond this
+
 # Summarization settings
 SUMMARY_MAX_LENGTH = 150
 SUMMARY_MIN_LENGTH = 40
@@ -39,8 +115,74 @@ SUMMARY_RATIO = 0.85  # Summary length as ratio of original (85% - minimal compr
 SUMMARY_MIN_WORDS = 50  # Minimum words to attempt summarization
 SUMMARY_MAX_WORDS = 1000  # Maximum summary length
 
+# Structured-info extraction keywords (BRD/PO sections)
+# Matched case-insensitively on word boundaries; a trailing '*' also matches longer
+# words that start with the keyword ('require*' -> 'requirements').
+# Set EXTRACTION_KEYWORDS_FILE to a JSON file of the same shape to override.
+EXTRACTION_KEYWORDS = {
+    'requirements': ['require*', 'need*', 'must', 'should', 'shall', 'expect*'],
+    'decisions': ['decide*', 'agreed', 'approved', 'confirmed', 'finalized'],
+    'action_items': ['will', 'task*', 'action*', 'assign*', 'responsible', 'owner*'],
+    'timeline': ['deadline*', 'timeline*', 'date', 'dates', 'dated', 'week*', 'month*', 'schedule*', 'due'],
+    'budget': ['cost*', 'budget*', 'price*', 'pricing', 'payment*', 'fund', 'funds', 'funding', 'expense*', '$*', 'rs', 'rupee*', 'inr'],
+    'risks': ['risk*', 'concern*', 'issue*', 'challenge*', 'problem*', 'blocker*'],
+    'technical': ['technical', 'technology', 'technologies', 'system*', 'platform*', 'api*', 'database*', 'infrastructure'],
+    'deliverables': ['deliver*', 'output*', 'product', 'products', 'feature*', 'component*', 'milestone*'],
+    'stakeholders': ['stakeholder*', 'team*', 'department*', 'client*', 'customer*', 'vendor*']
+}
+if os.getenv("EXTRACTION_KEYWORDS_FILE"):
+    with open(os.getenv("EXTRACTION_KEYWORDS_FILE"), encoding='utf-8') as f:
+        EXTRACTION_KEYWORDS = json.load(f)
+
 # Chunking settings for long audio
 CHUNK_SIZE_WORDS = 400  # Words per chunk (reduced to fit 1024 token limit)
+T5_BATCH_TOKEN_BUDGET = 8192  # Max padded input tokens x beams per batched T5 generate call
+
+# Cross-request batching (concurrent summaries share one generate call)
+BATCHING_ENABLED = os.getenv("T5_BATCHING", "True").lower() == "true"
+BATCH_MAX_SIZE = int(os.getenv("T5_BATCH_MAX_SIZE", "8"))  # Max sequences per scheduled batch
+BATCH_MAX_WAIT_MS = int(os.getenv("T5_BATCH_MAX_WAIT_MS", "20"))  # How long the worker waits to fill a batch
+
+# Assisted (speculative) decoding: a small draft model proposes tokens that the summarizer verifies.
+# Output equals greedy decoding with the main model, with fewer full-size decoder passes
+T5_ASSISTED_DECODING = os.getenv("T5_ASSISTED_DECODING", "False").lower() == "true"  # Opt-in: loads a draft model
+T5_DRAFT_MODEL = os.getenv("T5_DRAFT_MODEL", "small")  # Size from T5_SIZES or HF model id/path (same vocabulary)
+# Qualities decoded with the draft model; only single-beam ones are served, beam qualities keep beam search
+T5_ASSISTED_QUALITIES = [q.strip() for q in os.getenv("T5_ASSISTED_QUALITIES", "greedy").split(",") if q.strip()]
+T5_ASSISTED_STATS_HISTORY = 100  # Recent requests kept for acceptance stats
+
+# Streamed summaries ("stream": true) decode token by token: greedy, or nucleus sampling with "sample": true
+T5_STREAM_TOP_P = 0.9
+T5_STREAM_TEMPERATURE = 0.7
+
+# Summary cache (keyed by normalized text + length limits + quality + instruction + model)
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE", "True").lower() == "true"
+SUMMARY_CACHE_MAX_ENTRIES = 512  # In-memory LRU size
+SUMMARY_CACHE_DISK = os.getenv("SUMMARY_CACHE_DISK", "False").lower() == "true"  # Also persist to disk
+SUMMARY_CACHE_DIR = BASE_DIR / 'cache' / 'summaries'
+SUMMARY_CACHE_DISK_MAX_MB = 100
+
+# Background audio jobs (/api/jobs/process-audio)
+JOB_MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "2"))  # Audio jobs processed concurrently
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "20"))  # Queued + running jobs before new ones are rejected
+JOB_TTL_SECONDS = 60 * 60  # Keep finished job results/errors for 1 hour
+
+# Metrics (GET /metrics, Prometheus text format)
+METRICS_ENABLED = os.getenv("METRICS", "True").lower() == "true"
+METRICS_PREFIX = "smart_t5_"
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)  # Seconds
+
+# Request profiling (X-Profile: 1 header; saved profiles listed at /api/admin/profiles)
+PROFILING_ENABLED = os.getenv("PROFILING", "False").lower() == "true"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")  # If set, X-Profile-Token must match (profiling and admin endpoints)
+PROFILE_ENDPOINTS = [r.strip() for r in os.getenv("PROFILE_ENDPOINTS", "").split(",") if r.strip()]  # Routes profiled without the header
+PROFILE_DIR = BASE_DIR / 'profiles'
+PROFILE_MAX_PROFILES = 20  # Oldest profiles are deleted beyond this...
+PROFILE_MAX_MB = 1024  # ...or beyond this much disk (the newest profile is always kept)
+PROFILE_MIN_INTERVAL_S = float(os.getenv("PROFILE_MIN_INTERVAL_S", "60"))  # At most one profiled request per interval
+PROFILE_TORCH = True  # Also record a torch.profiler Chrome trace
+PROFILE_RECORD_SHAPES = False  # Tensor shapes in the trace (larger files)
+PROFILE_TOP_FUNCTIONS = 40  # Functions listed in the .txt summary
 
 # Flask settings
 FLASK_HOST = "127.0.0.1"  # Listen on localhost
@@ -1,33 +1,84 @@
 import torch
 import gc
+import heapq
 import re
 import os
+import queue
+import threading
+import time
 import warnings
+import contextlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import shutil
 from datetime import datetime
+import numpy as np
 from transformers import T5Tokenizer, T5ForConditionalGeneration
-try:
-    import whisper
-except Exception as e:
-    whisper = None
-    _whisper_import_error = e
 
 # Filter warnings
 warnings.filterwarnings('ignore')
 
-# Monkeypatch torchaudio.set_audio_backend for compatibility with newer torchaudio versions
-import torchaudio
-if not hasattr(torchaudio, 'set_audio_backend'):
-    torchaudio.set_audio_backend = lambda backend: None
-
-try:
-    from pyannote.audio import Pipeline
-except ImportError:
-    Pipeline = None
-    print("⚠️ Pyannote Audio not installed. Diarization will be disabled.")
 import config
+import batching
+import cache
+import model_registry
+import assisted_decoding
+import snapshots
+import repetition_guard
+import vad
+import parallel_transcription
+import profiling
+import latency_budget
+import metrics
+from keyword_classifier import KeywordClassifier
 from datetime import timedelta
 
+# Instance attributes served by the model registry: name -> (component, index into the loaded value)
+LAZY_MODEL_ATTRIBUTES = {
+    'whisper_model': ('whisper', None),
+    'tokenizer': ('t5', 0),
+    'model': ('t5', 1),
+    'diarization_pipeline': ('diarization', None),
+}
+
+# Beam width per summary quality ('greedy' is the only one assisted decoding can serve as-is)
+BEAMS_PER_QUALITY = {'greedy': 1, 'fast': 2, 'medium': 4, 'high': 6, 'best': 10}
+
+def _import_whisper():
+    """Import OpenAI Whisper on first audio use"""
+    try:
+        import whisper
+    except Exception as e:
+        raise ImportError(
+            "Missing Python package 'whisper' (OpenAI Whisper).\n"
+            "Install dependencies in the 'python-backend' folder with:\n"
+            "  python -m pip install -r requirements.txt\n"
+            "Also ensure `ffmpeg` is installed and available on PATH (required by Whisper)."
+        ) from e
+    return whisper
+
+def _import_pyannote_pipeline():
+    """Import pyannote's Pipeline on first diarization; None if not installed"""
+    try:
+        # Monkeypatch torchaudio.set_audio_backend for compatibility with newer torchaudio versions
+        import torchaudio
+        if not hasattr(torchaudio, 'set_audio_backend'):
+            torchaudio.set_audio_backend = lambda backend: None
+        from pyannote.audio import Pipeline
+    except ImportError:
+        print("⚠️ Pyannote Audio not installed. Diarization will be disabled.")
+        return None
+    return Pipeline
+
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Default Whisper decoding (a latency_budget plan may replace it per request)
+WHISPER_DECODE_OPTIONS = {'task': 'translate', 'beam_size': 5, 'best_of': 5, 'temperature': 0.0}
+LANGUAGE_NAMES = {'hi': 'Hindi (हिन्दी)', 'en': 'English', 'mr': 'Marathi (मराठी)'}
+
+# Compiled once from config.EXTRACTION_KEYWORDS
+_keyword_classifier = KeywordClassifier(config.EXTRACTION_KEYWORDS)
+
 class SmartT5LargeDocumentGenerator:
     """
     Intelligent T5-based document generator with Flan-T5-Large.
@@ -36,11 +87,14 @@ class SmartT5LargeDocumentGenerator:
     Adapted from the notebook to work within the backend application.
     """
     
-    def __init__(self, whisper_model="base", t5_model="google/flan-t5-large"):
+    def __init__(self, whisper_model="base", t5_model="google/flan-t5-large", model_pool=None, t5_precision=None):
         """
-        Initialize with T5-Large and Whisper models
+        Configure T5-Large, Whisper and pyannote; each model is loaded lazily on first use
         Uses the larger Flan-T5-Large model for better summarization
-        Falls back to T5-base on CPU for performance
+        t5_precision (default config.T5_PRECISION) picks fp32 / fp16 / bf16 / int8 inference;
+        on CPU 'auto' means int8, which keeps T5-Large usable without switching to T5-base.
+        model_pool (a ModelRegistry) lets generators for different model sizes share
+        one memory budget; by default the generator gets a private, unbounded one.
         """
         # Clear memory
         torch.cuda.empty_cache()
@@ -53,20 +107,91 @@ class SmartT5LargeDocumentGenerator:
             print(f"🚀 GPU: {torch.cuda.get_device_name(0)}")
             print(f"💾 GPU Memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB")
         else:
-            print("⚠️ WARNING: Running on CPU. T5-Large too slow, using T5-base instead.")
-            # Use base model on CPU for performance
-            if "large" in t5_model.lower():
-                t5_model = "google/flan-t5-base"
-                print(f"📉 Switching to {t5_model} for CPU performance")
-        
-        # Validate Whisper availability
-        if whisper is None:
-            raise ImportError(
-                "Missing Python package 'whisper' (OpenAI Whisper).\n"
-                "Install dependencies in the 'python-backend' folder with:\n"
-                "  python -m pip install -r requirements.txt\n"
-                "Also ensure `ffmpeg` is installed and available on PATH (required by Whisper)."
-            )
+            print("⚠️ WARNING: Running on CPU.")
+        
+        self.whisper_model_name = whisper_model
+        self.t5_model_name = t5_model
+        self.t5_precision = resolve_t5_precision(t5_precision or config.T5_PRECISION, self.device)
+        self.is_flan = "flan" in t5_model.lower()
+        print(f"🎚️ T5 precision: {self.t5_precision}")
+        
+        # Cross-request batch scheduler, attached by get_generator() when enabled
+        self.batcher = None
+        
+        # Each model loads on first use (see __getattr__), so text-only requests never load Whisper/pyannote
+        self.models = model_pool if model_pool is not None else model_registry.ModelRegistry()
+        self.model_keys = {
+            'whisper': f"whisper:{whisper_model}",
+            't5': f"t5:{t5_model}@{self.t5_precision}",
+            'diarization': 'diarization'
+        }
+        estimates = config.MODEL_MEMORY_ESTIMATES_MB
+        self.models.register(self.model_keys['whisper'], self._load_whisper, estimates.get(whisper_model, 0), self._warm_up_whisper)
+        precision_factor = config.T5_PRECISION_MEMORY_FACTOR[self.t5_precision]
+        self.models.register(self.model_keys['t5'], self._load_t5, estimates.get(t5_model, 0) * precision_factor, self._warm_up_t5)
+        self.models.register(self.model_keys['diarization'], self._load_diarization, estimates.get('diarization', 0), self._warm_up_diarization)
+
+        # Draft model for assisted decoding; shares the pool entry of a generator using it as its summarizer
+        self.draft_model_name = config.T5_SIZES.get(config.T5_DRAFT_MODEL, config.T5_DRAFT_MODEL)
+        self.assisted_stats = None
+        if config.T5_ASSISTED_DECODING and self.draft_model_name != t5_model:
+            self.model_keys['t5_draft'] = f"t5:{self.draft_model_name}@{self.t5_precision}"
+            self.assisted_stats = assisted_decoding.AssistedDecodingStats()
+            self.models.register(self.model_keys['t5_draft'], self._load_t5_draft,
+                                 estimates.get(self.draft_model_name, 0) * precision_factor, self._warm_up_t5)
+
+        print("\n" + "="*70)
+        print("✨ Smart T5 Document Generator Ready! (models load on first use)")
+        print("="*70 + "\n")
+
+    def __getattr__(self, name):
+        # Only reached when the attribute is not set on the instance: resolve model attributes lazily
+        lazy = LAZY_MODEL_ATTRIBUTES.get(name)
+        if lazy is None or 'models' not in self.__dict__:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        component, index = lazy
+        loaded = self.models.get(self.model_keys[component])
+        return loaded if index is None or loaded is None else loaded[index]
+
+    def preload(self, components=None, warm=True):
+        """
+        Load (and by default warm up) the given components ('whisper', 't5', 'diarization',
+        't5_draft' when assisted decoding is on; all by default); returns {component: error or None}
+        """
+        components = self.check_components(components)
+        errors = self.models.load([self.model_keys[c] for c in components], warm=warm)
+        return {c: errors[self.model_keys[c]] for c in components}
+
+    def check_components(self, components=None):
+        """Validated list of component names (all by default); ValueError for unknown ones"""
+        components = list(components or self.model_keys)
+        unknown = [c for c in components if c not in self.model_keys]
+        if unknown:
+            raise ValueError(f"Unknown models: {', '.join(unknown)}. Use: {', '.join(self.model_keys)}")
+        return components
+
+    def using(self, component):
+        """Context manager that keeps a component ('whisper', 't5', 'diarization') from being evicted while in use"""
+        return self.models.use(self.model_keys[component])
+
+    @property
+    def t5_cache_tag(self):
+        # Summaries differ slightly between precisions, and with a draft model (its
+        # numerics can break greedy ties differently), so each setup caches separately
+        tag = f"{self.t5_model_name}@{self.t5_precision}"
+        if self.assisted_qualities:
+            tag += f"+assisted:{self.draft_model_name}:{','.join(sorted(self.assisted_qualities))}"
+        return tag
+
+    @property
+    def assisted_qualities(self):
+        # Only single-beam qualities: the draft model must not change how a quality decodes
+        if self.assisted_stats is None:
+            return set()
+        return {q for q in config.T5_ASSISTED_QUALITIES if BEAMS_PER_QUALITY.get(q) == 1}
+
+    def _load_whisper(self):
+        whisper = _import_whisper()
 
         # Validate ffmpeg availability (Whisper depends on ffmpeg for audio processing)
         ffmpeg_path = shutil.which('ffmpeg')
@@ -77,61 +202,126 @@ class SmartT5LargeDocumentGenerator:
                 "After installing, restart your terminal/IDE so the PATH changes take effect, then restart this server."
             )
 
-        # Load Whisper
-        print(f"\n📥 Loading Whisper '{whisper_model}'...")
-        self.whisper_model = whisper.load_model(whisper_model, device=self.device)
+        print(f"\n📥 Loading Whisper '{self.whisper_model_name}'...")
+        start = time.perf_counter()
+        whisper_model = snapshots.load_whisper(whisper, self.whisper_model_name, self.device)
+        if whisper_model is not None:
+            self.models.note(self.model_keys['whisper'], source='snapshot')
+        else:
+            whisper_model = whisper.load_model(self.whisper_model_name, device=self.device)
+            self.models.note(
+                self.model_keys['whisper'],
+                source='download_cache',
+                weights_seconds=round(time.perf_counter() - start, 3),
+                snapshot_write_seconds=snapshots.save_whisper(self.whisper_model_name, whisper_model)
+            )
         print("✅ Whisper loaded!")
-        
-        # Load T5
-        print(f"\\n📥 Loading T5 '{t5_model}'...")
-        self.tokenizer = T5Tokenizer.from_pretrained(t5_model, legacy=False)
+        return whisper_model
+
+    def _warm_up_whisper(self, whisper_model):
+        # One second of silence: exercises mel extraction, the encoder and a decode step
+        whisper_model.transcribe(
+            np.zeros(config.SAMPLING_RATE, dtype=np.float32),
+            language='en',
+            fp16=self.device == "cuda",
+            temperature=0.0,
+            verbose=None
+        )
+
+    def _load_t5(self):
+        return self._load_t5_model(self.t5_model_name, self.model_keys['t5'])
+
+    def _load_t5_draft(self):
+        return self._load_t5_model(self.draft_model_name, self.model_keys['t5_draft'])
+
+    def _load_t5_model(self, model_name, key):
+        print(f"\n📥 Loading T5 '{model_name}' ({self.t5_precision})...")
+        # int8 quantizes an fp32 model after loading, so like fp32 it reads the hub cache (no snapshot)
+        dtype = {'fp16': torch.float16, 'bf16': torch.bfloat16}.get(self.t5_precision, torch.float32)
+        source = snapshots.t5_source(model_name, dtype)
+        start = time.perf_counter()
+        tokenizer = T5Tokenizer.from_pretrained(source, legacy=False)
 
-        dtype = torch.float16 if self.device == "cuda" else torch.float32
         # Use device_map="auto" if available and on cuda for better memory management, 
         # but manual to() seems reliable in notebook code.
-        self.model = T5ForConditionalGeneration.from_pretrained(
-            t5_model,
+        model = T5ForConditionalGeneration.from_pretrained(
+            source,
             torch_dtype=dtype
-        ).to(self.device)
+        )
+        weights_seconds = round(time.perf_counter() - start, 3)
+        snapshot_write_seconds = None
+        if source == model_name:
+            snapshot_write_seconds = snapshots.save_t5(model_name, dtype, tokenizer, model)
+        model = model.to(self.device)
+        quantize_seconds = None
+        if self.t5_precision == 'int8':
+            start = time.perf_counter()
+            model = quantize_linear_int8(model)
+            quantize_seconds = round(time.perf_counter() - start, 3)
+        self.models.note(
+            key,
+            source='snapshot' if source != model_name else ('local' if os.path.isdir(source) else 'hub'),
+            precision=self.t5_precision,
+            weights_seconds=weights_seconds,
+            snapshot_write_seconds=snapshot_write_seconds,
+            quantize_seconds=quantize_seconds
+        )
         print("✅ T5 loaded!")
-        
-        # Load Diarization Pipeline
-        self.diarization_pipeline = None
-        if config.HUGGINGFACE_TOKEN and Pipeline:
-            try:
-                print(f"\\n📥 Loading Pyannote Pipeline...")
-                self.diarization_pipeline = Pipeline.from_pretrained(
-                    "pyannote/speaker-diarization-3.1",
-                    use_auth_token=config.HUGGINGFACE_TOKEN
-                )
-                if self.device == "cuda":
-                    self.diarization_pipeline.to(torch.device("cuda"))
-                print("✅ Pyannote Pipeline loaded!")
-            except Exception as e:
-                print(f"⚠️ Failed to load Pyannote Pipeline: {e}")
-        else:
-            print("⚠️ Diarization disabled: Missing HUGGINGFACE_TOKEN or pyannote.audio")
+        return tokenizer, model
 
-        print("\\n" + "="*70)
-        print("✨ Smart T5 Document Generator Ready!")
-        print("="*70 + "\\n")
+    def _warm_up_t5(self, loaded):
+        tokenizer, model = loaded
+        inputs = tokenizer(self._build_t5_prompt("The team met to plan the release."), return_tensors="pt").to(self.device)
+        with torch.no_grad():
+            model.generate(inputs["input_ids"], max_new_tokens=8, num_beams=2)
+
+    def _load_diarization(self):
+        Pipeline = _import_pyannote_pipeline()
+        if not config.HUGGINGFACE_TOKEN or Pipeline is None:
+            raise model_registry.ModelUnavailable("Diarization disabled: Missing HUGGINGFACE_TOKEN or pyannote.audio")
+
+        print(f"\n📥 Loading Pyannote Pipeline...")
+        pipeline = Pipeline.from_pretrained(
+            "pyannote/speaker-diarization-3.1",
+            use_auth_token=config.HUGGINGFACE_TOKEN
+        )
+        if pipeline is None:
+            raise model_registry.ModelUnavailable("Pyannote pipeline could not be downloaded (check HUGGINGFACE_TOKEN access)")
+        if self.device == "cuda":
+            pipeline.to(torch.device("cuda"))
+        print("✅ Pyannote Pipeline loaded!")
+        return pipeline
+
+    def _warm_up_diarization(self, pipeline):
+        pipeline({"waveform": torch.zeros(1, 2 * config.SAMPLING_RATE), "sample_rate": config.SAMPLING_RATE})
 
 
-    def diarize_audio(self, audio_path, min_speakers=None, max_speakers=None):
+    def diarize_audio(self, audio_path, min_speakers=None, max_speakers=None, audio=None):
         """
         Perform speaker diarization using Pyannote
+        `audio` may hold the already-decoded 16 kHz mono waveform so the file
+        is not decoded a second time.
         """
+        with self.using('diarization'):
+            return self._diarize(audio_path, min_speakers, max_speakers, audio)
+
+    def _diarize(self, audio_path, min_speakers, max_speakers, audio):
         if not self.diarization_pipeline:
             print("⚠️ Diarization pipeline not available")
             return []
 
         try:
             print(f"⏳ Running speaker diarization on {os.path.basename(audio_path)}...")
-            diarization = self.diarization_pipeline(
-                audio_path,
-                min_speakers=min_speakers,
-                max_speakers=max_speakers
-            )
+            if audio is not None:
+                source = {"waveform": torch.from_numpy(audio).unsqueeze(0), "sample_rate": config.SAMPLING_RATE}
+            else:
+                source = audio_path
+            with metrics.stage('diarization'):
+                diarization = self.diarization_pipeline(
+                    source,
+                    min_speakers=min_speakers,
+                    max_speakers=max_speakers
+                )
 
             speaker_segments = []
             for turn, _, speaker in diarization.itertracks(yield_label=True):
@@ -156,40 +346,19 @@ class SmartT5LargeDocumentGenerator:
         if not speaker_segments:
             return transcription_segments
 
-        merged_segments = []
-        
-        # If whisper segments don't have start/end, we can't merge properly
         # Assuming transcription_segments is list of dicts with start, end, text
-        
+        segments = []
         for w_seg in transcription_segments:
             # Whisper segment might look like: {'id': 0, 'seek': 0, 'start': 0.0, 'end': 7.0, 'text': '...', ...}
-            seg_start = w_seg.get('start', 0)
-            seg_end = w_seg.get('end', 0)
             text = w_seg.get('text', '').strip()
-            
-            if not text:
-                continue
+            if text:
+                segments.append((w_seg.get('start', 0), w_seg.get('end', 0), text))
 
-            assigned_speaker = "UNKNOWN"
-            max_overlap = 0
-
-            for p_seg in speaker_segments:
-                # Calculate overlap
-                overlap_start = max(seg_start, p_seg['start'])
-                overlap_end = min(seg_end, p_seg['end'])
-                overlap = max(0, overlap_end - overlap_start)
-
-                if overlap > max_overlap:
-                    max_overlap = overlap
-                    assigned_speaker = p_seg['speaker']
-            
-            # Create a new merged segment object
-            merged_segments.append({
-                'start': seg_start,
-                'end': seg_end,
-                'text': text,
-                'speaker': assigned_speaker
-            })
+        speakers = self._assign_speakers(segments, speaker_segments)
+        merged_segments = [
+            {'start': seg_start, 'end': seg_end, 'text': text, 'speaker': speaker}
+            for (seg_start, seg_end, text), speaker in zip(segments, speakers)
+        ]
 
         # Remap speaker labels (SPEAKER_00 -> Speaker 1)
         speaker_counts = {}
@@ -207,6 +376,44 @@ class SmartT5LargeDocumentGenerator:
             
         return merged_segments
 
+    @staticmethod
+    def _assign_speakers(segments, speaker_segments):
+        """
+        Speaker with the largest overlap for each (start, end, text) segment, or "UNKNOWN".
+        Sweep over both lists in start order: turns enter an end-time heap once they
+        start before the segment ends and leave once they end before it starts, so
+        each segment is only compared with the turns active around it.
+        Ties go to the earliest turn in speaker_segments, as in a full scan.
+        """
+        turn_order = sorted(range(len(speaker_segments)), key=lambda i: speaker_segments[i]['start'])
+        segment_order = sorted(range(len(segments)), key=lambda i: segments[i][0])
+
+        assigned = ["UNKNOWN"] * len(segments)
+        active = []  # (turn end, turn index)
+        next_turn = 0
+        for seg_idx in segment_order:
+            seg_start, seg_end, _ = segments[seg_idx]
+
+            while next_turn < len(turn_order) and speaker_segments[turn_order[next_turn]]['start'] < seg_end:
+                turn_idx = turn_order[next_turn]
+                heapq.heappush(active, (speaker_segments[turn_idx]['end'], turn_idx))
+                next_turn += 1
+            # Segments are visited by start time, so finished turns never overlap again
+            while active and active[0][0] <= seg_start:
+                heapq.heappop(active)
+
+            best_overlap = 0
+            best_turn = None
+            for _, turn_idx in active:
+                p_seg = speaker_segments[turn_idx]
+                overlap = min(seg_end, p_seg['end']) - max(seg_start, p_seg['start'])
+                if overlap > best_overlap or (overlap == best_overlap and best_turn is not None and turn_idx < best_turn):
+                    best_overlap = overlap
+                    best_turn = turn_idx
+            if best_turn is not None:
+                assigned[seg_idx] = speaker_segments[best_turn]['speaker']
+        return assigned
+
     def format_transcript_with_speakers(self, merged_segments):
         """
         Format merged segments into a readable transcript string
@@ -233,42 +440,100 @@ class SmartT5LargeDocumentGenerator:
 
         return "\n\n".join(lines)
 
-    def transcribe_audio(self, audio_path):
-        """Transcribe multilingual audio to English using Whisper"""
+    def transcribe_audio(self, audio_path, audio=None, audio_sha256=None, use_cache=True, decode_options=None):
+        """
+        Transcribe multilingual audio to English using Whisper
+        `audio` may hold the already-decoded 16 kHz waveform (e.g. decoded while
+        the upload streamed in); otherwise Whisper decodes audio_path itself.
+        With VAD_ENABLED only speech regions are decoded; segment times are
+        mapped back to the original timeline and 'vad' reports the skipped fraction.
+        Windows that fall into a repetition loop are cut short at the loop, and
+        skipped if nothing precedes it (repetition_guard); 'suppressed_segments' counts them.
+        Long recordings go to the worker-process pool when PARALLEL_TRANSCRIPTION_WORKERS > 1.
+        Results are cached by audio SHA-256 + model + decode options unless
+        use_cache is False; pass audio_sha256 if the hash is already known.
+        decode_options (e.g. from a latency_budget plan) replaces the default 5-beam decoding.
+        """
+        started = time.perf_counter()
         if not os.path.exists(audio_path):
             raise FileNotFoundError(f"❌ File not found: {audio_path}")
         
         file_size = os.path.getsize(audio_path) / (1024 * 1024)
         print(f"🎵 Audio: {os.path.basename(audio_path)} ({file_size:.2f} MB)")
-        print(f"⏳ Transcribing with Whisper...")
         
-        result = self.whisper_model.transcribe(
-            audio_path,
-            task='translate',
-            language=None,
-            fp16=self.device == "cuda",
-            verbose=False,
-            beam_size=5,
-            best_of=5,
-            temperature=0.0
-        )
+        decode_options = decode_options or dict(WHISPER_DECODE_OPTIONS)
+        
+        transcription_cache = cache.get_transcription_cache() if use_cache else None
+        result = None
+        if transcription_cache is not None:
+            cache_key = self._transcription_cache_key(audio_path, audio_sha256, decode_options)
+            result = transcription_cache.get(cache_key)
+            if result is not None:
+                print("♻️ Transcription cache hit - skipping Whisper")
+        
+        if result is None:
+            speech = None
+            if audio is None and (config.VAD_ENABLED or parallel_transcription.is_enabled()):
+                with metrics.stage('decode'):
+                    audio = _import_whisper().load_audio(audio_path)
+            if config.VAD_ENABLED:
+                with metrics.stage('vad'):
+                    speech = vad.trim_silence(audio)
+                audio = speech.audio
+                print(f"🔇 VAD: {len(speech.regions)} speech region(s), skipping {speech.skipped_fraction:.0%} of the audio")
+            
+            print(f"⏳ Transcribing with Whisper...")
+            decode_seconds = None  # Whisper decoding alone, once the model is resident
+            with repetition_guard.counting() as guard_stats, metrics.stage('whisper'):
+                if speech is not None and not len(speech.audio):
+                    result = {'text': '', 'segments': [], 'language': 'unknown'}  # no speech at all: nothing to decode
+                elif parallel_transcription.should_use(audio, self.device):
+                    result = parallel_transcription.transcribe(audio, self.whisper_model_name, decode_options)
+                    guard_stats.update(result.pop('repetition_guard', {}))
+                    decode_seconds = result.pop('decode_seconds')
+                else:
+                    with self.using('whisper') as whisper_model:
+                        decode_started = time.perf_counter()
+                        result = repetition_guard.install(whisper_model).transcribe(
+                            audio if audio is not None else audio_path,
+                            language=None,
+                            fp16=self.device == "cuda",
+                            verbose=False,
+                            **decode_options
+                        )
+                        decode_seconds = time.perf_counter() - decode_started
+            result['suppressed_segments'] = guard_stats['suppressed_segments']
+            if result['suppressed_segments']:
+                print(f"🔁 Repetition guard: skipped {result['suppressed_segments']} looping window(s)")
+            if speech is not None:
+                result['segments'] = vad.remap_segments(result.get('segments', []), speech)
+                result['vad'] = speech.get_stats()
+            # Measured throughput for latency_budget estimates: decode time per second of audio
+            # Whisper actually decoded (after VAD), so needs a decoded waveform
+            if decode_seconds is not None and audio is not None:
+                latency_budget.record(self.whisper_model_name, decode_options, self.device,
+                                      len(audio) / config.SAMPLING_RATE, decode_seconds)
+            total_samples = speech.total_samples if speech is not None else (len(audio) if audio is not None else 0)
+            metrics.AUDIO_SECONDS.inc(total_samples / config.SAMPLING_RATE)
+            if transcription_cache is not None:
+                transcription_cache.put(cache_key, {
+                    'text': result['text'],
+                    'segments': result.get('segments', []),
+                    'language': result.get('language', 'unknown'),
+                    'vad': result.get('vad'),
+                    'suppressed_segments': result['suppressed_segments']
+                })
         
         # If verbose=True in transcribe, it returns segments. We need them for diarization.
         # But here we used verbose=False. Let's rely on result['segments'] which is usually present.
         segments = result.get('segments', [])
         
-        lang_map = {
-            'hi': 'Hindi (हिन्दी)',
-            'en': 'English',
-            'mr': 'Marathi (मराठी)'
-        }
-        
         detected = result.get('language', 'unknown')
         text = result['text'].strip()
         word_count = len(text.split())
         
         print(f"✅ Transcription complete!")
-        print(f"🌍 Language: {lang_map.get(detected, detected)}")
+        print(f"🌍 Language: {LANGUAGE_NAMES.get(detected, detected)}")
         print(f"📝 Words: {word_count}")
         
         print(f"📝 Words: {word_count}")
@@ -277,8 +542,113 @@ class SmartT5LargeDocumentGenerator:
             'text': text,
             'segments': segments,
             'language': detected,
-            'language_name': lang_map.get(detected, detected),
-            'word_count': word_count
+            'language_name': LANGUAGE_NAMES.get(detected, detected),
+            'word_count': word_count,
+            'vad': result.get('vad'),
+            'suppressed_segments': result.get('suppressed_segments', 0),
+            'transcribe_seconds': round(time.perf_counter() - started, 3)
+        }
+
+    def _transcription_cache_key(self, audio_path, audio_sha256, decode_options):
+        return cache.make_cache_key(
+            audio_sha256=audio_sha256 or cache.sha256_file(audio_path),
+            whisper_model=self.whisper_model_name,
+            vad=config.VAD_ENABLED,
+            repetition_guard=config.REPETITION_GUARD_ENABLED,
+            **decode_options
+        )
+
+    def transcribe_audio_stream(self, audio_path, audio=None, audio_sha256=None, use_cache=True, decode_options=None):
+        """
+        Transcribe like transcribe_audio, but yield ('segment', {id, start, end, text})
+        as soon as each Whisper segment is decoded, then ('done', {...}) with the
+        language and word count.
+        The speech audio is decoded in spans of about STREAM_SPAN_S, cut at pauses
+        and each conditioned on the previous span's text, so the first segments
+        arrive after one Whisper window. Segments are not kept: a cached transcript
+        is replayed, but a streamed one is not added to the cache.
+        """
+        started = time.perf_counter()
+        decode_options = decode_options or dict(WHISPER_DECODE_OPTIONS)
+        
+        transcription_cache = cache.get_transcription_cache() if use_cache else None
+        cached = None
+        if transcription_cache is not None:
+            cached = transcription_cache.get(self._transcription_cache_key(audio_path, audio_sha256, decode_options))
+        if cached is not None:
+            print("♻️ Transcription cache hit - replaying segments")
+            for segment in cached['segments']:
+                yield 'segment', {'id': segment['id'], 'start': segment['start'], 'end': segment['end'],
+                                  'text': segment['text'].strip()}
+            detected = cached.get('language', 'unknown')
+            yield 'done', {
+                'language': detected,
+                'language_name': LANGUAGE_NAMES.get(detected, detected),
+                'word_count': len(cached['text'].split()),
+                'segments': len(cached['segments']),
+                'vad': cached.get('vad'),
+                'suppressed_segments': cached.get('suppressed_segments', 0),
+                'transcribe_seconds': round(time.perf_counter() - started, 3)
+            }
+            return
+        
+        if audio is None:
+            with metrics.stage('decode'):
+                audio = _import_whisper().load_audio(audio_path)
+        total_samples = len(audio)
+        speech = None
+        if config.VAD_ENABLED:
+            with metrics.stage('vad'):
+                speech = vad.trim_silence(audio)
+            audio = speech.audio
+            print(f"🔇 VAD: {len(speech.regions)} speech region(s), skipping {speech.skipped_fraction:.0%} of the audio")
+        cuts = parallel_transcription.split_points(audio, span_seconds=config.STREAM_SPAN_S,
+                                                   search_seconds=config.STREAM_SEARCH_S)
+        bounds = list(zip([0] + cuts, cuts + [len(audio)])) if len(audio) else []
+        print(f"📡 Streaming transcription: {len(bounds)} span(s)")
+        
+        words, count, languages, prompt = 0, 0, Counter(), None
+        decode_seconds = 0.0  # Whisper decoding alone, once the model is resident
+        with repetition_guard.counting() as guard_stats:
+            for start, end in bounds:
+                with self.using('whisper') as whisper_model, metrics.stage('whisper'):
+                    decode_started = time.perf_counter()
+                    result = repetition_guard.install(whisper_model).transcribe(
+                        audio[start:end],
+                        language=None,
+                        fp16=self.device == "cuda",
+                        verbose=None,
+                        initial_prompt=prompt,
+                        **decode_options
+                    )
+                    decode_seconds += time.perf_counter() - decode_started
+                text = result['text'].strip()
+                if text:
+                    words += len(text.split())
+                    languages[result.get('language', 'unknown')] += len(text)
+                    if decode_options.get('condition_on_previous_text', True):
+                        prompt = text
+                segments = parallel_transcription.stitch([result], [start / config.SAMPLING_RATE])['segments']
+                if speech is not None:
+                    segments = vad.remap_segments(segments, speech)
+                for segment in segments:
+                    yield 'segment', {'id': count, 'start': segment['start'], 'end': segment['end'],
+                                      'text': segment['text'].strip()}
+                    count += 1
+        
+        latency_budget.record(self.whisper_model_name, decode_options, self.device,
+                              len(audio) / config.SAMPLING_RATE, decode_seconds)
+        metrics.AUDIO_SECONDS.inc(total_samples / config.SAMPLING_RATE)
+        detected = languages.most_common(1)[0][0] if languages else 'unknown'
+        print(f"✅ Streamed {count} segment(s), {words} words")
+        yield 'done', {
+            'language': detected,
+            'language_name': LANGUAGE_NAMES.get(detected, detected),
+            'word_count': words,
+            'segments': count,
+            'vad': speech.get_stats() if speech is not None else None,
+            'suppressed_segments': guard_stats['suppressed_segments'],
+            'transcribe_seconds': round(time.perf_counter() - started, 3)
         }
 
     def calculate_adaptive_summary_length(self, word_count, strategy):
@@ -345,38 +715,74 @@ class SmartT5LargeDocumentGenerator:
             'description': config['description']
         }
 
+    def _build_t5_prompt(self, text, custom_instruction=None):
+        """Prefix the input with the task instruction expected by T5"""
+        if custom_instruction and self.is_flan:
+            return f"{custom_instruction}: {text}"
+        return f"summarize: {text}"
+
+    def _t5_generation_kwargs(self, max_length, min_length, quality):
+        """Beam search settings shared by the single and batched summary paths"""
+        num_beams = BEAMS_PER_QUALITY.get(quality, 4)
+        kwargs = {
+            'max_length': max_length,
+            'min_length': min_length,
+            'num_beams': num_beams,
+            'no_repeat_ngram_size': 3,
+            'repetition_penalty': 1.2,
+            'temperature': 1.0
+        }
+        if num_beams > 1:
+            kwargs.update(length_penalty=1.5, early_stopping=True)
+        return kwargs
+
     def generate_t5_summary(self, text, max_length=512, min_length=100, quality='medium', custom_instruction=None):
         """
         Generate abstractive summary using T5
+        Identical requests are served from the summary cache.
         """
-        beam_config = {'fast': 2, 'medium': 4, 'high': 6, 'best': 10}
-        num_beams = beam_config.get(quality, 4)
+        summary_cache = cache.get_summary_cache()
+        if summary_cache is not None:
+            cache_key = summary_cache.make_key(text, max_length, min_length, quality, custom_instruction, self.t5_cache_tag)
+            summary = summary_cache.get(cache_key)
+            if summary is not None:
+                return summary
         
-        if custom_instruction and self.is_flan:
-            input_text = f"{custom_instruction}: {text}"
-        else:
-            input_text = f"summarize: {text}"
+        summary = self._generate_t5_summary_uncached(text, max_length, min_length, quality, custom_instruction)
+        if summary_cache is not None:
+            summary_cache.put(cache_key, summary)
+        return summary
+
+    def _generate_t5_summary_uncached(self, text, max_length, min_length, quality, custom_instruction):
+        if quality in self.assisted_qualities:
+            # One sequence, greedy: batching would not help and cannot be combined with a draft model
+            return self._generate_t5_summary_assisted(text, max_length, min_length, custom_instruction)
         
-        inputs = self.tokenizer(
-            input_text,
-            return_tensors="pt",
-            max_length=512,
-            truncation=True,
-            padding=True
-        ).to(self.device)
+        # A profiled request keeps its T5 work on its own thread, where the profilers can see it
+        if self.batcher is not None and not self.batcher.is_worker_thread() and not profiling.is_profiling():
+            return self.batcher.summarize(text, max_length, min_length, quality, custom_instruction)
         
-        with torch.no_grad():
+        with self.using('t5'):
+            return self._generate_t5_summary_direct(text, max_length, min_length, quality, custom_instruction)
+
+    def _generate_t5_summary_direct(self, text, max_length, min_length, quality, custom_instruction):
+        input_text = self._build_t5_prompt(text, custom_instruction)
+        
+        with metrics.stage('t5_tokenize'):
+            inputs = self.tokenizer(
+                input_text,
+                return_tensors="pt",
+                max_length=512,
+                truncation=True,
+                padding=True
+            ).to(self.device)
+        
+        with torch.no_grad(), metrics.stage('t5_generate'):
             summary_ids = self.model.generate(
                 inputs["input_ids"],
-                max_length=max_length,
-                min_length=min_length,
-                num_beams=num_beams,
-                length_penalty=1.5,
-                early_stopping=True,
-                no_repeat_ngram_size=3,
-                repetition_penalty=1.2,
-                temperature=1.0
+                **self._t5_generation_kwargs(max_length, min_length, quality)
             )
+        metrics.count_generated_tokens(summary_ids, self.tokenizer.pad_token_id)
         
         summary = self.tokenizer.decode(
             summary_ids[0],
@@ -385,41 +791,271 @@ class SmartT5LargeDocumentGenerator:
         )
         return summary
 
-    def _summarize_long_text(self, text, summary_config, quality, custom_instruction):
-        """Handle long texts with intelligent chunking"""
-        chunk_size = 400
-        words = text.split()
-        chunks = [' '.join(words[i:i+chunk_size]) for i in range(0, len(words), chunk_size)]
+    def _generate_t5_summary_assisted(self, text, max_length, min_length, custom_instruction):
+        """Greedy decoding of the main model with draft-model proposals (same output as plain greedy)"""
+        with self.using('t5'), self.using('t5_draft') as draft:
+            with metrics.stage('t5_tokenize'):
+                inputs = self.tokenizer(
+                    self._build_t5_prompt(text, custom_instruction),
+                    return_tensors="pt",
+                    max_length=512,
+                    truncation=True
+                ).to(self.device)
+            
+            start = time.perf_counter()
+            with torch.no_grad(), assisted_decoding.count_forward_passes(self.model, draft[1]) as passes, \
+                    metrics.stage('t5_generate'):
+                summary_ids = self.model.generate(
+                    inputs["input_ids"],
+                    attention_mask=inputs["attention_mask"],
+                    assistant_model=draft[1],
+                    **self._t5_generation_kwargs(max_length, min_length, 'greedy')
+                )
+            self.assisted_stats.record(summary_ids.shape[-1] - 1, passes[0], passes[1], time.perf_counter() - start)
+            metrics.count_generated_tokens(summary_ids, self.tokenizer.pad_token_id)
+            
+            return self.tokenizer.decode(
+                summary_ids[0],
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True
+            )
+
+    def generate_t5_summary_stream(self, text, max_length=512, min_length=100, custom_instruction=None, sample=False):
+        """
+        Yield the summary piece by piece while T5 generates it: greedy decoding
+        (with the draft model when assisted decoding covers 'greedy'), or nucleus
+        sampling with sample=True. Streaming cannot follow beam search.
+        Greedy output equals generate_t5_summary(quality='greedy') and shares its cache.
+        """
+        from transformers import StoppingCriteriaList, TextIteratorStreamer
         
-        print(f"  📄 Processing {len(chunks)} chunk(s)...")
+        summary_cache = None if sample else cache.get_summary_cache()
+        if summary_cache is not None:
+            cache_key = summary_cache.make_key(text, max_length, min_length, 'greedy', custom_instruction, self.t5_cache_tag)
+            summary = summary_cache.get(cache_key)
+            if summary is not None:
+                yield summary
+                return
         
-        chunk_summaries = []
-        for idx, chunk in enumerate(chunks):
-            chunk_words = len(chunk.split())
-            if chunk_words < 25:
-                continue
+        assisted = not sample and 'greedy' in self.assisted_qualities
+        gen_kwargs = self._t5_generation_kwargs(max_length, min_length, 'greedy')
+        if sample:
+            gen_kwargs.update(do_sample=True, top_p=config.T5_STREAM_TOP_P, temperature=config.T5_STREAM_TEMPERATURE)
+        cancelled = threading.Event()
+        errors = []
+        pieces = []
+        
+        with self.using('t5'), (self.using('t5_draft') if assisted else contextlib.nullcontext()) as draft:
+            with metrics.stage('t5_tokenize'):
+                inputs = self.tokenizer(
+                    self._build_t5_prompt(text, custom_instruction),
+                    return_tensors="pt",
+                    max_length=512,
+                    truncation=True
+                ).to(self.device)
+            streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True,
+                                            clean_up_tokenization_spaces=True)
             
-            chunk_config = self.calculate_adaptive_summary_length(chunk_words, summary_config['strategy'])
+            def run():
+                try:
+                    start = time.perf_counter()
+                    models = (self.model, draft[1]) if assisted else (self.model,)
+                    with torch.no_grad(), assisted_decoding.count_forward_passes(*models) as passes, \
+                            metrics.stage('t5_generate'):
+                        summary_ids = self.model.generate(
+                            inputs["input_ids"],
+                            attention_mask=inputs["attention_mask"],
+                            streamer=streamer,
+                            # A client that disconnects stops generation at the next token
+                            stopping_criteria=StoppingCriteriaList([lambda input_ids, scores, **kwargs: cancelled.is_set()]),
+                            **(dict(assistant_model=draft[1]) if assisted else {}),
+                            **gen_kwargs
+                        )
+                    if assisted:
+                        self.assisted_stats.record(summary_ids.shape[-1] - 1, passes[0], passes[1], time.perf_counter() - start)
+                    metrics.count_generated_tokens(summary_ids, self.tokenizer.pad_token_id)
+                except Exception as e:
+                    errors.append(e)
+                    streamer.end()
+            
+            worker = threading.Thread(target=run, name="t5-stream", daemon=True)
+            worker.start()
             try:
-                chunk_summary = self.generate_t5_summary(
-                    chunk,
-                    max_length=chunk_config['max_length'],
-                    min_length=chunk_config['min_length'],
-                    quality=quality,
-                    custom_instruction=custom_instruction
-                )
-                chunk_summaries.append(chunk_summary)
+                for piece in streamer:
+                    if piece:
+                        pieces.append(piece)
+                        yield piece
+            finally:
+                cancelled.set()
+                worker.join()
+        
+        if errors:
+            raise errors[0]
+        if summary_cache is not None:
+            summary_cache.put(cache_key, ''.join(pieces).strip())
+
+    def summarize_stream(self, text, max_length=512, min_length=100, quality='medium', custom_instruction=None,
+                         sample=False, summary_config=None):
+        """
+        Streaming counterpart of generate_t5_summary / _summarize_long_text.
+        Yields ('token', piece) while the summary is generated, then ('summary', text).
+        With summary_config the text is summarized in chunks as in _summarize_long_text
+        (at `quality`, batched): ('chunk', {index, total, summary}) is yielded as each
+        chunk summary is ready, and only a final pass over the combined chunk
+        summaries streams tokens.
+        """
+        if summary_config is None:
+            pieces = []
+            for piece in self.generate_t5_summary_stream(text, max_length, min_length, custom_instruction, sample):
+                pieces.append(piece)
+                yield 'token', piece
+            yield 'summary', ''.join(pieces).strip()
+            return
+        
+        events = queue.Queue()
+        
+        def run():
+            try:
+                events.put(('done', self._summarize_chunks(
+                    text, summary_config, quality, custom_instruction,
+                    summary_callback=lambda index, total, summary: events.put(
+                        ('chunk', {'index': index, 'total': total, 'summary': summary}))
+                )))
             except Exception as e:
-                print(f"✗ Chunk error: {e}")
-                continue
+                events.put(('error', e))
+        
+        threading.Thread(target=run, name="t5-stream-chunks", daemon=True).start()
+        while True:
+            kind, value = events.get()
+            if kind == 'error':
+                raise value
+            if kind == 'done':
+                break
+            yield kind, value
         
+        chunk_summaries, chunk_count = value
+        if not chunk_summaries:
+            yield 'summary', text[:500]
+            return
+        combined = ' '.join(chunk_summaries)
+        if not self._needs_final_pass(chunk_count, combined, summary_config):
+            yield 'summary', combined
+            return
+        yield from self.summarize_stream(combined, summary_config['max_length'], summary_config['min_length'],
+                                         custom_instruction=custom_instruction, sample=sample)
+
+    def generate_t5_summaries_batch(self, texts, lengths, quality='medium', custom_instruction=None, token_budget=None, chunk_callback=None, summary_callback=None,
+                                    generate_callback=None):
+        """
+        Summarize several texts with padded, micro-batched T5 generate calls.
+
+        `lengths` holds one (max_length, min_length) pair per text. Texts sharing
+        the same limits are generated together, so every summary is decoded with
+        its own limits; each micro-batch is sized so that
+        padded input tokens x beams stays within `token_budget`
+        (config.T5_BATCH_TOKEN_BUDGET by default). Results come back in input
+        order; an entry is None when its text could not be summarized.
+        chunk_callback(done, total), if given, is called after each micro-batch,
+        summary_callback(index, summary) as each summary is ready, and
+        generate_callback(size) after each batched generate call.
+        """
+        if not texts:
+            return []
+        
+        with self.using('t5'):
+            return self._generate_t5_summaries_batch(texts, lengths, quality, custom_instruction, token_budget, chunk_callback,
+                                                     summary_callback, generate_callback)
+
+    def _generate_t5_summaries_batch(self, texts, lengths, quality, custom_instruction, token_budget, chunk_callback,
+                                     summary_callback=None, generate_callback=None):
+        token_budget = token_budget or config.T5_BATCH_TOKEN_BUDGET
+        prompts = [self._build_t5_prompt(t, custom_instruction) for t in texts]
+        token_counts = [
+            len(self.tokenizer(p, max_length=512, truncation=True)["input_ids"])
+            for p in prompts
+        ]
+        
+        # Group by generation limits, longest first so each batch pads little
+        groups = {}
+        for idx, limits in enumerate(lengths):
+            groups.setdefault(tuple(limits), []).append(idx)
+        
+        results = [None] * len(texts)
+        done = 0
+        for (max_length, min_length), indices in groups.items():
+            gen_kwargs = self._t5_generation_kwargs(max_length, min_length, quality)
+            indices.sort(key=lambda i: token_counts[i], reverse=True)
+            
+            start = 0
+            while start < len(indices):
+                longest = token_counts[indices[start]]
+                batch_size = max(1, token_budget // (longest * gen_kwargs['num_beams']))
+                batch = indices[start:start + batch_size]
+                start += len(batch)
+                
+                try:
+                    with metrics.stage('t5_tokenize'):
+                        inputs = self.tokenizer(
+                            [prompts[i] for i in batch],
+                            return_tensors="pt",
+                            max_length=512,
+                            truncation=True,
+                            padding=True
+                        ).to(self.device)
+                    
+                    with torch.no_grad(), metrics.stage('t5_generate'):
+                        summary_ids = self.model.generate(
+                            inputs["input_ids"],
+                            attention_mask=inputs["attention_mask"],
+                            **gen_kwargs
+                        )
+                    metrics.count_generated_tokens(summary_ids, self.tokenizer.pad_token_id)
+                    if generate_callback:
+                        generate_callback(len(batch))
+                    
+                    decoded = self.tokenizer.batch_decode(
+                        summary_ids,
+                        skip_special_tokens=True,
+                        clean_up_tokenization_spaces=True
+                    )
+                    for i, summary in zip(batch, decoded):
+                        results[i] = summary
+                except Exception as e:
+                    # Retry one at a time so a single bad input doesn't sink the batch
+                    print(f"✗ Batch error ({len(batch)} texts): {e}")
+                    for i in batch:
+                        try:
+                            results[i] = self.generate_t5_summary(
+                                texts[i],
+                                max_length=max_length,
+                                min_length=min_length,
+                                quality=quality,
+                                custom_instruction=custom_instruction
+                            )
+                        except Exception as chunk_error:
+                            print(f"✗ Chunk error: {chunk_error}")
+                
+                if summary_callback:
+                    for i in batch:
+                        if results[i] is not None:
+                            summary_callback(i, results[i])
+                done += len(batch)
+                if chunk_callback:
+                    chunk_callback(done, len(texts))
+        
+        return results
+
+    def _summarize_long_text(self, text, summary_config, quality, custom_instruction, chunk_callback=None):
+        """
+        Handle long texts with intelligent chunking
+        chunk_callback(done, total) reports how many chunks have been summarized.
+        """
+        chunk_summaries, chunk_count = self._summarize_chunks(text, summary_config, quality, custom_instruction, chunk_callback)
         if not chunk_summaries:
             return text[:500]
         
         combined = ' '.join(chunk_summaries)
-        combined_words = len(combined.split())
-        
-        if len(chunks) > 1 and combined_words > summary_config['max_words']:
+        if self._needs_final_pass(chunk_count, combined, summary_config):
             try:
                 final = self.generate_t5_summary(
                     combined,
@@ -434,44 +1070,114 @@ class SmartT5LargeDocumentGenerator:
         
         return combined
 
-    def extract_structured_info(self, text):
-        """Extract structured information from text/summary"""
-        info = {
-            'requirements': [],
-            'decisions': [],
-            'action_items': [],
-            'timeline': [],
-            'budget': [],
-            'risks': [],
-            'technical': [],
-            'deliverables': [],
-            'stakeholders': []
-        }
+    @staticmethod
+    def _needs_final_pass(chunk_count, combined, summary_config):
+        """Joined chunk summaries longer than the target are summarized once more"""
+        return chunk_count > 1 and len(combined.split()) > summary_config['max_words']
+
+    def _summarize_chunks(self, text, summary_config, quality, custom_instruction, chunk_callback=None, summary_callback=None):
+        """
+        Summaries of the ~400-word chunks of text, in order, and the chunk count.
+        summary_callback(index, total, summary) is called as each one is ready (cached ones first).
+        """
+        chunk_size = 400
+        words = text.split()
+        chunks = [' '.join(words[i:i+chunk_size]) for i in range(0, len(words), chunk_size)]
+        
+        print(f"  📄 Processing {len(chunks)} chunk(s)...")
         
-        sentences = re.split(r'[.!?]+', text)
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence: continue
-            lower = sentence.lower()
+        chunk_texts = []
+        chunk_lengths = []
+        for chunk in chunks:
+            chunk_words = len(chunk.split())
+            if chunk_words < 25:
+                continue
             
-            if any(w in lower for w in ['require', 'need', 'must', 'should', 'shall', 'expect']):
-                info['requirements'].append(sentence)
-            if any(w in lower for w in ['decide', 'agreed', 'approved', 'confirmed', 'finalized']):
-                info['decisions'].append(sentence)
-            if any(w in lower for w in ['will', 'task', 'action', 'assign', 'responsible', 'owner']):
-                info['action_items'].append(sentence)
-            if any(w in lower for w in ['deadline', 'timeline', 'date', 'week', 'month', 'schedule', 'due']):
-                info['timeline'].append(sentence)
-            if any(w in lower for w in ['cost', 'budget', 'price', 'payment', 'fund', 'expense', '$', 'rs', 'rupee', 'inr']):
-                info['budget'].append(sentence)
-            if any(w in lower for w in ['risk', 'concern', 'issue', 'challenge', 'problem', 'blocker']):
-                info['risks'].append(sentence)
-            if any(w in lower for w in ['technical', 'technology', 'system', 'platform', 'api', 'database', 'infrastructure']):
-                info['technical'].append(sentence)
-            if any(w in lower for w in ['deliver', 'output', 'product', 'feature', 'component', 'milestone']):
-                info['deliverables'].append(sentence)
-            if any(w in lower for w in ['stakeholder', 'team', 'department', 'client', 'customer', 'vendor']):
-                info['stakeholders'].append(sentence)
+            chunk_config = self.calculate_adaptive_summary_length(chunk_words, summary_config['strategy'])
+            chunk_texts.append(chunk)
+            chunk_lengths.append((chunk_config['max_length'], chunk_config['min_length']))
+        
+        # Chunks already summarized with the same settings come from the cache
+        summary_cache = cache.get_summary_cache()
+        summaries = [None] * len(chunk_texts)
+        cache_keys = [None] * len(chunk_texts)
+        if summary_cache is not None:
+            for i, (chunk, (max_len, min_len)) in enumerate(zip(chunk_texts, chunk_lengths)):
+                cache_keys[i] = summary_cache.make_key(chunk, max_len, min_len, quality, custom_instruction, self.t5_cache_tag)
+                summaries[i] = summary_cache.get(cache_keys[i])
+        pending = [i for i, s in enumerate(summaries) if s is None]
+        cached_count = len(chunk_texts) - len(pending)
+        if cached_count:
+            print(f"  ♻️ {cached_count} chunk summary(ies) served from cache")
+        
+        def ready(i):
+            if summary_callback and summaries[i] is not None:
+                summary_callback(i, len(chunk_texts), summaries[i])
+        
+        for i, summary in enumerate(summaries):
+            if summary is not None:
+                ready(i)
+        
+        if self.batcher is not None and not profiling.is_profiling():
+            # Chunks join the shared queue so they batch with other requests too
+            futures = [
+                self.batcher.submit(chunk_texts[i], chunk_lengths[i][0], chunk_lengths[i][1], quality, custom_instruction)
+                for i in pending
+            ]
+            for done, (i, future) in enumerate(zip(pending, futures), 1):
+                try:
+                    summaries[i] = future.result()
+                    ready(i)
+                except Exception as e:
+                    print(f"✗ Chunk error: {e}")
+                if chunk_callback:
+                    chunk_callback(cached_count + done, len(chunk_texts))
+        else:
+            def batch_progress(done, total):
+                if chunk_callback:
+                    chunk_callback(cached_count + done, len(chunk_texts))
+            
+            def batch_summary(index, summary):
+                summaries[pending[index]] = summary
+                ready(pending[index])
+            
+            generated = self.generate_t5_summaries_batch(
+                [chunk_texts[i] for i in pending],
+                [chunk_lengths[i] for i in pending],
+                quality=quality,
+                custom_instruction=custom_instruction,
+                chunk_callback=batch_progress,
+                summary_callback=batch_summary
+            )
+            for i, summary in zip(pending, generated):
+                summaries[i] = summary
+        metrics.CHUNKS_SUMMARIZED.inc(sum(summaries[i] is not None for i in pending))
+        
+        if summary_cache is not None:
+            for i in pending:
+                if summaries[i] is not None:
+                    summary_cache.put(cache_keys[i], summaries[i])
+        return [s for s in summaries if s is not None], len(chunks)
+
+    def extract_structured_info(self, *texts, classifier=None):
+        """
+        Extract structured information from one or more texts (e.g. summary, then raw notes)
+        Sentences are classified once each, in order of first appearance; repeats are skipped.
+        `classifier` overrides the KeywordClassifier built from config.EXTRACTION_KEYWORDS.
+        """
+        classifier = classifier or _keyword_classifier
+        info = {category: [] for category in classifier.categories}
+        seen = set()
+        
+        for text in texts:
+            for sentence in SENTENCE_SPLIT_RE.split(text):
+                sentence = sentence.strip()
+                if not sentence or sentence in seen:
+                    continue
+                seen.add(sentence)
+                
+                for category in classifier.classify(sentence):
+                    info[category].append(sentence)
         
         return info
 
@@ -620,16 +1326,61 @@ TOTAL AMOUNT:                                                {metadata.get('tota
 """
         return doc
 
-    def process_audio_smart(self, audio_path, strategy='balanced', quality='medium', custom_instruction=None, save_output=False, output_filename=None, diarize=False):
+    def process_audio_smart(self, audio_path, strategy='balanced', quality='medium', custom_instruction=None, save_output=False, output_filename=None, diarize=False, progress_callback=None, audio=None, audio_sha256=None, use_cache=True, decode_options=None):
         """
         Complete smart pipeline with T5 adaptive summarization AND Optional Diarization
+        progress_callback(stage, percent, detail) is called as each stage starts and
+        after every summarized chunk. `audio` is an optional pre-decoded waveform;
+        audio_sha256/use_cache/decode_options are passed to transcribe_audio.
+        With diarize=True the audio is decoded once and, if PARALLEL_DIARIZATION
+        is set, pyannote runs on a worker thread while Whisper transcribes.
         """
         print("="*70)
         print("🎯 SMART T5 AUDIO SUMMARIZER")
         print("="*70 + "\\n")
         
-        # Step 1: Transcribe
-        transcription_result = self.transcribe_audio(audio_path)
+        def report(stage, percent, detail=None):
+            if progress_callback:
+                progress_callback(stage, percent, detail)
+        
+        # Percent of the job at which each stage begins
+        summarize_start = 65 if diarize else 60
+        
+        # Decode once; Whisper and pyannote both work from the same 16 kHz waveform
+        if diarize and audio is None:
+            audio = _import_whisper().load_audio(audio_path)
+        
+        # Step 1: Transcribe (diarization runs alongside when enabled)
+        diarization_future = None
+        diarization_pool = None
+        if diarize and config.PARALLEL_DIARIZATION:
+            print("🔍 Diarization requested (running alongside transcription)...")
+            diarization_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarization")
+            diarization_future = diarization_pool.submit(
+                self.diarize_audio,
+                audio_path,
+                min_speakers=config.MIN_SPEAKERS,
+                max_speakers=config.MAX_SPEAKERS,
+                audio=audio
+            )
+        
+        report('transcribing', 0, 'transcribing audio')
+        try:
+            transcription_result = self.transcribe_audio(
+                audio_path,
+                audio=audio,
+                audio_sha256=audio_sha256,
+                use_cache=use_cache,
+                decode_options=decode_options
+            )
+        except BaseException:
+            # Don't leave pyannote running for a failed request: drop it if queued, else wait it out
+            if diarization_pool is not None:
+                diarization_future.cancel()
+                diarization_pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        if diarization_pool is not None:
+            diarization_pool.shutdown(wait=False)
         full_text = transcription_result['text']
         word_count = transcription_result['word_count']
         
@@ -638,16 +1389,22 @@ TOTAL AMOUNT:                                                {metadata.get('tota
         speakers_detected = 0
         
         if diarize:
-            print("🔍 Diarization requested...")
-            speaker_segments = self.diarize_audio(
-                audio_path, 
-                min_speakers=config.MIN_SPEAKERS, 
-                max_speakers=config.MAX_SPEAKERS
-            )
+            report('diarizing', 50, 'identifying speakers')
+            if diarization_future is not None:
+                speaker_segments = diarization_future.result()
+            else:
+                print("🔍 Diarization requested...")
+                speaker_segments = self.diarize_audio(
+                    audio_path, 
+                    min_speakers=config.MIN_SPEAKERS, 
+                    max_speakers=config.MAX_SPEAKERS,
+                    audio=audio
+                )
             
             if speaker_segments:
-                merged = self.merge_transcription_with_diarization(transcription_result['segments'], speaker_segments)
-                final_transcript_text = self.format_transcript_with_speakers(merged)
+                with metrics.stage('merge'):
+                    merged = self.merge_transcription_with_diarization(transcription_result['segments'], speaker_segments)
+                    final_transcript_text = self.format_transcript_with_speakers(merged)
                 speakers_detected = len(set(s['speaker'] for s in merged))
                 # Use the speaker-annotated transcript for summarization? 
                 # Yes, FLAN-T5 handles it well and can extract speaker-specific info.
@@ -670,16 +1427,22 @@ TOTAL AMOUNT:                                                {metadata.get('tota
             summary_words = word_count
         else:
             print(f"📊 Generating T5 summary (process_audio_smart)...")
+            report('summarizing', summarize_start, 'summarizing transcript')
             
             # Use final_transcript_text which might contain speaker labels
             text_to_summarize = final_transcript_text
             
             if word_count > 400:
+                def chunk_progress(done, total):
+                    percent = summarize_start + (100 - summarize_start) * 0.9 * done / max(total, 1)
+                    report('summarizing', percent, f"summarizing chunk {done} of {total}")
+                
                 summary = self._summarize_long_text(
                     text_to_summarize,
                     summary_config,
                     quality,
-                    custom_instruction
+                    custom_instruction,
+                    chunk_callback=chunk_progress
                 )
             else:
                 summary = self.generate_t5_summary(
@@ -701,7 +1464,10 @@ TOTAL AMOUNT:                                                {metadata.get('tota
             'compression_ratio': (1 - summary_words/word_count) * 100 if word_count > 0 else 0,
             'strategy': strategy,
             'quality': quality,
-            'config': summary_config
+            'config': summary_config,
+            'vad': transcription_result.get('vad'),
+            'suppressed_segments': transcription_result.get('suppressed_segments', 0),
+            'transcribe_seconds': transcription_result.get('transcribe_seconds')
         }
         
         if save_output and output_filename:
@@ -710,29 +1476,216 @@ TOTAL AMOUNT:                                                {metadata.get('tota
             
         return results
 
-# Global instance
-_document_generator = None
+def resolve_whisper_model(size_or_name=None):
+    """Map a size from config.WHISPER_SIZES (or a model name / "openai/whisper-*" id) to a Whisper model name"""
+    name = size_or_name or config.WHISPER_MODEL
+    if name in config.WHISPER_SIZES:
+        return config.WHISPER_SIZES[name]
+    if size_or_name and name not in config.WHISPER_SIZES.values():
+        raise ValueError(f"Unknown Whisper size '{name}'. Use: {', '.join(config.WHISPER_SIZES)}")
+    return name.split('/')[-1].replace('whisper-', '')
+
+def _bf16_supported(device):
+    if device == "cuda":
+        return torch.cuda.is_bf16_supported()
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+def _int8_supported():
+    # Dynamic quantization needs a quantized CPU backend (fbgemm / x86 / onednn / qnnpack)
+    return any(engine != 'none' for engine in torch.backends.quantized.supported_engines)
+
+def resolve_t5_precision(precision, device):
+    """
+    Effective T5 precision on a device ('auto' -> fp16 on GPU, int8 on CPU).
+    Choices the device cannot run fall back with a warning; ValueError for unknown ones.
+    """
+    precision = (precision or 'auto').lower()
+    if precision not in config.T5_PRECISIONS:
+        raise ValueError(f"Unknown T5 precision '{precision}'. Use: {', '.join(config.T5_PRECISIONS)}")
+    if precision == 'auto':
+        precision = 'fp16' if device == "cuda" else 'int8'
+    fallback = None
+    if precision == 'int8' and (device == "cuda" or not _int8_supported()):
+        fallback = 'fp16' if device == "cuda" else 'fp32'
+    elif precision == 'fp16' and device != "cuda":
+        fallback = 'fp32'  # half-precision matmuls are not accelerated on CPU
+    elif precision == 'bf16' and not _bf16_supported(device):
+        fallback = 'fp16' if device == "cuda" else 'fp32'
+    if fallback:
+        print(f"⚠️ T5 precision {precision} is not supported on {device}, using {fallback}")
+        return fallback
+    return precision
+
+def quantize_linear_int8(model):
+    """Dynamic int8 quantization of the Linear layers (weights int8, activations quantized per batch)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # torch.ao.quantization deprecation notices
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def resolve_t5_model(size_or_name=None):
+    """Map a size from config.T5_SIZES to a T5 model id (configured ids/paths pass through)"""
+    name = size_or_name or config.SUMMARIZATION_MODEL
+    if name in config.T5_SIZES:
+        return config.T5_SIZES[name]
+    if size_or_name and name not in config.T5_SIZES.values():
+        raise ValueError(f"Unknown T5 size '{name}'. Use: {', '.join(config.T5_SIZES)}")
+    return name
+
+# Global instances: one generator per (Whisper, T5) model pair, all sharing one model pool
+_generators = {}
+_generators_lock = threading.Lock()
+_model_pool = None
+
+def get_model_pool():
+    global _model_pool
+    if _model_pool is None:
+        _model_pool = model_registry.ModelRegistry(max_mb=config.MODEL_MEMORY_BUDGET_MB)
+    return _model_pool
+
+def get_generator(whisper_size=None, t5_size=None):
+    """
+    Generator for the requested model sizes (config defaults when omitted).
+    Models load on first use and count against config.MODEL_MEMORY_BUDGET_MB.
+    Raises ValueError for an unknown size.
+    """
+    key = (resolve_whisper_model(whisper_size), resolve_t5_model(t5_size))
+    with _generators_lock:
+        generator = _generators.get(key)
+        if generator is None:
+            generator = SmartT5LargeDocumentGenerator(*key, model_pool=get_model_pool())
+            if config.BATCHING_ENABLED:
+                generator.batcher = batching.T5BatchScheduler(generator)
+            _generators[key] = generator
+    return generator
+
+_preload_lock = threading.Lock()
+_preload_status = {'status': 'idle', 'models': [], 'errors': {}, 'started_at': None, 'finished_at': None}
+
+def preload_in_background(components=None, whisper_size=None, t5_size=None):
+    """
+    Load and warm up models on a daemon thread, so the server can bind its port
+    immediately and preload requests return at once. Poll get_preload_status();
+    per-model timings appear in get_model_stats(). Returns False if a preload is
+    already running. Raises ValueError for unknown models or sizes.
+    """
+    generator = get_generator(whisper_size, t5_size)
+    components = generator.check_components(components)
+    with _preload_lock:
+        if _preload_status['status'] == 'running':
+            return False
+        _preload_status.update(status='running', models=components, errors={}, started_at=time.time(), finished_at=None)
+
+    def run():
+        start = time.perf_counter()
+        try:
+            errors = generator.preload(components)
+        except Exception as e:
+            errors = {'preload': str(e)}
+        failed = {name: error for name, error in errors.items() if error}
+        with _preload_lock:
+            _preload_status.update(status='failed' if failed else 'completed', errors=failed, finished_at=time.time())
+        if failed:
+            print(f"⚠️  Warning: Model preload failed: {failed}")
+            print("Models will load on first request (slow).")
+        else:
+            print(f"✅ Models preloaded and warmed up in {time.perf_counter() - start:.1f}s")
+
+    threading.Thread(target=run, name="model-preload", daemon=True).start()
+    return True
 
-def get_generator():
-    global _document_generator
-    if _document_generator is None:
-        # Load both models for full functionality
-        _document_generator = SmartT5LargeDocumentGenerator()
-    return _document_generator
+def get_preload_status():
+    with _preload_lock:
+        return dict(_preload_status)
 
-def generate_document(text, document_type, metadata=None):
+def get_readiness(components=None):
+    """
+    Readiness of the default generator: ready once every required component
+    (config.READY_MODELS by default) is warm. Never loads a model.
+    """
+    generator = get_generator()
+    required = components if components is not None else config.READY_MODELS
+    required = generator.check_components(required) if required else []
+    stats = generator.models.get_stats()
+    models = {}
+    for component, key in generator.model_keys.items():
+        entry = stats[key]
+        models[component] = {
+            'model': key.split(':', 1)[-1].split('@')[0],
+            'state': entry['state'],
+            'device': entry['device'],
+            'dtype': entry['dtype'],
+            'size_mb': entry['size_mb'],
+            'active': entry['active'],
+            'load_seconds': entry['load_seconds'],
+            'warmup_seconds': entry['warmup_seconds'],
+            'error': entry['error']
+        }
+    models['t5']['precision'] = generator.t5_precision
+
+    states = [models[c]['state'] for c in required]
+    if all(state == 'warm' for state in states):
+        status = 'ready'
+    elif any(state in ('failed', 'unavailable') for state in states):
+        status = 'failed'
+    else:
+        status = 'starting'
+    return {
+        'ready': status == 'ready',
+        'status': status,
+        'required_models': required,
+        'device': generator.device,
+        'models': models,
+        'summary_queue_depth': get_batching_stats().get('queue_depth', 0),
+        'preload': get_preload_status()
+    }
+
+def get_model_stats():
+    """Per-model load state, size, load time and memory growth, without forcing any model to load"""
+    if _model_pool is None:
+        return {}
+    return _model_pool.get_stats()
+
+def get_model_budget():
+    return get_model_pool().get_budget()
+
+def get_batching_stats():
+    """Batch scheduler counters (default generator), without forcing the models to load"""
+    default = _generators.get((resolve_whisper_model(), resolve_t5_model()))
+    if default is None or default.batcher is None:
+        return {'enabled': config.BATCHING_ENABLED, 'queue_depth': 0}
+    return default.batcher.get_stats()
+
+def get_assisted_decoding_stats():
+    """Draft-model acceptance stats (default generator), without forcing the models to load"""
+    default = _generators.get((resolve_whisper_model(), resolve_t5_model()))
+    if default is None or default.assisted_stats is None:
+        return {'enabled': config.T5_ASSISTED_DECODING, 'requests': 0}
+    stats = default.assisted_stats.get_stats()
+    stats['draft_model'] = default.draft_model_name
+    return stats
+
+def generate_document(text, document_type, metadata=None, t5_size=None):
     """
     Main function to generate documents using the smart generator from TEXT input.
     Use this if you already have text (e.g. from frontend notes).
+    t5_size optionally picks a summarizer size from config.T5_SIZES.
     """
     if metadata is None:
         metadata = {}
     
-    generator = get_generator()
+    generator = get_generator(t5_size=t5_size)
     
     # Generate summary first to get structured info
     word_count = len(text.split())
-    if word_count > 50:
+    if word_count > config.CHUNK_SIZE_WORDS:
+        # One pass would truncate at 512 input tokens; summarize chunk by chunk instead
+        print(f"Generating chunked abstractive summary for {word_count} words...")
+        summary_config = generator.calculate_adaptive_summary_length(word_count, 'detailed')
+        summary = generator._summarize_long_text(text, summary_config, 'medium', None)
+    elif word_count > 50:
         print(f"Generating abstractive summary for {word_count} words...")
         summary = generator.generate_t5_summary(
             text,
@@ -742,19 +1695,54 @@ def generate_document(text, document_type, metadata=None):
         )
     else:
         summary = text
-        
-    print(f"Extracting structured info from summary...")
-    structured_info = generator.extract_structured_info(summary)
     
-    # Also extract from original text (hybrid)
-    raw_info = generator.extract_structured_info(text)
-    for key in structured_info:
-        structured_info[key].extend(raw_info[key])
-        structured_info[key] = list(set(structured_info[key]))
+    return _render_document(generator, summary, text, document_type, metadata)
+
+def generate_document_stream(text, document_type, metadata=None, t5_size=None, sample=False):
+    """
+    generate_document that streams its summary: yields the summarize_stream events
+    ('chunk', 'token', 'summary'), then ('document', rendered document).
+    The summary is decoded greedily (or sampled) instead of with beam search.
+    """
+    if metadata is None:
+        metadata = {}
+    if document_type not in ('brd', 'po'):
+        raise ValueError(f"Unknown document type: {document_type}")
     
-    if document_type == 'brd':
-        return generator.generate_brd(summary, structured_info, metadata)
-    elif document_type == 'po':
-        return generator.generate_purchase_order(summary, structured_info, metadata)
+    generator = get_generator(t5_size=t5_size)
+    
+    word_count = len(text.split())
+    if word_count > config.CHUNK_SIZE_WORDS:
+        print(f"Streaming chunked abstractive summary for {word_count} words...")
+        events = generator.summarize_stream(
+            text,
+            quality='medium',
+            sample=sample,
+            summary_config=generator.calculate_adaptive_summary_length(word_count, 'detailed')
+        )
+    elif word_count > 50:
+        print(f"Streaming abstractive summary for {word_count} words...")
+        events = generator.summarize_stream(text, max_length=512, min_length=min(100, word_count), sample=sample)
     else:
+        events = iter([('summary', text)])
+    
+    summary = text
+    for event, data in events:
+        if event == 'summary':
+            summary = data
+        yield event, data
+    
+    yield 'document', _render_document(generator, summary, text, document_type, metadata)
+
+def _render_document(generator, summary, text, document_type, metadata):
+    # Summary sentences first, then the original text (hybrid), deduplicated in order
+    print(f"Extracting structured info from summary and text...")
+    with metrics.stage('extract'):
+        structured_info = generator.extract_structured_info(summary, text)
+    
+    if document_type not in ('brd', 'po'):
         raise ValueError(f"Unknown document type: {document_type}")
+    with metrics.stage('render'):
+        if document_type == 'brd':
+            return generator.generate_brd(summary, structured_info, metadata)
+        return generator.generate_purchase_order(summary, structured_info, metadata)
@@ -0,0 +1,148 @@
+"""
+Background job store for long-running audio processing.
+
+Jobs run on a bounded thread pool; their progress, results and failures are
+kept in memory until JOB_TTL_SECONDS after they finish.
+"""
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting for a worker"""
+
+
+class JobStore:
+    """
+    Thread-safe in-memory job registry with TTL expiry of finished jobs
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, ttl_seconds=None):
+        self.ttl_seconds = ttl_seconds or config.JOB_TTL_SECONDS
+        self.max_pending = max_pending or config.JOB_MAX_PENDING
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or config.JOB_MAX_WORKERS,
+            thread_name_prefix="job-worker"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, on_finish=None, **kwargs):
+        """
+        Run func(*args, progress_callback=..., **kwargs) in the pool and return the job id.
+        on_finish (optional) runs after the job ends either way, e.g. to delete temp files.
+        """
+        self.purge_expired()
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j['status'] in ('queued', 'running'))
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} jobs already pending")
+
+            job_id = uuid.uuid4().hex
+            now = time.time()
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'stage': 'queued',
+                'percent': 0,
+                'detail': None,
+                'result': None,
+                'error': None,
+                'created_at': now,
+                'updated_at': now,
+                'finished_at': None
+            }
+
+        self._executor.submit(self._run, job_id, func, args, kwargs, on_finish)
+        return job_id
+
+    def get(self, job_id):
+        """Snapshot of a job, or None if unknown or expired"""
+        self.purge_expired()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def get_stats(self):
+        """Queued/running job counts (queue depth for readiness checks)"""
+        with self._lock:
+            statuses = [j['status'] for j in self._jobs.values()]
+        return {
+            'queued': statuses.count('queued'),
+            'running': statuses.count('running'),
+            'max_pending': self.max_pending
+        }
+
+    def update_progress(self, job_id, stage, percent, detail=None):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['stage'] = stage
+            job['percent'] = max(0, min(100, int(percent)))
+            job['detail'] = detail
+            job['updated_at'] = time.time()
+
+    def purge_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished_at'] is not None and job['finished_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def _finish(self, job_id, status, result=None, error=None):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            now = time.time()
+            job['status'] = status
+            job['result'] = result
+            job['error'] = error
+            job['updated_at'] = now
+            job['finished_at'] = now
+            # Failed jobs keep the stage they died in
+            if status == 'completed':
+                job['stage'] = 'completed'
+                job['detail'] = None
+                job['percent'] = 100
+
+    def _run(self, job_id, func, args, kwargs, on_finish):
+        with self._lock:
+            self._jobs[job_id]['status'] = 'running'
+
+        def progress_callback(stage, percent, detail=None):
+            self.update_progress(job_id, stage, percent, detail)
+
+        try:
+            result = func(*args, progress_callback=progress_callback, **kwargs)
+            self._finish(job_id, 'completed', result=result)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            traceback.print_exc()
+            self._finish(job_id, 'failed', error=str(e))
+        finally:
+            if on_finish:
+                try:
+                    on_finish()
+                except Exception as e:
+                    print(f"⚠️ Job {job_id} cleanup failed: {e}")
+
+
+# Global instance
+_job_store = None
+
+
+def get_job_store():
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
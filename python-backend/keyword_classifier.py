@@ -0,0 +1,84 @@
+"""
+Compiled multi-keyword sentence classifier for structured-info extraction.
+
+A sentence is tokenized once with a single regex and every token is resolved
+against hashed keyword tables (memoized per distinct token), so the cost per
+sentence no longer grows with the number of categories/keywords. Keywords
+match whole words: 'rs' no longer fires on "users" and 'will' no longer fires
+on "willing". A trailing '*' lets a keyword match longer words that start with
+it ('require*' -> "requirements"). Multi-word keywords ("technical debt") are
+matched as token sequences.
+"""
+import re
+
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Memoized token lookups are dropped once this many distinct tokens have been seen
+TOKEN_CACHE_SIZE = 50000
+
+
+class KeywordClassifier:
+    """
+    Maps a sentence to the set of categories whose keywords it contains
+    """
+
+    def __init__(self, keyword_table):
+        self.categories = list(keyword_table)
+
+        self._exact = {}     # token -> categories
+        self._prefix = {}    # token prefix -> categories
+        self._phrases = {}   # first token -> [(remaining tokens, last token is prefix, categories)]
+        for category, keywords in keyword_table.items():
+            for keyword in keywords:
+                is_prefix = keyword.endswith('*')
+                tokens = TOKEN_RE.findall(keyword.rstrip('*').lower())
+                if not tokens:
+                    continue
+                if len(tokens) == 1:
+                    table = self._prefix if is_prefix else self._exact
+                    table.setdefault(tokens[0], set()).add(category)
+                else:
+                    self._phrases.setdefault(tokens[0], []).append((tokens[1:], is_prefix, category))
+
+        self._prefix_lengths = sorted({len(p) for p in self._prefix})
+        self._token_cache = {}
+
+    def _token_categories(self, token):
+        categories = self._token_cache.get(token)
+        if categories is None:
+            found = set(self._exact.get(token, ()))
+            for length in self._prefix_lengths:
+                if length > len(token):
+                    break
+                found |= self._prefix.get(token[:length], set())
+            categories = frozenset(found)
+            if len(self._token_cache) >= TOKEN_CACHE_SIZE:
+                self._token_cache.clear()
+            self._token_cache[token] = categories
+        return categories
+
+    def _phrase_categories(self, tokens, start):
+        found = set()
+        for rest, is_prefix, category in self._phrases.get(tokens[start], ()):
+            end = start + 1 + len(rest)
+            if end > len(tokens):
+                continue
+            window = tokens[start + 1:end]
+            if window[:-1] != rest[:-1]:
+                continue
+            last = window[-1]
+            if last == rest[-1] or (is_prefix and last.startswith(rest[-1])):
+                found.add(category)
+        return found
+
+    def classify(self, sentence):
+        """Return the set of categories matched by the sentence"""
+        tokens = TOKEN_RE.findall(sentence.lower())
+        found = set()
+        for token in tokens:
+            found |= self._token_categories(token)
+        if self._phrases:
+            for idx, token in enumerate(tokens):
+                if token in self._phrases:
+                    found |= self._phrase_categories(tokens, idx)
+        return found
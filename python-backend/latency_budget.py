@@ -0,0 +1,201 @@
+"""
+Latency budgets for Whisper transcription.
+
+Callers pass a target latency (latency_budget, in seconds) or a named profile
+(fast / balanced / accurate). The audio duration comes from the decoded
+upload or, failing that, from the container header via ffprobe. Each
+candidate plan (Whisper tier x beam search or greedy x temperature fallback)
+is costed as duration x seconds-of-compute-per-audio-second, plus the model
+load time when the tier is not resident. Costs start from
+config.WHISPER_COST_PRIORS and follow measured transcriptions: an
+exponential moving average per plan, and a machine speed factor that scales
+the priors of plans not measured yet. The most accurate plan that fits the
+budget wins, otherwise the cheapest one.
+"""
+import subprocess
+import threading
+
+import config
+from model_registry import READY_STATES
+
+PROFILES = ('fast', 'balanced', 'accurate')
+EMA_WEIGHT = 0.3  # Weight of the newest measurement
+MIN_MEASURED_AUDIO_S = 5  # Shorter clips are dominated by fixed overhead, not per-second cost
+
+_lock = threading.Lock()
+_measured = {}  # (model, beam_size, fallback, device) -> seconds per audio second
+_machine_factor = {}  # device -> measured / prior
+
+
+class TranscriptionPlan:
+    """Chosen Whisper model and decoding parameters for one request"""
+    __slots__ = ('whisper_model', 'beam_size', 'fallback', 'profile', 'budget_seconds', 'audio_seconds',
+                 'estimated_seconds')
+
+    def __init__(self, whisper_model, beam_size, fallback, profile=None, budget_seconds=None, audio_seconds=None,
+                 estimated_seconds=None):
+        self.whisper_model = whisper_model
+        self.beam_size = beam_size
+        self.fallback = fallback
+        self.profile = profile
+        self.budget_seconds = budget_seconds
+        self.audio_seconds = audio_seconds
+        self.estimated_seconds = estimated_seconds
+
+    @property
+    def decode_options(self):
+        return {
+            'task': 'translate',
+            'beam_size': self.beam_size if self.beam_size > 1 else None,
+            'best_of': 5,
+            'temperature': tuple(config.WHISPER_FALLBACK_TEMPERATURES) if self.fallback else 0.0
+        }
+
+    def describe(self, actual_seconds=None):
+        """Response block: chosen parameters plus estimated vs actual seconds"""
+        return {
+            'profile': self.profile,
+            'budget_seconds': self.budget_seconds,
+            'audio_seconds': None if self.audio_seconds is None else round(self.audio_seconds, 2),
+            'whisper_model': self.whisper_model,
+            'beam_size': self.beam_size,
+            'temperature_fallback': self.fallback,
+            'estimated_seconds': None if self.estimated_seconds is None else round(self.estimated_seconds, 2),
+            'actual_seconds': None if actual_seconds is None else round(actual_seconds, 2),
+            'within_budget': None if self.budget_seconds is None or actual_seconds is None
+            else actual_seconds <= self.budget_seconds
+        }
+
+
+def parse_request(values):
+    """(profile, budget_seconds) from the request fields, (None, None) if neither is set; ValueError if invalid"""
+    profile = values.get('profile') or None
+    budget = values.get('latency_budget') or None
+    if profile is not None and profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}'. Use: {', '.join(PROFILES)}")
+    if budget is not None:
+        try:
+            budget = float(budget)
+        except (TypeError, ValueError):
+            raise ValueError("latency_budget must be a number of seconds")
+        if budget <= 0:
+            raise ValueError("latency_budget must be positive")
+    return profile, budget
+
+
+def probe_duration(path, waveform=None):
+    """Audio length in seconds from the decoded waveform, else from the container header (None if unknown)"""
+    if waveform is not None:
+        return len(waveform) / config.SAMPLING_RATE
+    try:
+        completed = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'default=nw=1:nk=1', str(path)],
+            capture_output=True, text=True, timeout=10
+        )
+        return float(completed.stdout.strip())
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def _plan_key(model, decode_options, device):
+    temperature = decode_options.get('temperature', 0.0)
+    return (model, decode_options.get('beam_size') or 1, isinstance(temperature, (list, tuple)), device)
+
+
+def _prior(model, beam_size, fallback, device):
+    cost = config.WHISPER_COST_PRIORS.get(model, max(config.WHISPER_COST_PRIORS.values()))
+    if beam_size <= 1:
+        cost *= config.WHISPER_GREEDY_COST_FACTOR
+    if fallback:
+        cost *= config.WHISPER_FALLBACK_COST_FACTOR
+    if device == "cuda":
+        cost /= config.WHISPER_GPU_SPEEDUP
+    return cost
+
+
+def cost_per_audio_second(model, beam_size, fallback, device):
+    with _lock:
+        measured = _measured.get((model, beam_size, fallback, device))
+        factor = _machine_factor.get(device, 1.0)
+    return measured if measured is not None else _prior(model, beam_size, fallback, device) * factor
+
+
+def record(model, decode_options, device, audio_seconds, seconds):
+    """
+    Feed one measured transcription into the estimates: seconds spent decoding
+    audio_seconds of audio (after VAD), with the model already resident, since
+    load time is costed separately.
+    """
+    if not audio_seconds or audio_seconds < MIN_MEASURED_AUDIO_S:
+        return
+    key = _plan_key(model, decode_options, device)
+    cost = seconds / audio_seconds
+    with _lock:
+        previous = _measured.get(key)
+        _measured[key] = cost if previous is None else (1 - EMA_WEIGHT) * previous + EMA_WEIGHT * cost
+        ratio = cost / _prior(*key)
+        previous = _machine_factor.get(device)
+        _machine_factor[device] = ratio if previous is None else (1 - EMA_WEIGHT) * previous + EMA_WEIGHT * ratio
+
+
+def get_stats():
+    with _lock:
+        return {
+            'seconds_per_audio_second': {
+                f"{model}/beam{beam}{'+fallback' if fallback else ''}/{device}": round(cost, 4)
+                for (model, beam, fallback, device), cost in _measured.items()
+            },
+            'machine_factor': {device: round(factor, 3) for device, factor in _machine_factor.items()}
+        }
+
+
+def _load_seconds(model, pool_stats):
+    entry = pool_stats.get(f"whisper:{model}")
+    if entry is not None and entry['state'] in READY_STATES:
+        return 0.0
+    if entry is not None and entry['load_seconds']:
+        return entry['load_seconds']
+    return config.MODEL_MEMORY_ESTIMATES_MB.get(model, 0) / config.MODEL_LOAD_MB_PER_SECOND
+
+
+def _candidates(ceiling, fixed_model):
+    """Plans from most to least accurate: (model, beam_size, fallback)"""
+    tiers = [ceiling]
+    if not fixed_model:
+        ladder = list(dict.fromkeys(config.WHISPER_SIZES.values()))  # tiny ... large-v3
+        if ceiling in ladder:
+            tiers = ladder[:ladder.index(ceiling) + 1][::-1]
+    plans = [(ceiling, 5, True)]
+    for model in tiers:
+        plans += [(model, 5, False), (model, 1, False)]
+    return plans
+
+
+def plan(profile, budget_seconds, audio_seconds, ceiling, fixed_model, device, pool_stats):
+    """
+    Pick a TranscriptionPlan. ceiling is the largest Whisper model allowed (the
+    requested or configured one); fixed_model keeps exactly that model, varying
+    only the decoding parameters.
+    """
+    candidates = _candidates(ceiling, fixed_model)
+
+    def estimate(candidate):
+        if audio_seconds is None:
+            return None
+        model, beam_size, fallback = candidate
+        return audio_seconds * cost_per_audio_second(model, beam_size, fallback, device) + _load_seconds(model, pool_stats)
+
+    if budget_seconds is not None and audio_seconds is not None:
+        estimates = [estimate(c) for c in candidates]
+        fitting = [i for i, e in enumerate(estimates) if e <= budget_seconds]
+        chosen = candidates[fitting[0]] if fitting else candidates[min(range(len(candidates)), key=estimates.__getitem__)]
+    elif profile == 'accurate':
+        chosen = candidates[0]
+    elif profile == 'fast':
+        # Greedy, one tier below the ceiling when the model may change
+        tiers = list(dict.fromkeys(model for model, _, _ in candidates))
+        chosen = (tiers[1] if len(tiers) > 1 else ceiling, 1, False)
+    else:  # balanced, or a budget without a known duration: today's defaults
+        chosen = (ceiling, 5, False)
+    return TranscriptionPlan(*chosen, profile=profile, budget_seconds=budget_seconds, audio_seconds=audio_seconds,
+                             estimated_seconds=estimate(chosen))
@@ -0,0 +1,225 @@
+"""
+Process metrics in the Prometheus text exposition format (GET /metrics).
+
+Stage histograms and counters are updated inline by the pipeline; each update
+is a dict lookup, a bisect and a lock, cheap enough to leave on in production.
+Gauges and counters the services already keep (model pool memory, job
+queue, cache hits) are read from their get_stats() only when /metrics is
+scraped. Metric names carry the METRICS_PREFIX.
+"""
+import bisect
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+import profiling
+from model_registry import READY_STATES
+
+_registry = []
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = config.METRICS_PREFIX + name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} takes labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=None):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets or config.METRICS_BUCKETS)) + (math.inf,)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [[0] * len(self.buckets), 0.0]  # per-bucket counts, sum
+            counts[0][index] += 1
+            counts[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = (('le', _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# -- Metrics updated inline ---------------------------------------------------------------
+
+STAGE_SECONDS = Histogram(
+    'stage_seconds',
+    "Wall time per pipeline stage (upload, decode, vad, whisper, diarization, merge, "
+    "t5_tokenize, t5_generate, extract, render)",
+    labels=('stage',)
+)
+HTTP_REQUESTS = Counter('http_requests_total', "HTTP requests by route, method and status",
+                        labels=('endpoint', 'method', 'status'))
+HTTP_REQUEST_SECONDS = Histogram('http_request_seconds', "Time to the response headers (streams keep going after)",
+                                 labels=('endpoint',))
+HTTP_IN_FLIGHT = Gauge('http_requests_in_flight', "Requests being handled")
+AUDIO_SECONDS = Counter('audio_seconds_processed_total', "Seconds of audio transcribed (before silence trimming)")
+CHUNKS_SUMMARIZED = Counter('t5_chunks_summarized_total', "Long-text chunks summarized by T5 (cache hits excluded)")
+TOKENS_GENERATED = Counter('t5_tokens_generated_total', "Summary tokens generated by T5")
+
+
+@contextmanager
+def stage(name):
+    """Context manager timing one pipeline stage (and labelling it in a request profile)"""
+    with STAGE_SECONDS.time(stage=name), profiling.annotate(name):
+        yield
+
+
+def count_generated_tokens(summary_ids, pad_token_id):
+    """Add the tokens of a generate() output (after the decoder start token, padding excluded)"""
+    TOKENS_GENERATED.inc(int((summary_ids[:, 1:] != pad_token_id).sum()))
+
+
+# -- Metrics read from the services when scraped --------------------------------------------
+
+def register_collector(collect):
+    """collect() returns [(name, type, help, [(labels dict, value), ...]), ...] at scrape time"""
+    _collectors.append(collect)
+
+
+def _render_collected(name, metric_type, documentation, samples):
+    name = config.METRICS_PREFIX + name
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        if value is not None:
+            lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}")
+    return lines
+
+
+def _collect_services():
+    # Module singletons are read only if they exist, so a scrape never creates a cache or job store
+    families = []
+
+    caches = sys.modules.get('cache')
+    if caches is not None:
+        hits, misses = [], []
+        stores = [('transcription', caches._transcription_cache)]
+        if caches._summary_cache is not None:
+            stores += [('summary_memory', caches._summary_cache.memory), ('summary_disk', caches._summary_cache.disk)]
+        for label, store in stores:
+            if store is not None:
+                stats = store.get_stats()
+                hits.append(({'cache': label}, stats['hits']))
+                misses.append(({'cache': label}, stats['misses']))
+        families += [('cache_hits_total', 'counter', "Cache hits", hits),
+                     ('cache_misses_total', 'counter', "Cache misses", misses)]
+
+    job_module = sys.modules.get('jobs')
+    if job_module is not None and job_module._job_store is not None:
+        stats = job_module._job_store.get_stats()
+        families.append(('jobs_in_flight', 'gauge', "Background audio jobs by status",
+                         [({'status': 'queued'}, stats['queued']), ({'status': 'running'}, stats['running'])]))
+
+    generators = sys.modules.get('document_generator')
+    if generators is not None and generators._model_pool is not None:
+        pool = generators._model_pool
+        families.append(('model_memory_mb', 'gauge', "Measured memory of resident models",
+                         [({'model': name}, entry['size_mb'])
+                          for name, entry in pool.get_stats().items() if entry['state'] in READY_STATES]))
+        budget = pool.get_budget()
+        families.append(('model_memory_budget_mb', 'gauge', "Model pool memory in use and its limit",
+                         [({'kind': 'used'}, budget['used_mb']), ({'kind': 'max'}, budget['max_mb'])]))
+    return families
+
+
+register_collector(_collect_services)
+
+
+def render():
+    """All metrics in the Prometheus text format (version 0.0.4)"""
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    for collect in _collectors:
+        for family in collect():
+            lines += _render_collected(*family)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,311 @@
+"""
+Lazy, per-component model registry with a memory budget.
+
+Each model (Whisper, T5, the pyannote pipeline; one entry per model size) is
+registered with its own loader and only loaded the first time something asks
+for it, so text-only traffic never pays for the audio models. Load time and
+memory growth are recorded per component for /api/health.
+
+When a load would push the resident models past max_mb, the least recently
+used idle models (no request currently inside use()) are unloaded first.
+
+States: unloaded -> loading -> loaded -> warm (after a warm-up inference or a
+first real use), or failed / unavailable.
+"""
+import gc
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# States in which a model is resident and usable
+READY_STATES = ('loaded', 'warm')
+
+
+class ModelUnavailable(Exception):
+    """Raised by a loader when its model is disabled or cannot be used here (not retried)"""
+
+
+def _rss_bytes():
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def _gpu_bytes():
+    try:
+        import torch
+        if torch.cuda.is_available():
+            allocated = torch.cuda.memory_allocated()
+            return allocated if isinstance(allocated, int) else None
+    except Exception:
+        pass
+    return None
+
+
+def _delta_mb(before, after):
+    if before is None or after is None:
+        return None
+    return round((after - before) / (1024 * 1024), 1)
+
+
+def _parameter_mb(value):
+    """Weight memory of torch modules in a loaded value (0 if it holds none)"""
+    total = 0
+    for item in value if isinstance(value, (tuple, list)) else (value,):
+        parameters = getattr(item, 'parameters', None)
+        if callable(parameters):
+            try:
+                total += sum(p.numel() * p.element_size() for p in parameters())
+                # Dynamically quantized Linear layers keep packed int8 weights outside parameters()
+                for module in item.modules():
+                    if hasattr(module, '_packed_params') and hasattr(module, '_weight_bias'):
+                        total += sum(t.numel() * t.element_size() for t in module._weight_bias() if t is not None)
+            except Exception:
+                pass
+    return round(total / (1024 * 1024), 1)
+
+
+def _placement(value):
+    """(device, dtype) of the first torch parameter in a loaded value, or (None, None)"""
+    for item in value if isinstance(value, (tuple, list)) else (value,):
+        parameters = getattr(item, 'parameters', None)
+        if callable(parameters):
+            try:
+                first = next(iter(parameters()))
+            except Exception:
+                continue
+            return str(first.device), str(first.dtype).replace('torch.', '')
+    return None, None
+
+
+class _ModelEntry:
+    __slots__ = ('name', 'loader', 'warmup', 'estimate_mb', 'lock', 'state', 'value', 'error', 'size_mb', 'active',
+                 'last_used', 'load_seconds', 'warmup_seconds', 'rss_delta_mb', 'gpu_delta_mb', 'loaded_at', 'loads',
+                 'evictions', 'details', 'device', 'dtype')
+
+    def __init__(self, name, loader, estimate_mb=0, warmup=None):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+        self.estimate_mb = estimate_mb
+        self.lock = threading.Lock()
+        self.state = 'unloaded'
+        self.value = None
+        self.error = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.details = {}
+        self.device = None
+        self.dtype = None
+        self.rss_delta_mb = None
+        self.gpu_delta_mb = None
+        self.loaded_at = None
+        self.loads = 0
+        self.evictions = 0
+        self.size_mb = 0
+        self.active = 0
+        self.last_used = 0.0
+
+
+class ModelRegistry:
+    """
+    Named lazy loaders; get(name) loads on first use (once, even under concurrency).
+    max_mb (0 = unlimited) caps the combined size of resident models.
+    """
+
+    def __init__(self, max_mb=0):
+        self.max_mb = max_mb
+        self._entries = {}
+        self._lock = threading.Lock()  # guards active counts, eviction and budget accounting
+
+    def register(self, name, loader, estimate_mb=0, warmup=None):
+        """
+        Add a lazy loader (no-op if the name is taken). estimate_mb is used for budgeting
+        until the model has loaded once; warmup(value), if given, runs a short inference.
+        """
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _ModelEntry(name, loader, estimate_mb, warmup)
+
+    def note(self, name, **details):
+        """Attach extra load details (e.g. weight source, snapshot timings) shown in get_stats()"""
+        self._entries[name].details.update(details)
+
+    @property
+    def names(self):
+        return list(self._entries)
+
+    def get(self, name):
+        """Return the loaded model, loading it now if needed (None if unavailable)"""
+        entry = self._entries[name]
+        entry.last_used = time.time()
+        value = entry.value
+        if entry.state in READY_STATES and value is not None:
+            return value
+        with entry.lock:
+            if entry.state in READY_STATES:
+                return entry.value
+            if entry.state == 'unavailable':
+                return None
+            self._load(entry)
+            return entry.value
+
+    @contextmanager
+    def use(self, name):
+        """get(name) and keep the model from being evicted until the block exits"""
+        entry = self._entries[name]
+        with self._lock:
+            entry.active += 1
+        try:
+            yield self.get(name)
+        finally:
+            with self._lock:
+                entry.active -= 1
+                entry.last_used = time.time()
+                if entry.state == 'loaded':
+                    entry.state = 'warm'  # a real call has run through it
+
+    def warm(self, name):
+        """Load the model if needed and run its warm-up inference once; returns warm-up seconds (None if skipped)"""
+        entry = self._entries[name]
+        value = self.get(name)
+        if entry.warmup is None or value is None:
+            return None
+        with entry.lock:
+            if entry.state != 'loaded':
+                return None
+            start = time.perf_counter()
+            try:
+                entry.warmup(value)
+            except Exception as e:
+                # Still usable; the first request just pays the one-time costs
+                print(f"⚠️ Warm-up of {name} failed: {e}")
+                entry.details['warmup_error'] = str(e)
+                return None
+            entry.warmup_seconds = round(time.perf_counter() - start, 3)
+            entry.state = 'warm'
+        print(f"🔥 {name} warmed up in {entry.warmup_seconds:.1f}s")
+        return entry.warmup_seconds
+
+    def _make_room(self, entry):
+        """Unload least recently used idle models until entry fits in the budget"""
+        if not self.max_mb:
+            return
+        needed = entry.size_mb or entry.estimate_mb
+        with self._lock:
+            resident = [e for e in self._entries.values() if e.state in READY_STATES + ('loading',) and e is not entry]
+            used = sum(e.size_mb or e.estimate_mb for e in resident)
+            idle = sorted((e for e in resident if e.state in READY_STATES and e.active == 0), key=lambda e: e.last_used)
+            for victim in idle:
+                if used + needed <= self.max_mb:
+                    break
+                victim.value = None
+                victim.state = 'unloaded'
+                victim.evictions += 1
+                used -= victim.size_mb or victim.estimate_mb
+                print(f"♻️ Evicted idle model {victim.name} ({victim.size_mb:.0f} MB) to make room for {entry.name}")
+            if used + needed > self.max_mb:
+                print(f"⚠️ Loading {entry.name} exceeds the {self.max_mb} MB model budget: "
+                      f"{used:.0f} MB held by models in use")
+            entry.state = 'loading'
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+    def _load(self, entry):
+        entry.error = None
+        entry.details = {}
+        self._make_room(entry)
+        entry.state = 'loading'
+        rss_before, gpu_before = _rss_bytes(), _gpu_bytes()
+        start = time.perf_counter()
+        try:
+            value = entry.loader()
+        except ModelUnavailable as e:
+            entry.state = 'unavailable'
+            entry.error = str(e)
+            print(f"⚠️ {entry.name} unavailable: {e}")
+            return
+        except Exception as e:
+            # Left retryable: the next get() tries again
+            entry.state = 'failed'
+            entry.error = str(e)
+            raise
+        entry.load_seconds = round(time.perf_counter() - start, 3)
+        entry.rss_delta_mb = _delta_mb(rss_before, _rss_bytes())
+        entry.gpu_delta_mb = _delta_mb(gpu_before, _gpu_bytes())
+        entry.loaded_at = time.time()
+        entry.size_mb = (_parameter_mb(value) or entry.gpu_delta_mb or entry.rss_delta_mb
+                         or entry.estimate_mb)
+        entry.device, entry.dtype = _placement(value)
+        entry.loads += 1
+        entry.last_used = time.time()
+        entry.value = value
+        entry.state = 'loaded'
+        print(f"⏱️ {entry.name} loaded in {entry.load_seconds:.1f}s ({entry.size_mb:.0f} MB)")
+
+    def is_loaded(self, name):
+        return self._entries[name].state in READY_STATES
+
+    def load(self, names=None, warm=False):
+        """Load (and optionally warm up) the named components (all by default); returns {name: error or None}"""
+        errors = {}
+        for name in names or self.names:
+            try:
+                if warm:
+                    self.warm(name)
+                else:
+                    self.get(name)
+                errors[name] = None
+            except Exception as e:
+                errors[name] = str(e)
+        return errors
+
+    def unload(self, name):
+        """Drop a loaded, idle model so its memory can be reclaimed"""
+        entry = self._entries[name]
+        with self._lock:
+            if entry.state not in READY_STATES or entry.active:
+                return False
+            entry.value = None
+            entry.state = 'unloaded'
+        gc.collect()
+        return True
+
+    def get_budget(self):
+        with self._lock:
+            used = sum(e.size_mb or e.estimate_mb for e in self._entries.values() if e.state in READY_STATES + ('loading',))
+        return {'max_mb': self.max_mb or None, 'used_mb': round(used, 1)}
+
+    def get_stats(self):
+        return {
+            name: {
+                'state': entry.state,
+                'device': entry.device,
+                'dtype': entry.dtype,
+                'size_mb': entry.size_mb or None,
+                'estimate_mb': entry.estimate_mb or None,
+                'active': entry.active,
+                'last_used': entry.last_used or None,
+                'evictions': entry.evictions,
+                'load_seconds': entry.load_seconds,
+                'warmup_seconds': entry.warmup_seconds,
+                'details': dict(entry.details),
+                'rss_delta_mb': entry.rss_delta_mb,
+                'gpu_delta_mb': entry.gpu_delta_mb,
+                'loaded_at': entry.loaded_at,
+                'loads': entry.loads,
+                'error': entry.error
+            }
+            for name, entry in self._entries.items()
+        }
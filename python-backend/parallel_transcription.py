@@ -0,0 +1,207 @@
+"""
+Long-audio transcription across a pool of worker processes.
+
+A single whisper transcribe() call walks a recording one 30 s window at a
+time on one model, which leaves most cores of a large CPU server idle on a
+long meeting. Here the waveform is cut into spans of about
+PARALLEL_TRANSCRIPTION_SPAN_S, each cut placed on the quietest frame near
+the span boundary so it falls in a pause rather than mid-word. The spans are
+transcribed by PARALLEL_TRANSCRIPTION_WORKERS processes, each holding its
+own Whisper model and pinned to its own torch thread count, and the results
+are stitched back together with every timestamp shifted by its span offset.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+import numpy as np
+
+import config
+import repetition_guard
+import vad
+
+_pools = {}  # (model name, workers, threads) -> _Pool
+_pool_lock = threading.Lock()
+
+
+# -- Worker processes -----------------------------------------------------------------
+
+_worker_model = None
+
+
+def _init_worker(model_name, threads):
+    """Runs once per worker: pin torch threads and load this process's Whisper model"""
+    global _worker_model
+    import torch
+    import whisper
+    import snapshots
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    _worker_model = snapshots.load_whisper(whisper, model_name, "cpu") or whisper.load_model(model_name, device="cpu")
+    repetition_guard.install(_worker_model)
+
+
+def _transcribe_span(audio, decode_options):
+    started = time.perf_counter()
+    with repetition_guard.counting() as guard_stats:
+        result = _worker_model.transcribe(audio, language=None, fp16=False, verbose=None, **decode_options)
+    return {'text': result['text'], 'segments': result.get('segments', []), 'language': result.get('language', 'unknown'),
+            'repetition_guard': dict(guard_stats), 'worker': os.getpid(), 'decode_seconds': time.perf_counter() - started}
+
+
+# -- Parent process -------------------------------------------------------------------
+
+def workers():
+    return config.PARALLEL_TRANSCRIPTION_WORKERS
+
+
+def threads_per_worker():
+    return config.PARALLEL_TRANSCRIPTION_THREADS or max(1, (os.cpu_count() or 1) // max(workers(), 1))
+
+
+def is_enabled():
+    return workers() > 1
+
+
+def should_use(audio, device, sample_rate=None):
+    """Long-audio mode applies to long CPU transcriptions (a GPU is better used by one model)"""
+    sample_rate = sample_rate or config.SAMPLING_RATE
+    return (is_enabled() and device == "cpu" and audio is not None
+            and len(audio) >= config.PARALLEL_TRANSCRIPTION_MIN_S * sample_rate)
+
+
+def split_points(audio, span_seconds=None, sample_rate=None, search_seconds=None):
+    """Sample offsets to cut at: the quietest frame within PARALLEL_TRANSCRIPTION_SEARCH_S of each span boundary"""
+    sample_rate = sample_rate or config.SAMPLING_RATE
+    frame = max(1, int(sample_rate * config.VAD_FRAME_MS / 1000))
+    span = int((span_seconds or config.PARALLEL_TRANSCRIPTION_SPAN_S) * sample_rate / frame)
+    search = int((search_seconds or config.PARALLEL_TRANSCRIPTION_SEARCH_S) * sample_rate / frame)
+    energy = vad.frame_energy_db(np.asarray(audio, dtype=np.float32), frame)
+
+    cuts, previous = [], 0
+    # No boundary that would leave a final span shorter than half a span
+    for target in range(span, len(energy) - span // 2, span):
+        low, high = max(previous + 1, target - search), min(len(energy) - 1, target + search + 1)
+        if low >= high:
+            continue
+        previous = low + int(np.argmin(energy[low:high]))
+        cuts.append(previous * frame)
+    return cuts
+
+
+class _Pool:
+    """One executor per model / worker layout; `users` counts transcriptions running on it"""
+
+    def __init__(self, key):
+        model_name, count, threads = key
+        print(f"🧵 Starting {count} transcription workers ({threads} thread(s) each, Whisper '{model_name}')")
+        # spawn: forking a process that already runs torch / Flask threads is unsafe
+        self.executor = ProcessPoolExecutor(
+            max_workers=count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name, threads)
+        )
+        self.users = 0
+        self.retired = False
+
+
+@contextmanager
+def leased_pool(model_name):
+    """
+    Executor for model_name, kept alive until the caller is done with it.
+    Starting a pool for another model (or worker layout) retires the others:
+    idle ones stop at once, busy ones when their last transcription finishes,
+    so requests on different Whisper tiers never cancel each other's spans.
+    """
+    key = (model_name, workers(), threads_per_worker())
+    with _pool_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            for other_key, other in list(_pools.items()):
+                other.retired = True
+                del _pools[other_key]
+                if not other.users:
+                    other.executor.shutdown(wait=False)
+            pool = _pools[key] = _Pool(key)
+        pool.users += 1
+    broken = False
+    try:
+        yield pool.executor
+    except BrokenProcessPool:
+        broken = True  # a crashed worker breaks the whole pool; start fresh next time
+        raise
+    finally:
+        with _pool_lock:
+            pool.users -= 1
+            if broken and _pools.get(key) is pool:
+                del _pools[key]
+                pool.retired = True
+            if pool.retired and not pool.users:
+                pool.executor.shutdown(wait=False)
+
+
+def shutdown():
+    """Stop all worker processes (pending spans are cancelled); used at exit and by benchmarks"""
+    with _pool_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.retired = True
+        pool.executor.shutdown(wait=True, cancel_futures=True)
+
+
+atexit.register(shutdown)
+
+
+def stitch(results, offsets):
+    """Join per-span Whisper results; offsets are the span start times in seconds"""
+    texts, segments, languages, guard_stats = [], [], Counter(), Counter()
+    for result, offset in zip(results, offsets):
+        guard_stats.update(result.get('repetition_guard', {}))
+        text = result['text'].strip()
+        if text:
+            texts.append(text)
+            languages[result['language']] += len(text)
+        for segment in result['segments']:
+            segment = dict(segment, id=len(segments), start=round(segment['start'] + offset, 3),
+                           end=round(segment['end'] + offset, 3))
+            if segment.get('words'):
+                segment['words'] = [dict(w, start=round(w['start'] + offset, 3), end=round(w['end'] + offset, 3))
+                                    for w in segment['words']]
+            segments.append(segment)
+    return {
+        'text': ' '.join(texts),
+        'segments': segments,
+        'language': languages.most_common(1)[0][0] if languages else 'unknown',
+        'repetition_guard': dict(guard_stats)
+    }
+
+
+def transcribe(audio, model_name, decode_options, sample_rate=None):
+    """
+    Transcribe audio span by span in the worker pool; returns a whisper-style
+    result plus 'spans' and 'decode_seconds': the busiest worker's decode time,
+    which leaves out worker start-up and model loading.
+    """
+    sample_rate = sample_rate or config.SAMPLING_RATE
+    cuts = split_points(audio, sample_rate=sample_rate)
+    bounds = list(zip([0] + cuts, cuts + [len(audio)]))
+    print(f"✂️ Long-audio mode: {len(bounds)} span(s) across {workers()} worker(s)")
+    with leased_pool(model_name) as pool:
+        futures = [pool.submit(_transcribe_span, audio[start:end], decode_options) for start, end in bounds]
+        results = [future.result() for future in futures]
+    stitched = stitch(results, [start / sample_rate for start, _ in bounds])
+    stitched['spans'] = len(bounds)
+    busy = Counter()
+    for result in results:
+        busy[result.get('worker')] += result.get('decode_seconds', 0.0)
+    stitched['decode_seconds'] = max(busy.values(), default=0.0)
+    return stitched
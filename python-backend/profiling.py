@@ -0,0 +1,191 @@
+"""
+On-demand profiling of single requests.
+
+A request sent with `X-Profile: 1` (or to a route in PROFILE_ENDPOINTS) runs
+under cProfile and, when torch is available, torch.profiler. When it finishes
+(after the last byte of a streamed body) three files are written to
+PROFILE_DIR:
+- <id>.pstats       cProfile stats (python -m pstats, snakeviz)
+- <id>.txt          the top functions by cumulative time, readable as is
+- <id>.trace.json   torch.profiler Chrome trace (chrome://tracing, Perfetto)
+
+Only one request is profiled at a time and at most one per
+PROFILE_MIN_INTERVAL_S; other requests run normally. The directory keeps the
+newest PROFILE_MAX_PROFILES profiles, PROFILE_MAX_MB in all. Both profilers
+only see the request's own thread, so while a request is profiled its T5 calls
+bypass the batching worker (see is_profiling); work on other helper threads
+(streamed T5 generation, parallel diarization, transcription worker processes)
+is not captured.
+"""
+import contextlib
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import config
+
+_lock = threading.Lock()
+_local = threading.local()
+_active = None
+_last_started = None
+_counts = {'profiled': 0, 'rate_limited': 0, 'busy': 0}
+
+PROFILE_FILE_PATTERN = re.compile(r'^[\w.-]+\.(pstats|txt|trace\.json)$')
+
+
+class Profile:
+    """cProfile + torch.profiler session for one request (start/stop on the request thread)"""
+
+    def __init__(self, label):
+        slug = re.sub(r'[^\w]+', '-', label).strip('-') or 'request'
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}-{uuid.uuid4().hex[:6]}"
+        self.label = label
+        self.files = []
+        self._cprofile = cProfile.Profile()
+        self._torch = None
+        self._started = None
+        self.seconds = None
+
+    def start(self):
+        if config.PROFILE_TORCH:
+            try:
+                from torch.profiler import ProfilerActivity, profile
+                self._torch = profile(activities=[ProfilerActivity.CPU], record_shapes=config.PROFILE_RECORD_SHAPES)
+                self._torch.__enter__()
+            except Exception as e:
+                print(f"⚠️ torch.profiler unavailable, cProfile only: {e}")
+                self._torch = None
+        self._started = time.perf_counter()
+        self._cprofile.enable()
+        return self
+
+    def stop(self):
+        """Stop both profilers and write the profile files; returns their names"""
+        self._cprofile.disable()
+        self.seconds = time.perf_counter() - self._started
+        directory = Path(config.PROFILE_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        self._cprofile.dump_stats(directory / f"{self.id}.pstats")
+        summary = io.StringIO()
+        summary.write(f"{self.label} - {self.seconds:.3f}s\n\n")
+        pstats.Stats(self._cprofile, stream=summary).sort_stats('cumulative').print_stats(config.PROFILE_TOP_FUNCTIONS)
+        (directory / f"{self.id}.txt").write_text(summary.getvalue())
+        self.files = [f"{self.id}.pstats", f"{self.id}.txt"]
+
+        if self._torch is not None:
+            try:
+                self._torch.__exit__(None, None, None)
+                self._torch.export_chrome_trace(str(directory / f"{self.id}.trace.json"))
+                self.files.append(f"{self.id}.trace.json")
+            except Exception as e:
+                print(f"⚠️ Could not write torch trace: {e}")
+        _prune(directory)
+        print(f"🔬 Profiled {self.label} in {self.seconds:.2f}s → {', '.join(self.files)}")
+        return self.files
+
+
+def requested(header_value, token, endpoint):
+    """True if this request asks to be profiled (header or PROFILE_ENDPOINTS) and may be"""
+    if not config.PROFILING_ENABLED:
+        return False
+    if config.PROFILING_TOKEN and token != config.PROFILING_TOKEN:
+        return False
+    return (header_value or '').lower() in ('1', 'true', 'yes') or endpoint in config.PROFILE_ENDPOINTS
+
+
+def try_start(label):
+    """Start a Profile unless one is running or the last one started too recently (returns None then)"""
+    global _active, _last_started
+    with _lock:
+        if _active is not None:
+            _counts['busy'] += 1
+            return None
+        if _last_started is not None and time.monotonic() - _last_started < config.PROFILE_MIN_INTERVAL_S:
+            _counts['rate_limited'] += 1
+            return None
+        _active = Profile(label)
+        _last_started = time.monotonic()
+    try:
+        _local.profile = _active.start()
+    except Exception:
+        _release()
+        raise
+    return _active
+
+
+def finish(profile):
+    """Stop a Profile from try_start and write its files (safe to call twice)"""
+    if getattr(_local, 'profile', None) is not profile:
+        return
+    _local.profile = None
+    try:
+        profile.stop()
+    finally:
+        _release()
+
+
+def _release():
+    global _active
+    with _lock:
+        if _active is not None and _active.files:
+            _counts['profiled'] += 1
+        _active = None
+
+
+def is_profiling():
+    """True on the thread of a request being profiled"""
+    return getattr(_local, 'profile', None) is not None
+
+
+def annotate(name):
+    """Labelled range in the torch trace of the request being profiled (no-op otherwise)"""
+    if not is_profiling():
+        return contextlib.nullcontext()
+    from torch.profiler import record_function
+    return record_function(name)
+
+
+def _prune(directory):
+    # Keep the newest profiles within PROFILE_MAX_PROFILES / PROFILE_MAX_MB; files of one profile share a stem
+    total_bytes = 0
+    for kept, profile in enumerate(list_profiles()):
+        total_bytes += profile['size_bytes']
+        if kept and (kept >= config.PROFILE_MAX_PROFILES or total_bytes > config.PROFILE_MAX_MB * 1024 * 1024):
+            for name in profile['files']:
+                (directory / name).unlink(missing_ok=True)
+
+
+def list_profiles():
+    """Saved profiles, newest first: [{id, files, size_bytes, created_at}, ...]"""
+    directory = Path(config.PROFILE_DIR)
+    if not directory.is_dir():
+        return []
+    profiles = {}
+    for path in directory.iterdir():
+        if not PROFILE_FILE_PATTERN.match(path.name):
+            continue
+        stat = path.stat()
+        entry = profiles.setdefault(path.name.split('.', 1)[0], {'files': [], 'size_bytes': 0, 'created_at': stat.st_mtime})
+        entry['files'].append(path.name)
+        entry['size_bytes'] += stat.st_size
+        entry['created_at'] = min(entry['created_at'], stat.st_mtime)
+    return [
+        {'id': stem, 'files': sorted(entry['files']), 'size_bytes': entry['size_bytes'], 'created_at': entry['created_at']}
+        for stem, entry in sorted(profiles.items(), key=lambda item: item[1]['created_at'], reverse=True)
+    ]
+
+
+def get_stats():
+    with _lock:
+        return {
+            'enabled': config.PROFILING_ENABLED,
+            'active': _active.id if _active is not None else None,
+            **_counts,
+            'min_interval_s': config.PROFILE_MIN_INTERVAL_S
+        }
@@ -0,0 +1,172 @@
+"""
+Early abort of Whisper repetition loops.
+
+On noise or long quiet stretches Whisper tends to fall into a loop ("Thank
+you. Thank you. Thank you. ..."), spending up to the full token limit on a
+30 s window and returning text that then inflates the T5 chunk count. Whisper
+only notices afterwards, through the compression ratio of the finished window,
+and with temperature fallback decodes the window again.
+
+The guard is an extra logit filter in Whisper's own decoding task. As soon as
+a sequence ends in the same n-gram repeated REPETITION_GUARD_MIN_REPEATS times,
+or its text compresses better than REPETITION_GUARD_COMPRESSION_RATIO, it is
+forced to end. The result of a window that was cut keeps the text decoded
+before the loop and drops the repeated phrase, so Whisper moves on to the next window without conditioning on the loop. A window
+with nothing left is handed back as silence (no-speech probability 1, no
+tokens) and skipped without a fallback decode.
+"""
+import dataclasses
+import threading
+import zlib
+from collections import Counter
+from contextlib import contextmanager
+from functools import partial
+
+import config
+
+_lock = threading.Lock()
+_totals = Counter()  # windows / suppressed_segments across all transcriptions
+_local = threading.local()
+
+
+def compression_ratio(text):
+    """Same measure as whisper.utils.compression_ratio"""
+    text_bytes = text.encode("utf-8")
+    return len(text_bytes) / len(zlib.compress(text_bytes)) if text_bytes else 0.0
+
+
+def repeated_tail(tokens):
+    """
+    Length of the n-gram that tokens end in, repeated back to back (short
+    n-grams need more repeats); 0 if they don't end in a loop.
+    """
+    longest = min(config.REPETITION_GUARD_MAX_NGRAM, len(tokens) // config.REPETITION_GUARD_MIN_REPEATS)
+    for n in range(1, longest + 1):
+        repeats = max(config.REPETITION_GUARD_MIN_REPEATS, -(-config.REPETITION_GUARD_MIN_LOOP_TOKENS // n))
+        if len(tokens) < n * repeats:
+            continue
+        tail = tokens[-n:]
+        if all(tokens[len(tokens) - n * (k + 1):len(tokens) - n * k] == tail for k in range(1, repeats)):
+            return n
+    return 0
+
+
+def loop_start(tokens, n):
+    """Index where the trailing run of period n begins (tokens end in a repeated n-gram)"""
+    start = len(tokens) - n
+    while start > 0 and tokens[start - 1] == tokens[start - 1 + n]:
+        start -= 1
+    return start
+
+
+class RepetitionGuard:
+    """Logit filter (whisper.decoding.LogitFilter interface) that ends looping sequences"""
+
+    def __init__(self, tokenizer, sample_begin):
+        self.tokenizer = tokenizer
+        self.sample_begin = sample_begin
+        self.eot = tokenizer.eot
+        self.steps = 0
+
+    def text_tokens(self, tokens):
+        # Timestamps and special tokens sit above eot; timestamps differ between loop iterations
+        return [token for token in tokens if token < self.eot]
+
+    def is_looping(self, tokens, check_ratio=True):
+        tokens = self.text_tokens(tokens)
+        if repeated_tail(tokens):
+            return True
+        return check_ratio and compression_ratio(self.tokenizer.decode(tokens)) > config.REPETITION_GUARD_COMPRESSION_RATIO
+
+    def apply(self, logits, tokens):
+        self.steps += 1
+        check_ratio = self.steps % config.REPETITION_GUARD_CHECK_EVERY == 0
+        for i, row in enumerate(tokens[:, self.sample_begin:].tolist()):
+            if row and row[-1] != self.eot and self.is_looping(row, check_ratio):
+                logits[i] = float('-inf')
+                logits[i, self.eot] = 0.0
+
+    def _keep(self, tokens):
+        # Number of tokens before the first repeated n-gram; a window that only
+        # compresses too well is shortened until it no longer does
+        text = self.text_tokens(tokens)
+        positions = [i for i, token in enumerate(tokens) if token < self.eot]
+        n = repeated_tail(text)
+        kept = loop_start(text, n) if n else len(text)
+        while kept and compression_ratio(self.tokenizer.decode(text[:kept])) > config.REPETITION_GUARD_COMPRESSION_RATIO:
+            kept -= 1
+        return positions[kept] if kept < len(text) else len(tokens)
+
+    def check(self, result):
+        """
+        A result that ends in a loop, cut to the text before it; returned as
+        silence, so transcribe() skips the window, when nothing is left.
+        """
+        tokens = list(result.tokens)
+        if not self.is_looping(tokens):
+            return result
+        kept = tokens[:self._keep(tokens)]
+        if not self.text_tokens(kept):
+            return dataclasses.replace(result, tokens=[], text="", avg_logprob=float('-inf'), no_speech_prob=1.0,
+                                       compression_ratio=0.0)
+        text = self.tokenizer.decode(self.text_tokens(kept)).strip()
+        return dataclasses.replace(result, tokens=kept, text=text, compression_ratio=compression_ratio(text))
+
+
+def _count(key, n=1):
+    stats = getattr(_local, 'stats', None)
+    if stats is not None:
+        stats[key] += n
+    else:
+        with _lock:
+            _totals[key] += n
+
+
+def decode(model, mel, options=None, **kwargs):
+    """whisper.decoding.decode with the repetition guard added to the task's logit filters"""
+    from whisper.decoding import DecodingOptions, DecodingTask
+
+    options = options or DecodingOptions()
+    if single := mel.ndim == 2:
+        mel = mel.unsqueeze(0)
+    if kwargs:
+        options = dataclasses.replace(options, **kwargs)
+
+    task = DecodingTask(model, options)
+    guard = RepetitionGuard(task.tokenizer, task.sample_begin)
+    task.logit_filters.append(guard)
+    decoded = task.run(mel)
+    results = [guard.check(result) for result in decoded]
+
+    _count('windows', len(results))
+    _count('suppressed_segments', sum(result is not original for result, original in zip(results, decoded)))
+    return results[0] if single else results
+
+
+def install(model):
+    """Route model.decode (what transcribe() calls per window) through the guard; no-op when disabled"""
+    if config.REPETITION_GUARD_ENABLED and not getattr(model, '_repetition_guard', False):
+        model.decode = partial(decode, model)
+        model._repetition_guard = True
+    return model
+
+
+@contextmanager
+def counting():
+    """Count windows / suppressed segments decoded by this thread; added to the totals on exit"""
+    stats = _local.stats = Counter()
+    try:
+        yield stats
+    finally:
+        _local.stats = None
+        with _lock:
+            _totals.update(stats)
+
+
+def get_stats():
+    with _lock:
+        return {
+            'enabled': config.REPETITION_GUARD_ENABLED,
+            'windows': _totals['windows'],
+            'suppressed_segments': _totals['suppressed_segments']
+        }
@@ -0,0 +1,154 @@
+"""
+Local safetensors snapshots of model weights for fast cold starts.
+
+The first load of a model comes from the Hugging Face hub / Whisper download
+cache as usual and is then written to MODEL_SNAPSHOT_DIR as safetensors.
+Later loads read that snapshot instead: safetensors files are memory-mapped,
+skip pickle deserialization and (for Whisper) the SHA-256 check of the whole
+checkpoint that whisper.load_model performs on every start. A Whisper snapshot
+is loaded into a model built on the meta device, so no time goes into random
+weight initialization. T5 is only snapshotted in a dtype other than the one
+its checkpoint stores (fp16 / bf16 from an fp32 checkpoint): an fp32 or int8
+load reads the Hugging Face cache directly, which already holds those weights.
+"""
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import config
+
+
+def snapshot_dir(kind, model_name, dtype=None):
+    """Directory holding the snapshot of one model (in one dtype)"""
+    slug = re.sub(r'[^A-Za-z0-9._-]+', '--', str(model_name)).strip('-')
+    if dtype is not None:
+        slug += f"--{str(dtype).replace('torch.', '')}"
+    return Path(config.MODEL_SNAPSHOT_DIR) / kind / slug
+
+
+def _can_snapshot(model_name):
+    # Local checkpoints are already on disk; only snapshot downloaded models
+    return config.MODEL_SNAPSHOTS_ENABLED and not os.path.exists(str(model_name))
+
+
+def _write_atomically(target, write):
+    """Run write(tmp_dir), then move tmp_dir into place (concurrent writers: first one wins)"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix='.tmp-', dir=target.parent))
+    start = time.perf_counter()
+    try:
+        write(tmp_dir)
+        os.replace(tmp_dir, target)
+    except OSError as e:
+        if not target.exists():
+            print(f"⚠️ Could not write snapshot {target}: {e}")
+        return None
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    seconds = round(time.perf_counter() - start, 3)
+    print(f"💾 Saved snapshot {target} ({seconds:.1f}s)")
+    return seconds
+
+
+# -- T5 (transformers save_pretrained writes model.safetensors) -----------------------
+
+def t5_source(model_id, dtype):
+    """Snapshot directory to load from if one exists, else the original model id"""
+    path = snapshot_dir('t5', model_id, dtype)
+    if _can_snapshot(model_id) and (path / 'config.json').exists():
+        return str(path)
+    return model_id
+
+
+def save_t5(model_id, dtype, tokenizer, model):
+    """Write a snapshot after a hub load; returns seconds spent, or None if skipped"""
+    path = snapshot_dir('t5', model_id, dtype)
+    if not _can_snapshot(model_id) or path.exists():
+        return None
+    # config.torch_dtype keeps the checkpoint's dtype (T5 checkpoints without one are fp32)
+    stored = str(getattr(model.config, 'torch_dtype', None) or 'float32').replace('torch.', '')
+    if stored == str(dtype).replace('torch.', ''):
+        return None  # same weights as the Hugging Face cache: a snapshot would only duplicate them
+
+    def write(tmp_dir):
+        model.save_pretrained(tmp_dir, safe_serialization=True)
+        tokenizer.save_pretrained(tmp_dir)
+
+    return _write_atomically(path, write)
+
+
+# -- Whisper (model dims as JSON + state_dict as safetensors) -------------------------
+
+def load_whisper(whisper, name, device):
+    """Whisper model from its snapshot, or None if there is none yet"""
+    path = snapshot_dir('whisper', name)
+    if not _can_snapshot(name) or not (path / 'model.safetensors').exists():
+        return None
+    from safetensors.torch import load_file
+
+    with open(path / 'dims.json', 'r', encoding='utf-8') as f:
+        dims = whisper.model.ModelDimensions(**json.load(f))
+    model = _whisper_on_meta(whisper, dims)
+    # assign: the snapshot tensors become the parameters (strict: every one must be there)
+    model.load_state_dict(load_file(str(path / 'model.safetensors'), device='cpu'), assign=True)
+    _init_whisper_buffers(model)
+    alignment_heads = getattr(whisper, '_ALIGNMENT_HEADS', {}).get(name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model.to(device)
+
+
+def _whisper_on_meta(whisper, dims):
+    """
+    Whisper whose encoder and decoder are built on the meta device (shapes
+    only: no memory, no random initialization). Whisper.__init__ itself
+    cannot run there (its alignment-head buffer is made sparse), so the
+    model is assembled from its parts the way __init__ does.
+    """
+    import torch
+
+    model = whisper.model.Whisper.__new__(whisper.model.Whisper)
+    torch.nn.Module.__init__(model)
+    model.dims = dims
+    with torch.device('meta'):
+        model.encoder = whisper.model.AudioEncoder(dims.n_mels, dims.n_audio_ctx, dims.n_audio_state,
+                                                   dims.n_audio_head, dims.n_audio_layer)
+        model.decoder = whisper.model.TextDecoder(dims.n_vocab, dims.n_text_ctx, dims.n_text_state,
+                                                  dims.n_text_head, dims.n_text_layer)
+    return model
+
+
+def _init_whisper_buffers(model):
+    # Non-persistent buffers are not in the state dict; rebuild them as Whisper.__init__ does
+    import torch
+
+    dims = model.dims
+    mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(float('-inf')).triu_(1)
+    model.decoder.register_buffer('mask', mask, persistent=False)
+    heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+    heads[dims.n_text_layer // 2:] = True
+    model.register_buffer('alignment_heads', heads.to_sparse(), persistent=False)
+    left = [name for name, tensor in (*model.named_parameters(), *model.named_buffers()) if tensor.is_meta]
+    if left:
+        raise RuntimeError(f"Whisper snapshot left {', '.join(left)} uninitialized")
+
+
+def save_whisper(name, model):
+    """Write a snapshot after a download-cache load; returns seconds spent, or None if skipped"""
+    path = snapshot_dir('whisper', name)
+    if not _can_snapshot(name) or path.exists():
+        return None
+    from safetensors.torch import save_file
+
+    def write(tmp_dir):
+        with open(tmp_dir / 'dims.json', 'w', encoding='utf-8') as f:
+            json.dump(asdict(model.dims), f)
+        state = {k: v.detach().to('cpu').contiguous() for k, v in model.state_dict().items()}
+        save_file(state, str(tmp_dir / 'model.safetensors'))
+
+    return _write_atomically(path, write)
@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import threading
+import sys
+import os
+
+# Add parent dir to path to import assisted_decoding
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+import config
+from assisted_decoding import AssistedDecodingStats, count_forward_passes
+from document_generator import SmartT5LargeDocumentGenerator
+
+
+class FakeModel:
+    """Stands in for a torch module: register_forward_hook + a forward that fires the hooks"""
+
+    def __init__(self):
+        self.hooks = []
+
+    def register_forward_hook(self, hook):
+        self.hooks.append(hook)
+        model = self
+
+        class Handle:
+            def remove(self):
+                model.hooks.remove(hook)
+        return Handle()
+
+    def forward(self):
+        for hook in list(self.hooks):
+            hook(self, (), None)
+
+
+class TestAssistedDecoding(unittest.TestCase):
+
+    def test_counts_only_the_calling_threads_passes(self):
+        target, draft = FakeModel(), FakeModel()
+        with count_forward_passes(target, draft) as passes:
+            for _ in range(3):
+                target.forward()
+            draft.forward()
+            other = threading.Thread(target=lambda: [target.forward() for _ in range(5)])
+            other.start()
+            other.join()
+
+        self.assertEqual(passes, [3, 1])
+        self.assertEqual(target.hooks, [])  # hooks removed on exit
+
+    def test_acceptance_stats(self):
+        stats = AssistedDecodingStats(history=2)
+        # 40 tokens in 10 verifying passes: 30 of 36 proposed draft tokens accepted
+        entry = stats.record(tokens=40, target_passes=10, draft_passes=36, seconds=0.5)
+        self.assertEqual((entry['accepted'], entry['acceptance_rate'], entry['tokens_per_pass']), (30, 0.833, 4.0))
+
+        stats.record(tokens=10, target_passes=10, draft_passes=4, seconds=0.5)  # nothing accepted
+        stats.record(tokens=20, target_passes=10, draft_passes=10, seconds=0.5)
+        summary = stats.get_stats()
+        self.assertEqual(summary['requests'], 3)
+        self.assertEqual(summary['acceptance_rate'], round(40 / 50, 3))
+        self.assertEqual([e['tokens'] for e in summary['recent']], [20, 10])  # newest first, bounded
+
+    def test_summary_cache_tag_covers_the_draft_model(self):
+        generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+        generator.t5_model_name, generator.t5_precision = 'google/flan-t5-large', 'int8'
+        generator.draft_model_name = 'google/flan-t5-small'
+        generator.assisted_stats = None
+        plain = generator.t5_cache_tag
+
+        generator.assisted_stats = AssistedDecodingStats()
+        with patch.object(config, 'T5_ASSISTED_QUALITIES', ['greedy']):
+            assisted = generator.t5_cache_tag
+            generator.draft_model_name = 'google/flan-t5-base'
+            other_draft = generator.t5_cache_tag
+        self.assertEqual(len({plain, assisted, other_draft}), 3)
+
+        # Beam qualities are never switched to greedy, so they do not change the tag either
+        with patch.object(config, 'T5_ASSISTED_QUALITIES', ['greedy', 'fast']):
+            self.assertEqual(generator.assisted_qualities, {'greedy'})
+            self.assertEqual(generator.t5_cache_tag, other_draft)
+        with patch.object(config, 'T5_ASSISTED_QUALITIES', ['fast']):
+            self.assertEqual(generator.t5_cache_tag, plain)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,146 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+import sys
+import os
+
+import numpy as np
+
+# Add parent dir to path to import batching
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+from batching import T5BatchScheduler
+from document_generator import SmartT5LargeDocumentGenerator
+
+
+class FakeGenerator:
+    """Stands in for SmartT5LargeDocumentGenerator; echoes inputs and records batch sizes"""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def generate_t5_summaries_batch(self, texts, lengths, quality='medium', custom_instruction=None,
+                                    generate_callback=None):
+        self.entered.set()
+        self.release.wait()
+        self.batch_sizes.append(len(texts))
+        generate_callback(len(texts))
+        return [None if t == 'bad' else f"{quality}:{t}:{mx}" for t, (mx, _) in zip(texts, lengths)]
+
+
+class TestBatchScheduler(unittest.TestCase):
+
+    def test_results_routed_to_callers(self):
+        """Each caller gets the summary for its own text"""
+        generator = FakeGenerator()
+        scheduler = T5BatchScheduler(generator, max_batch_size=4, max_wait_ms=50)
+
+        futures = [scheduler.submit(f"text{i}", max_length=10 + i) for i in range(6)]
+        results = [f.result(timeout=5) for f in futures]
+
+        self.assertEqual(results, [f"medium:text{i}:{10 + i}" for i in range(6)])
+        self.assertTrue(all(size <= 4 for size in generator.batch_sizes))
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Requests arriving while the worker is busy are coalesced"""
+        generator = FakeGenerator()
+        generator.release.clear()
+        scheduler = T5BatchScheduler(generator, max_batch_size=8, max_wait_ms=0)
+
+        first = scheduler.submit("first")
+        generator.entered.wait(timeout=5)
+        rest = [scheduler.submit(f"t{i}") for i in range(5)]
+        generator.release.set()
+
+        first.result(timeout=5)
+        for f in rest:
+            f.result(timeout=5)
+
+        self.assertEqual(generator.batch_sizes, [1, 5])
+        stats = scheduler.get_stats()
+        self.assertEqual(stats['batches'], 2)
+        self.assertEqual(stats['requests'], 6)
+        self.assertEqual(stats['generate_calls'], 2)
+        self.assertAlmostEqual(stats['batch_fill_ratio'], 6 / 16, places=3)
+
+    def test_quality_groups_and_failures(self):
+        """Different beam settings run separately; failed items raise for their caller only"""
+        generator = FakeGenerator()
+        generator.release.clear()
+        scheduler = T5BatchScheduler(generator, max_batch_size=8, max_wait_ms=0)
+
+        blocker = scheduler.submit("blocker")
+        generator.entered.wait(timeout=5)
+        fast = scheduler.submit("a", quality='fast')
+        bad = scheduler.submit("bad")
+        good = scheduler.submit("b")
+        generator.release.set()
+
+        blocker.result(timeout=5)
+        self.assertEqual(fast.result(timeout=5), "fast:a:512")
+        self.assertEqual(good.result(timeout=5), "medium:b:512")
+        with self.assertRaises(RuntimeError):
+            bad.result(timeout=5)
+
+
+class FakeEncoding(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """One token per word; decodes ids back to space-separated numbers"""
+    pad_token_id = 0
+
+    def __call__(self, prompts, **kwargs):
+        if isinstance(prompts, str):
+            return {'input_ids': prompts.split()}
+        return FakeEncoding(input_ids=[p.split() for p in prompts], attention_mask=None)
+
+    def batch_decode(self, rows, **kwargs):
+        return [' '.join(str(token) for token in row) for row in rows]
+
+
+class FakeModel:
+    """Generates max_length tokens per row and records the kwargs of each call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, input_ids, attention_mask=None, **kwargs):
+        self.calls.append(dict(kwargs, rows=len(input_ids)))
+        return np.tile(np.arange(kwargs['max_length']), (len(input_ids), 1))
+
+
+class TestGenerationLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+        self.generator.tokenizer = FakeTokenizer()
+        self.generator.model = FakeModel()
+        self.generator.device = 'cpu'
+        self.generator.is_flan = True
+
+    def test_each_text_is_decoded_with_its_own_limits(self):
+        """Texts share a generate call only with identical limits; outputs are never cut afterwards"""
+        sizes = []
+        results = self.generator._generate_t5_summaries_batch(
+            ["one two three", "four five", "six seven"], [(100, 30), (120, 40), (100, 30)], 'medium', None, None, None,
+            generate_callback=sizes.append
+        )
+
+        calls = sorted((c['max_length'], c['min_length'], c['rows']) for c in self.generator.model.calls)
+        self.assertEqual(calls, [(100, 30, 2), (120, 40, 1)])
+        self.assertEqual(sorted(sizes), [1, 2])
+        self.assertEqual([len(r.split()) for r in results], [100, 120, 100])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,87 @@
+import unittest
+import tempfile
+import sys
+import os
+
+# Add parent dir to path to import cache
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+from cache import DiskLRUCache, MemoryLRUCache, SummaryCache, make_cache_key
+
+
+class TestDiskLRUCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_hit_and_miss_counters(self):
+        store = DiskLRUCache(self.directory, max_bytes=10_000)
+        self.assertIsNone(store.get('a'))
+        store.put('a', {'text': 'hello', 'segments': [{'start': 0.0, 'end': 1.5}], 'language': 'en'})
+        self.assertEqual(store.get('a')['segments'][0]['end'], 1.5)
+
+        stats = store.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_lru_eviction(self):
+        value = {'text': 'x' * 100}
+        store = DiskLRUCache(self.directory, max_bytes=250)
+        store.put('a', value)
+        store.put('b', value)
+        store.get('a')  # a becomes most recently used
+        store.put('c', value)
+
+        self.assertIsNone(store.get('b'))
+        self.assertIsNotNone(store.get('a'))
+        self.assertIsNotNone(store.get('c'))
+        self.assertEqual(store.get_stats()['evictions'], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'b.json')))
+
+    def test_entries_survive_restart(self):
+        DiskLRUCache(self.directory, max_bytes=10_000).put('a', {'text': 'kept'})
+        reopened = DiskLRUCache(self.directory, max_bytes=10_000)
+        self.assertEqual(reopened.get('a'), {'text': 'kept'})
+
+    def test_cache_key_is_order_independent(self):
+        self.assertEqual(
+            make_cache_key(audio_sha256='abc', task='translate', beam_size=5),
+            make_cache_key(beam_size=5, task='translate', audio_sha256='abc')
+        )
+        self.assertNotEqual(
+            make_cache_key(audio_sha256='abc', beam_size=5),
+            make_cache_key(audio_sha256='abc', beam_size=1)
+        )
+
+
+class TestSummaryCache(unittest.TestCase):
+
+    def test_memory_lru_bounded(self):
+        store = MemoryLRUCache(max_entries=2)
+        store.put('a', 1)
+        store.put('b', 2)
+        store.get('a')
+        store.put('c', 3)
+        self.assertIsNone(store.get('b'))
+        self.assertEqual(store.get('a'), 1)
+
+    def test_key_ignores_whitespace_only(self):
+        base = SummaryCache.make_key("The team  agreed.\n", 120, 30, 'medium', None, 'google/flan-t5-base')
+        self.assertEqual(base, SummaryCache.make_key("The team agreed.", 120, 30, 'medium', None, 'google/flan-t5-base'))
+        self.assertNotEqual(base, SummaryCache.make_key("The team agreed.", 120, 30, 'fast', None, 'google/flan-t5-base'))
+        self.assertNotEqual(base, SummaryCache.make_key("The team agreed.", 120, 30, 'medium', 'Summarize', 'google/flan-t5-base'))
+        self.assertNotEqual(base, SummaryCache.make_key("The team agreed.", 120, 30, 'medium', None, 'google/flan-t5-large'))
+
+    def test_disk_tier_survives_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            SummaryCache(8, disk_directory=directory, disk_max_bytes=10_000).put('k', 'summary text')
+            reopened = SummaryCache(8, disk_directory=directory, disk_max_bytes=10_000)
+            self.assertEqual(reopened.get('k'), 'summary text')
+            self.assertEqual(reopened.get_stats()['memory']['entries'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+# Add parent dir to path to import document_generator
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+from document_generator import SmartT5LargeDocumentGenerator
+from keyword_classifier import KeywordClassifier
+
+
+def make_generator():
+    # extract_structured_info needs no models, so skip __init__
+    return SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+
+
+class TestStructuredExtraction(unittest.TestCase):
+
+    def test_categories(self):
+        info = make_generator().extract_structured_info(
+            "The system must support SSO. The client approved the budget. Deadline is next month."
+        )
+        self.assertEqual(info['requirements'], ["The system must support SSO"])
+        self.assertIn("The client approved the budget", info['decisions'])
+        self.assertIn("The client approved the budget", info['budget'])
+        self.assertEqual(info['timeline'], ["Deadline is next month"])
+        self.assertEqual(len(info), 9)
+
+    def test_order_kept_and_duplicates_dropped_across_texts(self):
+        summary = "Vendor must ship the API. Team needs a staging database."
+        notes = "Team needs a staging database. Alpha must be ready. Vendor must ship the API!"
+        info = make_generator().extract_structured_info(summary, notes)
+        self.assertEqual(info['requirements'], [
+            "Vendor must ship the API",
+            "Team needs a staging database",
+            "Alpha must be ready"
+        ])
+
+
+class TestKeywordClassifier(unittest.TestCase):
+
+    def test_word_boundaries(self):
+        """Short keywords no longer match inside other words"""
+        classifier = KeywordClassifier({'budget': ['rs', '$*'], 'action_items': ['will']})
+        self.assertEqual(classifier.classify("Users logged hours"), set())
+        self.assertEqual(classifier.classify("They are willing to help"), set())
+        self.assertEqual(classifier.classify("Total is Rs 5000"), {'budget'})
+        self.assertEqual(classifier.classify("Licence costs $500 per seat"), {'budget'})
+        self.assertEqual(classifier.classify("Priya will send it"), {'action_items'})
+
+    def test_prefix_keywords(self):
+        classifier = KeywordClassifier({'requirements': ['require*'], 'deliverables': ['deliver*']})
+        self.assertEqual(classifier.classify("Requirements were delivered"), {'requirements', 'deliverables'})
+        self.assertEqual(classifier.classify("Prerequisite work"), set())
+
+    def test_overlapping_keywords_keep_all_categories(self):
+        """Keywords sharing a start position, or nested in a phrase, all report their category"""
+        classifier = KeywordClassifier({'technical': ['tech*'], 'risks': ['technical debt'], 'budget': ['debt']})
+        self.assertEqual(classifier.classify("Technical debt is growing"), {'technical', 'risks', 'budget'})
+
+    def test_custom_table_used_by_extraction(self):
+        classifier = KeywordClassifier({'requirements': ['must'], 'budget': ['invoice*']})
+        info = make_generator().extract_structured_info(
+            "Invoices go out monthly. The app must load fast.", classifier=classifier
+        )
+        self.assertEqual(info, {
+            'requirements': ["The app must load fast"],
+            'budget': ["Invoices go out monthly"]
+        })
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,79 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+# Add parent dir to path to import jobs
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+from jobs import JobStore, JobQueueFull
+
+
+def wait_for(store, job_id, status, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job and job['status'] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {store.get(job_id)}")
+
+
+class TestJobStore(unittest.TestCase):
+
+    def test_progress_and_result(self):
+        """Progress updates are visible while running and the result is kept after"""
+        store = JobStore(max_workers=1, max_pending=5, ttl_seconds=60)
+        reached = threading.Event()
+        release = threading.Event()
+        cleaned = []
+
+        def work(progress_callback):
+            progress_callback('summarizing', 70, 'summarizing chunk 2 of 4')
+            reached.set()
+            release.wait(5)
+            return {'summary': 'done'}
+
+        job_id = store.submit(work, on_finish=lambda: cleaned.append(True))
+        reached.wait(5)
+        job = store.get(job_id)
+        self.assertEqual(job['status'], 'running')
+        self.assertEqual(job['stage'], 'summarizing')
+        self.assertEqual(job['percent'], 70)
+        self.assertEqual(job['detail'], 'summarizing chunk 2 of 4')
+
+        release.set()
+        job = wait_for(store, job_id, 'completed')
+        self.assertEqual(job['result'], {'summary': 'done'})
+        self.assertEqual(job['percent'], 100)
+        self.assertEqual(cleaned, [True])
+
+    def test_failure_recorded(self):
+        store = JobStore(max_workers=1, max_pending=5, ttl_seconds=60)
+
+        def work(progress_callback):
+            raise ValueError("ffmpeg exploded")
+
+        job = wait_for(store, store.submit(work), 'failed')
+        self.assertEqual(job['error'], "ffmpeg exploded")
+
+    def test_finished_jobs_expire(self):
+        store = JobStore(max_workers=1, max_pending=5, ttl_seconds=0.05)
+        job_id = store.submit(lambda progress_callback: 'ok')
+        wait_for(store, job_id, 'completed')
+        time.sleep(0.1)
+        self.assertIsNone(store.get(job_id))
+
+    def test_pending_limit(self):
+        store = JobStore(max_workers=1, max_pending=1, ttl_seconds=60)
+        release = threading.Event()
+        job_id = store.submit(lambda progress_callback: release.wait(5))
+        with self.assertRaises(JobQueueFull):
+            store.submit(lambda progress_callback: None)
+        release.set()
+        wait_for(store, job_id, 'completed')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add parent dir to path to import latency_budget
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import latency_budget
+
+PRIORS = {'tiny': 0.05, 'base': 0.1, 'small': 0.3, 'medium': 0.8, 'large-v3': 1.6}
+LOADED = {f"whisper:{model}": {'state': 'loaded', 'load_seconds': 1.0} for model in PRIORS}
+
+
+class TestLatencyBudget(unittest.TestCase):
+
+    def setUp(self):
+        patcher = patch.dict(latency_budget.config.WHISPER_COST_PRIORS, PRIORS, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for state in (latency_budget._measured, latency_budget._machine_factor):
+            patcher = patch.dict(state, clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def plan(self, profile=None, budget=None, audio_seconds=600, ceiling='small', fixed=False, pool_stats=LOADED):
+        return latency_budget.plan(profile, budget, audio_seconds, ceiling, fixed, 'cpu', pool_stats)
+
+    def test_budget_picks_most_accurate_plan_that_fits(self):
+        # 600 s of audio: small beam5 = 180 s, small greedy = 90 s, base beam5 = 60 s
+        plan = self.plan(budget=100)
+        self.assertEqual((plan.whisper_model, plan.beam_size, plan.fallback), ('small', 1, False))
+        self.assertAlmostEqual(plan.estimated_seconds, 90)
+        self.assertIsNone(plan.decode_options['beam_size'])
+
+        # Nothing fits: the cheapest plan
+        plan = self.plan(budget=1)
+        self.assertEqual((plan.whisper_model, plan.beam_size), ('tiny', 1))
+
+        # An explicit whisper_size only varies the decoding parameters
+        self.assertEqual(self.plan(budget=1, fixed=True).whisper_model, 'small')
+
+        # A tier that is not loaded pays its load time
+        plan = self.plan(budget=100, pool_stats={})
+        self.assertGreater(plan.estimated_seconds, 90)
+
+    def test_profiles(self):
+        accurate = self.plan('accurate')
+        self.assertEqual((accurate.whisper_model, accurate.beam_size, accurate.fallback), ('small', 5, True))
+        self.assertIsInstance(accurate.decode_options['temperature'], tuple)
+        fast = self.plan('fast')
+        self.assertEqual((fast.whisper_model, fast.beam_size), ('base', 1))
+        balanced = self.plan('balanced', audio_seconds=None)
+        self.assertEqual((balanced.whisper_model, balanced.beam_size, balanced.estimated_seconds), ('small', 5, None))
+
+        with self.assertRaises(ValueError):
+            latency_budget.parse_request({'profile': 'turbo'})
+        with self.assertRaises(ValueError):
+            latency_budget.parse_request({'latency_budget': '-3'})
+        self.assertEqual(latency_budget.parse_request({'latency_budget': '30'}), (None, 30.0))
+
+    def test_measurements_calibrate_estimates(self):
+        # This machine runs small/beam5 at twice the prior cost
+        options = self.plan('balanced').decode_options
+        latency_budget.record('small', options, 'cpu', audio_seconds=100, seconds=60)
+        self.assertAlmostEqual(latency_budget.cost_per_audio_second('small', 5, False, 'cpu'), 0.6)
+        # Unmeasured plans scale by the same machine factor
+        self.assertAlmostEqual(latency_budget.cost_per_audio_second('base', 5, False, 'cpu'), 0.2)
+
+        latency_budget.record('small', options, 'cpu', audio_seconds=100, seconds=30)
+        self.assertAlmostEqual(latency_budget.cost_per_audio_second('small', 5, False, 'cpu'), 0.51)
+        # Very short clips are ignored
+        latency_budget.record('small', options, 'cpu', audio_seconds=1, seconds=30)
+        self.assertAlmostEqual(latency_budget.cost_per_audio_second('small', 5, False, 'cpu'), 0.51)
+
+        described = self.plan(budget=100).describe(actual_seconds=120)
+        self.assertFalse(described['within_budget'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
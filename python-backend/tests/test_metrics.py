@@ -0,0 +1,38 @@
+import unittest
+import sys
+import os
+
+# Add parent dir to path to import metrics
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import metrics
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram('test_latency_seconds', "Test latency", labels=('stage',), buckets=(0.1, 1))
+        for value in (0.05, 0.5, 0.7, 3):
+            histogram.observe(value, stage='whisper')
+
+        lines = histogram.render()
+        self.assertIn('smart_t5_test_latency_seconds_bucket{stage="whisper",le="0.1"} 1', lines)
+        self.assertIn('smart_t5_test_latency_seconds_bucket{stage="whisper",le="1"} 3', lines)
+        self.assertIn('smart_t5_test_latency_seconds_bucket{stage="whisper",le="+Inf"} 4', lines)
+        self.assertIn('smart_t5_test_latency_seconds_sum{stage="whisper"} 4.25', lines)
+        self.assertIn('smart_t5_test_latency_seconds_count{stage="whisper"} 4', lines)
+
+    def test_counters_render_with_labels_and_reject_unknown_ones(self):
+        counter = metrics.Counter('test_requests_total', "Test requests", labels=('endpoint', 'status'))
+        counter.inc(endpoint='/api/jobs/<job_id>', status=200)
+        counter.inc(2, endpoint='/api/jobs/<job_id>', status=200)
+
+        text = metrics.render()
+        self.assertIn('# TYPE smart_t5_test_requests_total counter', text)
+        self.assertIn('smart_t5_test_requests_total{endpoint="/api/jobs/<job_id>",status="200"} 3', text)
+        with self.assertRaises(ValueError):
+            counter.inc(endpoint='/api/summarize')
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,174 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import threading
+import time
+import sys
+import os
+
+# Add parent dir to path to import model_registry / document_generator
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+import document_generator
+from model_registry import ModelRegistry, ModelUnavailable
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_loads_once_under_concurrency(self):
+        calls = []
+
+        def slow_loader():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'model'
+
+        registry = ModelRegistry()
+        registry.register('t5', slow_loader)
+        threads = [threading.Thread(target=registry.get, args=('t5',)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        stats = registry.get_stats()['t5']
+        self.assertEqual(stats['state'], 'loaded')
+        self.assertGreaterEqual(stats['load_seconds'], 0.05)
+
+    def test_failed_load_is_retried_and_unavailable_is_not(self):
+        attempts = []
+
+        def flaky_loader():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("download interrupted")
+            return 'model'
+
+        def disabled_loader():
+            attempts.append('disabled')
+            raise ModelUnavailable("no token")
+
+        registry = ModelRegistry()
+        registry.register('whisper', flaky_loader)
+        registry.register('diarization', disabled_loader)
+
+        self.assertEqual(registry.load(['whisper']), {'whisper': 'download interrupted'})
+        self.assertEqual(registry.get_stats()['whisper']['state'], 'failed')
+        self.assertEqual(registry.get('whisper'), 'model')
+
+        self.assertIsNone(registry.get('diarization'))
+        self.assertIsNone(registry.get('diarization'))
+        self.assertEqual(attempts.count('disabled'), 1)
+        self.assertEqual(registry.get_stats()['diarization']['state'], 'unavailable')
+
+    def test_budget_evicts_least_recently_used_idle_model(self):
+        registry = ModelRegistry(max_mb=1000)
+        for name in ['whisper:base', 't5:small', 't5:large']:
+            registry.register(name, lambda name=name: name, estimate_mb=500 if name != 't5:large' else 900)
+
+        with registry.use('whisper:base'):
+            registry.get('t5:small')
+            registry.get('t5:large')  # whisper is busy, so only t5:small can go
+            stats = registry.get_stats()
+            self.assertEqual(stats['whisper:base']['state'], 'loaded')
+            self.assertEqual(stats['t5:small']['state'], 'unloaded')
+
+        registry.get('t5:small')  # t5:large is now the least recently used idle model
+        stats = registry.get_stats()
+        self.assertEqual(stats['whisper:base']['state'], 'warm')  # has served a call
+        self.assertEqual(stats['t5:large']['state'], 'unloaded')
+        self.assertEqual(stats['t5:small']['evictions'], 1)
+        self.assertEqual(registry.get_budget(), {'max_mb': 1000, 'used_mb': 1000})
+
+    def test_warm_up_runs_once_and_records_timing(self):
+        warmups = []
+        registry = ModelRegistry()
+        registry.register('t5', lambda: 'model', warmup=warmups.append)
+        registry.register('whisper', lambda: 'model', warmup=lambda value: 1 / 0)
+
+        self.assertEqual(registry.load(warm=True), {'t5': None, 'whisper': None})
+        registry.warm('t5')
+
+        stats = registry.get_stats()
+        self.assertEqual(warmups, ['model'])
+        self.assertEqual(stats['t5']['state'], 'warm')
+        self.assertIsNotNone(stats['t5']['warmup_seconds'])
+        # A failed warm-up leaves the model usable
+        self.assertEqual(stats['whisper']['state'], 'loaded')
+        self.assertIn('division by zero', stats['whisper']['details']['warmup_error'])
+
+
+class TestLazyGenerator(unittest.TestCase):
+
+    def setUp(self):
+        # The mocked T5 would otherwise be "snapshotted" into the repo's model_snapshots/
+        patcher = patch.object(document_generator.config, 'MODEL_SNAPSHOTS_ENABLED', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('document_generator.torch.cuda.is_available', return_value=False)
+    @patch('document_generator.T5ForConditionalGeneration')
+    @patch('document_generator.T5Tokenizer')
+    @patch('document_generator._import_whisper')
+    def test_text_path_loads_only_t5(self, mock_import_whisper, mock_tokenizer, mock_t5, _):
+        generator = document_generator.SmartT5LargeDocumentGenerator(t5_model="google/flan-t5-base", t5_precision="fp32")
+        self.assertTrue(all(s['state'] == 'unloaded' for s in generator.models.get_stats().values()))
+
+        self.assertIs(generator.tokenizer, mock_tokenizer.from_pretrained.return_value)
+        generator.model  # same component, no second load
+
+        stats = generator.models.get_stats()
+        self.assertEqual(stats['t5:google/flan-t5-base@fp32']['state'], 'loaded')
+        self.assertEqual(stats['t5:google/flan-t5-base@fp32']['loads'], 1)
+        self.assertEqual(stats['whisper:base']['state'], 'unloaded')
+        mock_import_whisper.assert_not_called()
+        mock_tokenizer.from_pretrained.assert_called_once()
+
+    def test_t5_precision_falls_back_to_what_the_device_supports(self):
+        resolve = document_generator.resolve_t5_precision
+        self.assertEqual(resolve('auto', 'cuda'), 'fp16')
+        self.assertEqual(resolve('fp16', 'cpu'), 'fp32')
+        self.assertEqual(resolve('int8', 'cuda'), 'fp16')
+        with patch.object(document_generator, '_int8_supported', return_value=True):
+            self.assertEqual(resolve('auto', 'cpu'), 'int8')
+        with patch.object(document_generator, '_bf16_supported', return_value=False):
+            self.assertEqual(resolve('BF16', 'cpu'), 'fp32')
+        with self.assertRaises(ValueError):
+            resolve('int4', 'cpu')
+
+
+class TestReadiness(unittest.TestCase):
+
+    def setUp(self):
+        # The mocked T5 would otherwise be "snapshotted" into the repo's model_snapshots/
+        patcher = patch.object(document_generator.config, 'MODEL_SNAPSHOTS_ENABLED', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('document_generator.torch.cuda.is_available', return_value=False)
+    @patch('document_generator.T5ForConditionalGeneration')
+    @patch('document_generator.T5Tokenizer')
+    def test_ready_once_required_models_are_warm(self, mock_tokenizer, mock_t5, _):
+        with patch.object(document_generator, '_generators', {}), \
+             patch.object(document_generator, '_model_pool', None), \
+             patch.object(document_generator.config, 'BATCHING_ENABLED', False), \
+             patch.object(document_generator.config, 'READY_MODELS', ['t5']), \
+             patch.object(document_generator.config, 'T5_PRECISION', 'fp32'):
+            readiness = document_generator.get_readiness()
+            self.assertEqual((readiness['ready'], readiness['status']), (False, 'starting'))
+
+            document_generator.get_generator().preload(['t5'])
+            readiness = document_generator.get_readiness()
+            self.assertEqual((readiness['ready'], readiness['status']), (True, 'ready'))
+            self.assertEqual(readiness['models']['t5']['state'], 'warm')
+            self.assertEqual(readiness['models']['t5']['precision'], 'fp32')
+            self.assertEqual(readiness['models']['whisper']['state'], 'unloaded')
+            self.assertFalse(document_generator.get_readiness(['t5', 'whisper'])['ready'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
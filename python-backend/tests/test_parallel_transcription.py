@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import patch
+from concurrent.futures import Future
+import threading
+import sys
+import os
+
+# Add parent dir to path to import parallel_transcription
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import numpy as np
+
+import config
+import parallel_transcription
+
+SR = 16000
+
+
+class FakeExecutor:
+    """Thread-backed stand-in for ProcessPoolExecutor that records how it was shut down"""
+    instances = []
+
+    def __init__(self, max_workers, mp_context, initializer, initargs):
+        self.model_name = initargs[0]
+        self.shutdowns = []
+        FakeExecutor.instances.append(self)
+
+    def submit(self, fn, *args):
+        future = Future()
+        threading.Thread(target=lambda: future.set_result(fn(*args)), daemon=True).start()
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns.append(cancel_futures)
+
+
+class TestParallelTranscription(unittest.TestCase):
+
+    def test_cuts_land_in_the_nearest_pause(self):
+        audio = np.random.default_rng(0).normal(0, 0.1, SR * 100).astype(np.float32)
+        audio[int(SR * 27.5):int(SR * 28.5)] = 0  # pause 2 s before the 30 s boundary
+        audio[int(SR * 63.0):int(SR * 63.5)] = 0  # pause 3 s after the 60 s boundary
+        with patch.object(config, 'PARALLEL_TRANSCRIPTION_SEARCH_S', 5):
+            cuts = np.array(parallel_transcription.split_points(audio, span_seconds=30, sample_rate=SR)) / SR
+
+        # No cut near 90 s: it would leave a 10 s tail
+        self.assertEqual(len(cuts), 2)
+        self.assertTrue(27.5 <= cuts[0] < 28.5)
+        self.assertTrue(63.0 <= cuts[1] < 63.5)
+
+    def test_stitch_shifts_timestamps_and_keeps_order(self):
+        spans = [
+            {'text': ' hello there', 'language': 'en',
+             'segments': [{'id': 0, 'start': 0.0, 'end': 2.0, 'text': ' hello there'}]},
+            {'text': '', 'language': 'hi', 'segments': []},
+            {'text': ' goodbye', 'language': 'en',
+             'segments': [{'id': 0, 'start': 1.0, 'end': 1.5, 'text': ' goodbye',
+                           'words': [{'word': 'goodbye', 'start': 1.0, 'end': 1.5}]}]},
+        ]
+        result = parallel_transcription.stitch(spans, [0.0, 300.0, 600.0])
+
+        self.assertEqual(result['text'], 'hello there goodbye')
+        self.assertEqual(result['language'], 'en')
+        self.assertEqual([(s['id'], s['start'], s['end']) for s in result['segments']], [(0, 0.0, 2.0), (1, 601.0, 601.5)])
+        self.assertEqual(result['segments'][1]['words'][0]['start'], 601.0)
+        self.assertEqual(spans[2]['segments'][0]['start'], 1.0)  # inputs left untouched
+
+    def test_requests_on_different_models_do_not_cancel_each_other(self):
+        FakeExecutor.instances = []
+        release_base = threading.Event()
+
+        def transcribe_span(audio, decode_options):
+            if decode_options['model'] == 'base':
+                release_base.wait(5)
+            return {'text': decode_options['model'], 'segments': [], 'language': 'en'}
+
+        audio = np.zeros(SR * 10, dtype=np.float32)
+        results = {}
+        with patch.object(parallel_transcription, 'ProcessPoolExecutor', FakeExecutor), \
+                patch.object(parallel_transcription, '_transcribe_span', transcribe_span), \
+                patch.object(config, 'PARALLEL_TRANSCRIPTION_WORKERS', 2):
+            base = threading.Thread(target=lambda: results.update(
+                base=parallel_transcription.transcribe(audio, 'base', {'model': 'base'}, sample_rate=SR)))
+            base.start()
+            while not FakeExecutor.instances:
+                pass
+            results['small'] = parallel_transcription.transcribe(audio, 'small', {'model': 'small'}, sample_rate=SR)
+            base_pool, small_pool = FakeExecutor.instances
+            self.assertEqual(base_pool.shutdowns, [])  # still in use by the first request
+            release_base.set()
+            base.join(5)
+            parallel_transcription.shutdown()
+
+        self.assertEqual((results['base']['text'], results['small']['text']), ('base', 'small'))
+        # The retired pool stops once its request is done, without cancelling anything
+        self.assertEqual(base_pool.shutdowns, [False])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+
+# Add parent dir to path to import profiling
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import config
+import profiling
+
+
+def busy_work():
+    return sum(i * i for i in range(20000))
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        patcher = patch.multiple(config, PROFILING_ENABLED=True, PROFILING_TOKEN=None, PROFILE_TORCH=False,
+                                 PROFILE_DIR=self.profile_dir.name, PROFILE_MIN_INTERVAL_S=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        profiling._last_started = None
+
+    def test_profile_writes_stats_and_summary(self):
+        profile = profiling.try_start("POST /api/generate-document")
+        self.assertTrue(profiling.is_profiling())
+        busy_work()
+        profiling.finish(profile)
+
+        self.assertFalse(profiling.is_profiling())
+        [saved] = profiling.list_profiles()
+        self.assertEqual(saved['files'], [f"{profile.id}.pstats", f"{profile.id}.txt"])
+        summary = open(os.path.join(self.profile_dir.name, f"{profile.id}.txt")).read()
+        self.assertIn('busy_work', summary)
+
+    def test_one_profile_at_a_time_and_rate_limited(self):
+        profile = profiling.try_start("first")
+        self.assertIsNone(profiling.try_start("concurrent"))
+        profiling.finish(profile)
+
+        with patch.object(config, 'PROFILE_MIN_INTERVAL_S', 60):
+            self.assertIsNone(profiling.try_start("too soon"))
+
+    def test_only_the_newest_profiles_are_kept(self):
+        ids = []
+        with patch.object(config, 'PROFILE_MAX_PROFILES', 2):
+            for i in range(3):
+                profile = profiling.try_start(f"request {i}")
+                profiling.finish(profile)
+                ids.append(profile.id)
+                os.utime(os.path.join(self.profile_dir.name, f"{profile.id}.txt"), (1000 + i, 1000 + i))
+                os.utime(os.path.join(self.profile_dir.name, f"{profile.id}.pstats"), (1000 + i, 1000 + i))
+
+        self.assertEqual([p['id'] for p in profiling.list_profiles()], [ids[2], ids[1]])
+
+    def test_header_and_token_are_required(self):
+        self.assertTrue(profiling.requested('1', None, '/api/summarize'))
+        self.assertFalse(profiling.requested(None, None, '/api/summarize'))
+        with patch.object(config, 'PROFILING_TOKEN', 'secret'):
+            self.assertFalse(profiling.requested('1', 'wrong', '/api/summarize'))
+            self.assertTrue(profiling.requested('1', 'secret', '/api/summarize'))
+        with patch.object(config, 'PROFILING_ENABLED', False):
+            self.assertFalse(profiling.requested('1', None, '/api/summarize'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
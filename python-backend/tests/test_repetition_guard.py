@@ -0,0 +1,81 @@
+import unittest
+from dataclasses import dataclass, field
+import sys
+import os
+
+# Add parent dir to path to import repetition_guard
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import numpy as np
+
+import repetition_guard
+
+EOT = 100
+TIMESTAMP = 150  # timestamps and other special tokens sit above eot
+
+
+class FakeTokenizer:
+    eot = EOT
+
+    def decode(self, tokens):
+        return ' '.join(f"w{token}" for token in tokens)
+
+
+@dataclass(frozen=True)
+class FakeResult:
+    tokens: list = field(default_factory=list)
+    text: str = ""
+    avg_logprob: float = -0.3
+    no_speech_prob: float = 0.1
+    compression_ratio: float = 1.2
+
+
+class TestRepetitionGuard(unittest.TestCase):
+
+    def setUp(self):
+        self.guard = repetition_guard.RepetitionGuard(FakeTokenizer(), sample_begin=3)
+
+    def test_detects_repeated_ngrams_but_not_ordinary_text(self):
+        loop = [1, 2, 3, 4, 5] + [7, 8, 9, 10] * 4
+        self.assertTrue(repetition_guard.repeated_tail(loop))
+        self.assertFalse(repetition_guard.repeated_tail(loop[:-1]))
+        # Short n-grams need more repeats: "no no no no" is speech, sixteen of them is a loop
+        self.assertFalse(repetition_guard.repeated_tail([42] * 4))
+        self.assertTrue(repetition_guard.repeated_tail([42] * 16))
+        self.assertFalse(repetition_guard.repeated_tail(list(range(60))))
+        # Timestamps between iterations do not hide a loop
+        with_timestamps = [token for i in range(4) for token in (TIMESTAMP + i, 7, 8, 9, 10)]
+        self.assertTrue(self.guard.is_looping(with_timestamps, check_ratio=False))
+
+    def test_looping_sequences_are_forced_to_end(self):
+        prefix = [EOT + 1, EOT + 2, EOT + 3]
+        tokens = np.array([prefix + [7, 8, 9, 10] * 4, prefix + list(range(1, 17))])
+        logits = np.zeros((2, 200))
+        self.guard.apply(logits, tokens)
+
+        self.assertEqual(int(np.argmax(logits[0])), EOT)
+        self.assertTrue(np.isneginf(logits[0, 7]))
+        self.assertFalse(np.isinf(logits[1]).any())
+
+    def test_cut_results_come_back_as_silence(self):
+        looping = FakeResult(tokens=[7, 8, 9, 10] * 4, text="w7 w8 w9 w10 " * 4)
+        suppressed = self.guard.check(looping)
+        self.assertEqual((suppressed.tokens, suppressed.text, suppressed.no_speech_prob), ([], "", 1.0))
+        self.assertEqual(suppressed.avg_logprob, float('-inf'))
+
+        ordinary = FakeResult(tokens=list(range(1, 30)))
+        self.assertIs(self.guard.check(ordinary), ordinary)
+
+    def test_text_before_a_loop_survives(self):
+        speech = [TIMESTAMP, 1, 2, 3, 4, 5, 6, TIMESTAMP + 1, TIMESTAMP + 1]
+        loop = [token for i in range(4) for token in (7, 8, 9, 10, TIMESTAMP + 2 + i)]
+        cut = self.guard.check(FakeResult(tokens=speech + loop, text="ignored", avg_logprob=-0.4))
+
+        self.assertEqual(cut.tokens, speech)
+        self.assertEqual(cut.text, "w1 w2 w3 w4 w5 w6")
+        self.assertEqual((cut.avg_logprob, cut.no_speech_prob), (-0.4, 0.1))
+        self.assertAlmostEqual(cut.compression_ratio, repetition_guard.compression_ratio(cut.text))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,131 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import random
+import threading
+import time
+import sys
+import os
+
+# Add parent dir to path to import document_generator
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+import numpy as np
+
+import config
+from document_generator import SmartT5LargeDocumentGenerator
+
+
+def nested_loop_speakers(transcription_segments, speaker_segments):
+    """The original O(N x M) assignment, kept as the reference"""
+    speakers = []
+    for w_seg in transcription_segments:
+        if not w_seg.get('text', '').strip():
+            continue
+        assigned_speaker, max_overlap = "UNKNOWN", 0
+        for p_seg in speaker_segments:
+            overlap = max(0, min(w_seg['end'], p_seg['end']) - max(w_seg['start'], p_seg['start']))
+            if overlap > max_overlap:
+                max_overlap, assigned_speaker = overlap, p_seg['speaker']
+        speakers.append(assigned_speaker)
+    return speakers
+
+
+def random_call(rng, n_segments, n_turns, duration):
+    cuts = sorted(rng.uniform(0, duration) for _ in range(n_segments * 2))
+    segments = [{'start': cuts[i], 'end': cuts[i + 1], 'text': rng.choice(['hi', 'ok', ' '])}
+                for i in range(0, len(cuts), 2)]
+    turns = []
+    for _ in range(n_turns):
+        start = round(rng.uniform(0, duration), 1)
+        turns.append({'start': start, 'end': start + round(rng.uniform(0, 20), 1),
+                      'speaker': f"SPEAKER_{rng.randrange(4):02d}"})
+    rng.shuffle(turns)
+    return segments, turns
+
+
+class TestSpeakerMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+
+    def test_matches_nested_loop(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            segments, turns = random_call(rng, rng.randrange(1, 40), rng.randrange(1, 40), 300)
+            kept = [(seg['start'], seg['end'], seg['text'].strip()) for seg in segments if seg['text'].strip()]
+            self.assertEqual(self.generator._assign_speakers(kept, turns), nested_loop_speakers(segments, turns))
+
+    def test_ties_and_gaps(self):
+        segments = [
+            {'start': 0.0, 'end': 2.0, 'text': 'a'},
+            {'start': 5.0, 'end': 6.0, 'text': 'b'},
+            {'start': 7.0, 'end': 9.0, 'text': 'c'},
+        ]
+        turns = [
+            {'start': 1.0, 'end': 3.0, 'speaker': 'SPEAKER_01'},
+            {'start': -1.0, 'end': 1.0, 'speaker': 'SPEAKER_00'},
+            {'start': 8.0, 'end': 12.0, 'speaker': 'SPEAKER_01'},
+        ]
+        merged = self.generator.merge_transcription_with_diarization(segments, turns)
+        # Equal overlaps go to the earlier turn; no overlap stays UNKNOWN (ranked 2nd)
+        self.assertEqual([seg['speaker'] for seg in merged], ["Speaker 1", "Speaker 2", "Speaker 1"])
+
+
+class TestParallelDiarization(unittest.TestCase):
+
+    def test_transcription_and_diarization_overlap(self):
+        generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+        waveform = np.zeros(16000, dtype=np.float32)
+        # Both stubs block until the other has started, so a sequential pipeline times out
+        both_running = threading.Barrier(2, timeout=5)
+        seen = {}
+
+        def transcribe_audio(audio_path, audio=None, **kwargs):
+            both_running.wait()
+            seen['transcribe'] = audio
+            return {'text': 'hello there', 'word_count': 2, 'language_name': 'English',
+                    'segments': [{'start': 0.0, 'end': 1.0, 'text': 'hello there'}]}
+
+        def diarize_audio(audio_path, min_speakers=None, max_speakers=None, audio=None):
+            both_running.wait()
+            seen['diarize'] = audio
+            return [{'start': 0.0, 'end': 1.0, 'speaker': 'SPEAKER_00'}]
+
+        generator.transcribe_audio = transcribe_audio
+        generator.diarize_audio = diarize_audio
+        with patch.object(config, 'PARALLEL_DIARIZATION', True):
+            results = generator.process_audio_smart('call.wav', diarize=True, audio=waveform)
+
+        self.assertIs(seen['transcribe'], waveform)
+        self.assertIs(seen['diarize'], waveform)
+        self.assertEqual(results['transcription'], "Speaker 1: hello there")
+
+    def test_failed_transcription_waits_for_diarization(self):
+        """A request that fails does not return while diarization still runs behind it"""
+        generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+        started, finished = threading.Event(), threading.Event()
+
+        def transcribe_audio(audio_path, audio=None, **kwargs):
+            started.wait(5)
+            raise RuntimeError("decode failed")
+
+        def diarize_audio(audio_path, min_speakers=None, max_speakers=None, audio=None):
+            started.set()
+            time.sleep(0.2)
+            finished.set()
+            return []
+
+        generator.transcribe_audio = transcribe_audio
+        generator.diarize_audio = diarize_audio
+        with patch.object(config, 'PARALLEL_DIARIZATION', True), self.assertRaises(RuntimeError):
+            generator.process_audio_smart('call.wav', diarize=True, audio=np.zeros(16000, dtype=np.float32))
+
+        self.assertTrue(finished.is_set())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Add parent dir to path to import document_generator
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+import config
+from document_generator import SmartT5LargeDocumentGenerator
+
+
+class TestSummaryStream(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+        self.generator.batcher = None
+
+        def summaries_batch(texts, lengths, quality='medium', custom_instruction=None, chunk_callback=None,
+                            summary_callback=None):
+            results = []
+            for i, text in enumerate(texts):
+                results.append(f"summary {i} " + "word " * 30)
+                summary_callback(i, results[-1])
+            return results
+
+        self.generator.generate_t5_summaries_batch = summaries_batch
+        self.generator.generate_t5_summary_stream = lambda text, *args: iter(["The final", " summary."])
+
+    def test_chunks_stream_before_the_final_pass(self):
+        text = ' '.join(f"w{i}" for i in range(1200))
+        summary_config = {'strategy': 'balanced', 'max_words': 50, 'max_length': 80, 'min_length': 20}
+
+        with patch.object(config, 'SUMMARY_CACHE_ENABLED', False):
+            events = list(self.generator.summarize_stream(text, summary_config=summary_config))
+
+        self.assertEqual([kind for kind, _ in events], ['chunk', 'chunk', 'chunk', 'token', 'token', 'summary'])
+        self.assertEqual([data['index'] for kind, data in events[:3]], [0, 1, 2])
+        self.assertEqual(events[0][1]['total'], 3)
+        self.assertEqual(events[-1], ('summary', 'The final summary.'))
+
+    def test_short_combined_summary_needs_no_final_pass(self):
+        text = ' '.join(f"w{i}" for i in range(1200))
+        summary_config = {'strategy': 'balanced', 'max_words': 500, 'max_length': 80, 'min_length': 20}
+
+        with patch.object(config, 'SUMMARY_CACHE_ENABLED', False):
+            events = list(self.generator.summarize_stream(text, summary_config=summary_config))
+
+        self.assertEqual([kind for kind, _ in events], ['chunk', 'chunk', 'chunk', 'summary'])
+        self.assertTrue(events[-1][1].startswith('summary 0'))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
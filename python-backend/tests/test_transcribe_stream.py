@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import tempfile
+import time
+import sys
+import os
+
+# Add parent dir to path to import document_generator
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+import numpy as np
+
+import config
+from document_generator import SmartT5LargeDocumentGenerator
+from model_registry import ModelRegistry
+
+SR = 16000
+
+
+class TestTranscribeStream(unittest.TestCase):
+
+    def setUp(self):
+        self.whisper_model = MagicMock()
+        self.whisper_model.transcribe.side_effect = lambda audio, **kwargs: {
+            'text': ' one two. three', 'language': 'en',
+            'segments': [{'start': 0.0, 'end': 1.0, 'text': ' one two.'}, {'start': 1.0, 'end': 2.0, 'text': ' three'}]
+        }
+        self.generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+        self.generator.device = "cpu"
+        self.generator.whisper_model_name = "base"
+        self.generator.models = ModelRegistry()
+        self.generator.models.register('whisper:base', lambda: self.whisper_model)
+        self.generator.model_keys = {'whisper': 'whisper:base'}
+
+    def test_segments_stream_span_by_span(self):
+        audio = np.random.default_rng(0).normal(0, 0.1, SR * 60).astype(np.float32)
+        audio[int(SR * 24.0):int(SR * 24.5)] = 0  # pause near the first span boundary
+
+        with tempfile.NamedTemporaryFile(suffix='.wav') as f, patch.object(config, 'VAD_ENABLED', False):
+            events = self.generator.transcribe_audio_stream(f.name, audio=audio, use_cache=False)
+            event, first = next(events)
+            # The first segment is out before the later spans are decoded
+            self.assertEqual(self.whisper_model.transcribe.call_count, 1)
+            self.assertEqual((event, first), ('segment', {'id': 0, 'start': 0.0, 'end': 1.0, 'text': 'one two.'}))
+            rest = list(events)
+
+        segments = [data for event, data in rest[:-1]]
+        self.assertEqual([s['id'] for s in segments], [1, 2, 3])
+        self.assertTrue(24.0 <= segments[1]['start'] < 24.5)  # second span starts at the pause
+        self.assertEqual(rest[-1][0], 'done')
+        self.assertEqual((rest[-1][1]['segments'], rest[-1][1]['word_count'], rest[-1][1]['language']), (4, 6, 'en'))
+        # Each span is conditioned on the text of the one before
+        self.assertEqual(self.whisper_model.transcribe.call_args.kwargs['initial_prompt'], 'one two. three')
+
+    def test_cold_load_does_not_change_recorded_rate(self):
+        """latency_budget gets decode time per decoded audio second, without the Whisper load"""
+        def load():
+            time.sleep(0.5)
+            return self.whisper_model
+
+        self.generator.models = ModelRegistry()
+        self.generator.models.register('whisper:base', load)
+        audio = np.zeros(SR * 20, dtype=np.float32)
+
+        recorded = []
+        with tempfile.NamedTemporaryFile(suffix='.wav') as f, patch.object(config, 'VAD_ENABLED', False), \
+                patch.object(config, 'PARALLEL_TRANSCRIPTION_WORKERS', 1), \
+                patch('latency_budget.record', lambda *args: recorded.append(args[3:])):
+            self.generator.transcribe_audio(f.name, audio=audio, use_cache=False)  # cold: loads Whisper
+            self.generator.transcribe_audio(f.name, audio=audio, use_cache=False)  # warm
+            list(self.generator.transcribe_audio_stream(f.name, audio=audio, use_cache=False))
+
+        self.assertEqual([audio_seconds for audio_seconds, _ in recorded], [20.0, 20.0, 20.0])
+        self.assertTrue(all(seconds < 0.25 for _, seconds in recorded), recorded)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
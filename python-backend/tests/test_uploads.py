@@ -0,0 +1,71 @@
+import unittest
+import tempfile
+import sys
+import os
+from pathlib import Path
+
+# Add parent dir to path to import uploads
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+import config
+import uploads
+
+
+class TestStreamingUpload(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._saved = (config.UPLOAD_FOLDER, config.MAX_FILE_SIZE)
+        config.UPLOAD_FOLDER = Path(self._tmp.name)
+
+    def tearDown(self):
+        config.UPLOAD_FOLDER, config.MAX_FILE_SIZE = self._saved
+        self._tmp.cleanup()
+
+    def test_sniff_formats(self):
+        self.assertEqual(uploads.sniff_audio_format(b'RIFF\x00\x00\x00\x00WAVEfmt '), 'wav')
+        self.assertEqual(uploads.sniff_audio_format(b'ID3\x04\x00\x00\x00\x00\x00\x00\x00\x00'), 'mp3')
+        self.assertEqual(uploads.sniff_audio_format(b'\xff\xfb\x90\x00'), 'mp3')
+        self.assertEqual(uploads.sniff_audio_format(b'\xff\xf1\x50\x80'), 'aac')
+        self.assertEqual(uploads.sniff_audio_format(b'\x00\x00\x00\x20ftypM4A '), 'mp4')
+        self.assertEqual(uploads.sniff_audio_format(b'OggS\x00\x02'), 'ogg')
+        self.assertIsNone(uploads.sniff_audio_format(b'<html><body>'))
+
+    def test_same_name_uploads_get_unique_files(self):
+        a = uploads.StreamingUpload('meeting.wav', decode=False)
+        b = uploads.StreamingUpload('meeting.wav', decode=False)
+        try:
+            self.assertNotEqual(a.path, b.path)
+            self.assertEqual(a.path.suffix, '.wav')
+        finally:
+            a.discard()
+            b.discard()
+
+    def test_chunks_written_and_readable(self):
+        upload = uploads.StreamingUpload('a.wav', decode=False)
+        upload.write(b'RIFF\x00\x00')  # Shorter than the sniff window
+        upload.write(b'\x00\x00WAVE' + b'\x01' * 100)
+        upload.finish()
+        self.assertEqual(upload.format, 'wav')
+        self.assertEqual(upload.size, 112)
+        self.assertEqual(upload.path.stat().st_size, 112)
+        upload.discard()
+        self.assertFalse(upload.path.exists())
+
+    def test_bad_magic_rejected_early(self):
+        upload = uploads.StreamingUpload('a.mp3', decode=False)
+        with self.assertRaises(uploads.UploadRejected):
+            upload.write(b'MZ\x90\x00' + b'\x00' * 64)
+        self.assertFalse(upload.path.exists())
+
+    def test_size_limit_enforced_while_streaming(self):
+        config.MAX_FILE_SIZE = 64
+        upload = uploads.StreamingUpload('a.wav', decode=False)
+        upload.write(b'RIFF\x00\x00\x00\x00WAVE' + b'\x00' * 40)
+        with self.assertRaises(uploads.UploadTooLarge):
+            upload.write(b'\x00' * 40)
+        self.assertFalse(upload.path.exists())
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
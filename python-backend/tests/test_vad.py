@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import tempfile
+import sys
+import os
+
+# Add parent dir to path to import vad / document_generator
+sys.path.append(os.path.dirname(os.path.abspath(__file__)) + '/../')
+
+# Mock heavy libraries BEFORE importing document_generator
+for name in ['whisper', 'pyannote', 'pyannote.audio', 'transformers', 'torch', 'torchaudio']:
+    sys.modules.setdefault(name, MagicMock())
+
+import numpy as np
+
+import config
+import vad
+from document_generator import SmartT5LargeDocumentGenerator
+from model_registry import ModelRegistry
+
+SR = 16000
+
+
+def tone(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+def quiet(seconds, seed=0):
+    return np.random.default_rng(seed).normal(0, 0.001, int(seconds * SR)).astype(np.float32)
+
+
+class TestVad(unittest.TestCase):
+
+    def setUp(self):
+        # 5 s silence | 3 s speech, 0.3 s pause, 2 s speech | 10 s silence | 4 s speech | 6 s silence
+        self.audio = np.concatenate([quiet(5), tone(3), quiet(0.3, 1), tone(2), quiet(10, 2), tone(4), quiet(6, 3)])
+
+    def test_finds_speech_regions_and_bridges_short_pauses(self):
+        regions = vad.detect_speech(self.audio, SR) / SR
+        pad = config.VAD_PAD_MS / 1000
+        np.testing.assert_allclose(regions, [[5 - pad, 10.3 + pad], [20.3 - pad, 24.3 + pad]], atol=0.04)
+
+        speech = vad.trim_silence(self.audio, SR)
+        self.assertAlmostEqual(speech.skipped_fraction, 1 - len(speech.audio) / len(self.audio))
+        self.assertGreater(speech.skipped_fraction, 0.6)
+        self.assertEqual(vad.detect_speech(quiet(3), SR).shape, (0, 2))
+
+    def test_segments_map_back_to_original_timeline(self):
+        speech = vad.trim_silence(self.audio, SR)
+        first_region = (speech.regions[0, 1] - speech.regions[0, 0]) / SR
+        segments = [
+            {'start': 0.0, 'end': first_region, 'text': 'first'},  # ends exactly on the splice
+            {'start': first_region + 1.0, 'end': first_region + 2.0, 'text': 'second',
+             'words': [{'word': 'second', 'start': first_region + 1.0, 'end': first_region + 1.5}]}
+        ]
+        remapped = vad.remap_segments(segments, speech)
+        region_starts = speech.regions[:, 0] / SR
+        self.assertAlmostEqual(remapped[0]['start'], region_starts[0], places=2)
+        self.assertAlmostEqual(remapped[0]['end'], speech.regions[0, 1] / SR, places=2)
+        self.assertAlmostEqual(remapped[1]['start'], region_starts[1] + 1.0, places=2)
+        self.assertAlmostEqual(remapped[1]['words'][0]['end'], region_starts[1] + 1.5, places=2)
+        self.assertEqual(segments[1]['start'], first_region + 1.0)  # input left untouched
+
+    def test_transcribe_decodes_only_speech(self):
+        whisper_model = MagicMock()
+        whisper_model.transcribe.return_value = {
+            'text': ' hello', 'language': 'en', 'segments': [{'start': 0.5, 'end': 1.0, 'text': ' hello'}]
+        }
+        generator = SmartT5LargeDocumentGenerator.__new__(SmartT5LargeDocumentGenerator)
+        generator.device = "cpu"
+        generator.whisper_model_name = "base"
+        generator.models = ModelRegistry()
+        generator.models.register('whisper:base', lambda: whisper_model)
+        generator.model_keys = {'whisper': 'whisper:base'}
+
+        with tempfile.NamedTemporaryFile(suffix='.wav') as f, patch.object(config, 'VAD_ENABLED', True):
+            result = generator.transcribe_audio(f.name, audio=self.audio, use_cache=False)
+
+        decoded = whisper_model.transcribe.call_args[0][0]
+        self.assertEqual(len(decoded), int(np.sum(np.diff(vad.detect_speech(self.audio, SR), axis=1))))
+        self.assertAlmostEqual(result['segments'][0]['start'], vad.detect_speech(self.audio, SR)[0, 0] / SR + 0.5, places=2)
+        self.assertGreater(result['vad']['skipped_fraction'], 0.6)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,256 @@
+"""
+Streaming audio uploads.
+
+Werkzeug's multipart parser writes each uploaded file into the stream returned
+by Request._get_file_stream. StreamingRequest hands it a StreamingUpload, which:
+- writes the chunks to a unique temp file in UPLOAD_FOLDER (no name collisions),
+- enforces MAX_FILE_SIZE while the body is still arriving,
+- rejects content whose magic bytes are not a known audio container,
+- hashes the content (SHA-256) for the transcription cache,
+- optionally pipes the same chunks into ffmpeg so decoding to a 16 kHz
+  waveform overlaps with receiving the upload.
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from flask import Request
+
+import config
+import metrics
+
+
+class UploadRejected(Exception):
+    """Upload refused before processing; carries the HTTP status to return"""
+    status_code = 400
+
+
+class UploadTooLarge(UploadRejected):
+    status_code = 413
+
+
+def sniff_audio_format(head):
+    """Identify an audio container from its first bytes; None if unrecognised"""
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'wav'
+    if head[:3] == b'ID3':
+        return 'mp3'
+    if head[:4] == b'fLaC':
+        return 'flac'
+    if head[:4] == b'OggS':
+        return 'ogg'
+    if head[4:8] == b'ftyp':
+        return 'mp4'
+    if head[:4] == b'\x1a\x45\xdf\xa3':
+        return 'webm'
+    if head[:8] == b'\x30\x26\xb2\x75\x8e\x66\xcf\x11':
+        return 'asf'
+    if head[:4] == b'ADIF':
+        return 'aac'
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xF6) == 0xF0:
+        return 'aac'  # ADTS
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+        return 'mp3'  # MPEG frame sync without ID3 tag
+    return None
+
+
+# Containers ffmpeg can decode from a non-seekable pipe (MP4 often keeps its index at the end)
+PIPE_DECODABLE_FORMATS = {'wav', 'mp3', 'flac', 'ogg', 'webm', 'aac'}
+
+SNIFF_BYTES = 12
+
+
+class _PipeDecoder:
+    """ffmpeg subprocess fed chunk by chunk; collects 16 kHz mono PCM on a reader thread"""
+
+    def __init__(self):
+        self._proc = subprocess.Popen(
+            ['ffmpeg', '-nostdin', '-loglevel', 'error', '-i', 'pipe:0',
+             '-f', 's16le', '-ac', '1', '-ar', str(config.SAMPLING_RATE), 'pipe:1'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._pcm = bytearray()
+        self._failed = False
+        self._reader = threading.Thread(target=self._drain, name="upload-decoder", daemon=True)
+        self._reader.start()
+
+    def _drain(self):
+        for block in iter(lambda: self._proc.stdout.read(65536), b''):
+            self._pcm.extend(block)
+
+    def feed(self, data):
+        if self._failed:
+            return
+        try:
+            self._proc.stdin.write(data)
+        except (BrokenPipeError, OSError):
+            # ffmpeg gave up on this input; the file on disk is still complete
+            self._failed = True
+
+    def finish(self):
+        """Close ffmpeg's input and return the waveform, or None if decoding failed"""
+        try:
+            self._proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            self._failed = True
+        self._reader.join()
+        if self._proc.wait() != 0 or self._failed or not self._pcm:
+            return None
+        return np.frombuffer(bytes(self._pcm), np.int16).astype(np.float32) / 32768.0
+
+    def kill(self):
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._reader.join(timeout=1)
+
+
+class StreamingUpload:
+    """
+    Writable/readable file object used as the multipart container for one upload
+    """
+
+    def __init__(self, filename, decode=None):
+        suffix = Path(filename or '').suffix.lower()
+        fd, path = tempfile.mkstemp(prefix='upload_', suffix=suffix, dir=config.UPLOAD_FOLDER)
+        self._file = os.fdopen(fd, 'w+b')
+        self.path = Path(path)
+        self.filename = filename
+        self.size = 0
+        self.format = None
+        self.waveform = None
+        self.sha256 = None
+        self.detached = False
+
+        self._head = b''
+        self._digest = hashlib.sha256()
+        self._decode = config.STREAM_DECODE_UPLOADS if decode is None else decode
+        self._decoder = None
+        self._finished = False
+        self._started = time.perf_counter()
+
+    # -- file protocol used by werkzeug / FileStorage ---------------------------------
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > config.MAX_FILE_SIZE:
+            self.discard()
+            raise UploadTooLarge(f"File too large. Maximum size is {config.MAX_FILE_SIZE // (1024 * 1024)} MB")
+
+        if self.format is None:
+            self._head += data[:SNIFF_BYTES]
+            if len(self._head) >= SNIFF_BYTES:
+                self._check_format()
+
+        self._file.write(data)
+        self._digest.update(data)
+        if self._decoder is not None:
+            self._decoder.feed(data)
+        return len(data)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def readline(self, size=-1):
+        return self._file.readline(size)
+
+    def seek(self, offset, whence=0):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    # -- upload lifecycle ---------------------------------------------------------------
+
+    def _check_format(self):
+        self.format = sniff_audio_format(self._head)
+        if self.format is None:
+            self.discard()
+            raise UploadRejected("File content is not a recognised audio format")
+        if self._decode and self.format in PIPE_DECODABLE_FORMATS and shutil.which('ffmpeg'):
+            self._decoder = _PipeDecoder()
+
+    def finish(self):
+        """Flush to disk, record the content hash and collect the streamed waveform (if decoding was on)"""
+        if self._finished:
+            return self
+        self._finished = True
+        if self.format is None:
+            self._check_format()  # Files shorter than SNIFF_BYTES
+        self._file.flush()
+        self.sha256 = self._digest.hexdigest()
+        metrics.STAGE_SECONDS.observe(time.perf_counter() - self._started, stage='upload')
+        if self._decoder is not None:
+            with metrics.stage('decode'):  # only the decoding left once the body has arrived
+                self.waveform = self._decoder.finish()
+            self._decoder = None
+            if self.waveform is None:
+                print(f"⚠️ Streaming decode failed for {self.filename}, will decode from file")
+        return self
+
+    def detach(self):
+        """Keep the temp file after the request ends (caller becomes responsible for discard)"""
+        self.detached = True
+        return self
+
+    def discard(self):
+        """Stop decoding and delete the temp file"""
+        if self._decoder is not None:
+            self._decoder.kill()
+            self._decoder = None
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+
+
+class StreamingRequest(Request):
+    """Flask request class that streams allowed audio uploads into StreamingUpload sinks"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if filename and Path(filename).suffix.lower() in config.ALLOWED_EXTENSIONS:
+            upload = StreamingUpload(filename)
+            self.__dict__.setdefault('_streaming_uploads', []).append(upload)
+            return upload
+        return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+    def discard_uploads(self):
+        """Delete temp files of uploads nobody detached (called on request teardown)"""
+        for upload in self.__dict__.get('_streaming_uploads', []):
+            if not upload.detached:
+                upload.discard()
+
+
+def receive_upload(file_storage):
+    """
+    Return the finished StreamingUpload behind a FileStorage.
+    Uploads parsed without StreamingRequest are copied into one in chunks.
+    """
+    if isinstance(file_storage.stream, StreamingUpload):
+        return file_storage.stream.finish()
+
+    upload = StreamingUpload(file_storage.filename)
+    try:
+        for block in iter(lambda: file_storage.stream.read(1024 * 1024), b''):
+            upload.write(block)
+        return upload.finish()
+    except Exception:
+        upload.discard()
+        raise
@@ -0,0 +1,140 @@
+"""
+Energy-based voice activity detection on the 16 kHz Whisper waveform.
+
+Frames of VAD_FRAME_MS are scored by RMS energy in dBFS. A frame counts as
+speech when it is louder than VAD_MIN_DB and than the recording's noise floor
+(a low percentile of frame energy) plus VAD_MARGIN_DB. Speech runs separated
+by less than VAD_MIN_SILENCE_MS are joined, runs shorter than
+VAD_MIN_SPEECH_MS dropped, and every region is padded by VAD_PAD_MS so word
+onsets and endings survive. All steps are vectorized over frames.
+
+trim_silence() concatenates the speech regions for Whisper; the offsets it
+returns let remap_segments() put segment timestamps back on the original
+timeline, so diarization turns (computed on the full audio) still line up.
+"""
+import numpy as np
+
+import config
+
+
+class SpeechAudio:
+    """Speech-only waveform plus what is needed to map its times back to the original"""
+    __slots__ = ('audio', 'offsets', 'regions', 'total_samples', 'sample_rate')
+
+    def __init__(self, audio, offsets, regions, total_samples, sample_rate):
+        self.audio = audio
+        self.offsets = offsets  # rows of [start in trimmed audio, start in original], in samples; None = untrimmed
+        self.regions = regions
+        self.total_samples = total_samples
+        self.sample_rate = sample_rate
+
+    @property
+    def skipped_fraction(self):
+        if self.offsets is None or not self.total_samples:
+            return 0.0
+        return 1.0 - len(self.audio) / self.total_samples
+
+    def get_stats(self):
+        return {
+            'skipped_fraction': round(self.skipped_fraction, 4),
+            'speech_regions': len(self.regions),
+            'speech_seconds': round(float(np.sum(self.regions[:, 1] - self.regions[:, 0])) / self.sample_rate, 2),
+            'total_seconds': round(self.total_samples / self.sample_rate, 2),
+            'trimmed': self.offsets is not None
+        }
+
+
+def frame_energy_db(audio, frame_length):
+    """RMS energy (dBFS) of consecutive frames; the last partial frame is zero-padded"""
+    full = len(audio) // frame_length
+    frames = audio[:full * frame_length].reshape(full, frame_length)
+    # einsum sums squares per frame without materializing a squared copy of the waveform
+    power = np.einsum('ij,ij->i', frames, frames) / frame_length
+    tail = audio[full * frame_length:]
+    if len(tail):
+        power = np.append(power, np.dot(tail, tail) / frame_length)
+    return 10.0 * np.log10(power + 1e-12)
+
+
+def _runs(mask):
+    """Start and end indices (end exclusive) of the True runs in a boolean array"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _join_close(starts, ends, min_gap):
+    """Merge neighbouring runs whose gap is below min_gap"""
+    if len(starts) < 2:
+        return starts, ends
+    keep = (starts[1:] - ends[:-1]) >= min_gap
+    return np.concatenate((starts[:1], starts[1:][keep])), np.concatenate((ends[:-1][keep], ends[-1:]))
+
+
+def detect_speech(audio, sample_rate=None):
+    """Speech regions as an (n, 2) array of [start, end) sample offsets"""
+    sample_rate = sample_rate or config.SAMPLING_RATE
+    frame = max(1, int(sample_rate * config.VAD_FRAME_MS / 1000))
+    to_frames = lambda ms: int(round(ms / config.VAD_FRAME_MS))
+
+    energy = frame_energy_db(np.asarray(audio, dtype=np.float32), frame)
+    if not len(energy):
+        return np.zeros((0, 2), dtype=np.int64)
+    noise_floor = np.percentile(energy, config.VAD_NOISE_PERCENTILE)
+    threshold = max(config.VAD_MIN_DB, noise_floor + config.VAD_MARGIN_DB)
+
+    starts, ends = _runs(energy > threshold)
+    starts, ends = _join_close(starts, ends, to_frames(config.VAD_MIN_SILENCE_MS))
+    long_enough = (ends - starts) >= to_frames(config.VAD_MIN_SPEECH_MS)
+    starts, ends = starts[long_enough], ends[long_enough]
+
+    pad = int(sample_rate * config.VAD_PAD_MS / 1000)
+    starts = np.maximum(starts * frame - pad, 0)
+    ends = np.minimum(ends * frame + pad, len(audio))
+    starts, ends = _join_close(starts, ends, 1)  # padding may make neighbours overlap
+    return np.stack((starts, ends), axis=1).astype(np.int64)
+
+
+def trim_silence(audio, sample_rate=None):
+    """
+    SpeechAudio holding only the speech regions of audio. The original audio is
+    kept (offsets None) when less than VAD_MIN_SKIP_FRACTION would be removed.
+    """
+    sample_rate = sample_rate or config.SAMPLING_RATE
+    regions = detect_speech(audio, sample_rate)
+    lengths = regions[:, 1] - regions[:, 0]
+    if len(audio) and 1.0 - lengths.sum() / len(audio) < config.VAD_MIN_SKIP_FRACTION:
+        return SpeechAudio(audio, None, regions, len(audio), sample_rate)
+
+    speech = np.concatenate([audio[s:e] for s, e in regions]) if len(regions) else np.zeros(0, dtype=np.float32)
+    trimmed_starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    offsets = np.stack((trimmed_starts, regions[:, 0]), axis=1) if len(regions) else np.zeros((0, 2), dtype=np.int64)
+    return SpeechAudio(speech.astype(np.float32, copy=False), offsets, regions, len(audio), sample_rate)
+
+
+def to_original_seconds(seconds, offsets, sample_rate, ends=False):
+    """
+    Map times on the trimmed timeline to the original one. A time exactly on a
+    region boundary belongs to the next region for starts, the previous one for ends.
+    """
+    samples = np.asarray(seconds, dtype=np.float64) * sample_rate
+    index = np.searchsorted(offsets[:, 0], samples, side='left' if ends else 'right') - 1
+    index = np.clip(index, 0, len(offsets) - 1)
+    return (offsets[index, 1] + samples - offsets[index, 0]) / sample_rate
+
+
+def remap_segments(segments, speech):
+    """Copies of Whisper segments (and their words) with start/end on the original timeline"""
+    if speech.offsets is None or not segments:
+        return segments
+    starts = to_original_seconds([s['start'] for s in segments], speech.offsets, speech.sample_rate)
+    ends = to_original_seconds([s['end'] for s in segments], speech.offsets, speech.sample_rate, ends=True)
+    remapped = []
+    for segment, start, end in zip(segments, starts, ends):
+        segment = dict(segment, start=round(float(start), 3), end=round(float(max(end, start)), 3))
+        if segment.get('words'):
+            word_starts = to_original_seconds([w['start'] for w in segment['words']], speech.offsets, speech.sample_rate)
+            word_ends = to_original_seconds([w['end'] for w in segment['words']], speech.offsets, speech.sample_rate, ends=True)
+            segment['words'] = [dict(w, start=round(float(ws), 3), end=round(float(max(we, ws)), 3))
+                                for w, ws, we in zip(segment['words'], word_starts, word_ends)]
+        remapped.append(segment)
+    return remapped